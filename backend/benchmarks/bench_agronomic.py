@@ -0,0 +1,22 @@
+import pytest
+from services.agronomic.features import DayFeatures
+
+pytestmark = pytest.mark.benchmark(group="agronomic")
+
+def bench_generate_tips(benchmark, agronomic_logic, forecast):
+    benchmark(agronomic_logic.generate_tips, forecast.current_weather, forecast.daily, forecast.hourly)
+
+def bench_generate_diagnostics(benchmark, agronomic_logic, forecast):
+    benchmark(agronomic_logic.generate_diagnostics, forecast.current_weather, forecast.daily, forecast.hourly)
+
+def bench_analyze_all_phases(benchmark, agronomic_logic, forecast):
+    benchmark(agronomic_logic.analyze, forecast.current_weather, forecast.daily, forecast.hourly)
+
+def bench_analyze_one_phase(benchmark, agronomic_logic, forecast):
+    benchmark(agronomic_logic.analyze, forecast.current_weather, forecast.daily, forecast.hourly, phases=("growth",))
+
+def bench_analyze_current(benchmark, agronomic_logic, forecast):
+    benchmark(agronomic_logic.analyze_current, forecast.current_weather)
+
+def bench_day_features(benchmark, forecast):
+    benchmark(DayFeatures, forecast.daily, forecast.hourly)
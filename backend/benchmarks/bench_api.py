@@ -0,0 +1,47 @@
+"""End-to-end requests through the ASGI app, against the mocked Open-Meteo."""
+import pytest
+from config import settings
+from unittest.mock import patch
+
+pytestmark = pytest.mark.benchmark(group="api")
+
+def bench_get_weather_hot(benchmark, api, event_loop_runner):
+    client, _ = api
+    event_loop_runner(client.get("/weather/Ribeirão Preto"))
+    response = benchmark(lambda: event_loop_runner(client.get("/weather/Ribeirão Preto")))
+    assert response.status_code == 200
+
+def bench_get_weather_not_modified(benchmark, api, event_loop_runner):
+    client, _ = api
+    etag = event_loop_runner(client.get("/weather/Ribeirão Preto")).headers["etag"]
+    response = benchmark(lambda: event_loop_runner(client.get("/weather/Ribeirão Preto", headers={"If-None-Match": etag})))
+    assert response.status_code == 304
+
+def bench_get_weather_without_response_cache(benchmark, api, event_loop_runner):
+    # Cached forecast, but analysis lookup, report and encoding on every request.
+    client, _ = api
+    with patch.object(settings, "RESPONSE_CACHE_ENABLED", False):
+        event_loop_runner(client.get("/weather/Ribeirão Preto"))
+        response = benchmark(lambda: event_loop_runner(client.get("/weather/Ribeirão Preto")))
+    assert response.status_code == 200
+
+def bench_get_weather_cold(benchmark, api, event_loop_runner, upstream_latency):
+    """Every request misses the caches and waits --upstream-latency for Open-Meteo."""
+    client, service = api
+
+    async def clear_caches():
+        for namespace in (*service.cache.namespaces.values(), *service.local_cache.namespaces.values()):
+            await namespace.clear()
+
+    response = benchmark.pedantic(
+        lambda: event_loop_runner(client.get("/weather/Ribeirão Preto")),
+        setup=lambda: event_loop_runner(clear_caches()),
+        rounds=max(5, int(1 / max(upstream_latency, 0.01)))
+    )
+    assert response.status_code == 200
+
+def bench_get_current_conditions_hot(benchmark, api, event_loop_runner):
+    client, _ = api
+    event_loop_runner(client.get("/weather/Ribeirão Preto/now"))
+    response = benchmark(lambda: event_loop_runner(client.get("/weather/Ribeirão Preto/now")))
+    assert response.status_code == 200
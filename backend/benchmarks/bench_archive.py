@@ -0,0 +1,38 @@
+from datetime import date
+import pytest
+from benchmarks.mock_open_meteo import archive_for
+from schemas import GridCell
+from services.archive import DAILY_SOURCES, ArchiveStore, day_number, parse_archive_payload
+
+pytestmark = pytest.mark.benchmark(group="archive")
+
+CELL = GridCell(key="-21.2000,-47.8000", latitude=-21.2, longitude=-47.8, resolution="0.1deg")
+SEASON = (date(2022, 10, 1), date(2023, 9, 30))
+SEASON_DAYS = tuple(map(day_number, SEASON))
+
+def archive_rows(start: date, end: date):
+    return parse_archive_payload(archive_for(CELL.latitude, CELL.longitude, start, end, [], list(DAILY_SOURCES)))
+
+@pytest.fixture(scope="module")
+def store(tmp_path_factory):
+    # Ten years of daily rows for one location.
+    store = ArchiveStore(str(tmp_path_factory.mktemp("archive") / "archive.sqlite3"), base_temperature=10.0)
+    store._ingest(CELL, "Ribeirão Preto", archive_rows(date(2014, 1, 1), date(2023, 12, 31)))
+    yield store
+    store.close()
+
+def bench_season_accumulation(benchmark, store):
+    # Two primary-key lookups on the running totals.
+    benchmark(store._accumulate, CELL.key, *SEASON_DAYS, None)
+
+def bench_season_accumulation_other_base(benchmark, store):
+    # Degree-days above another base are summed from the season's rows.
+    benchmark(store._accumulate, CELL.key, *SEASON_DAYS, 12.0)
+
+def bench_season_daily_series(benchmark, store):
+    # What GET /archive/{city}/rolling reads before summing windows.
+    benchmark(store._daily, CELL.key, *SEASON_DAYS, None)
+
+def bench_ingest_season(benchmark, store):
+    # Re-ingesting a past season also rewrites the running totals of every later day.
+    benchmark(store._ingest, CELL, "Ribeirão Preto", archive_rows(*SEASON))
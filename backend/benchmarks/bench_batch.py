@@ -0,0 +1,26 @@
+"""POST /weather/batch with every location missing the cache, against the mocked
+Open-Meteo answering after --upstream-latency."""
+import pytest
+
+pytestmark = pytest.mark.benchmark(group="batch")
+
+def locations(count: int) -> list:
+    # Points 0.5 degrees apart fall in distinct grid cells.
+    return [{"latitude": -20.0 - index * 0.5, "longitude": -47.0 - index * 0.5} for index in range(count)]
+
+@pytest.mark.parametrize("count", [10, 100])
+@pytest.mark.parametrize("endpoint", ["/weather/batch", "/weather/batch/stream"])
+def bench_batch_cold(benchmark, api, event_loop_runner, count, endpoint):
+    client, service = api
+    body = {"locations": locations(count)}
+
+    async def clear_caches():
+        for namespace in (*service.cache.namespaces.values(), *service.local_cache.namespaces.values()):
+            await namespace.clear()
+
+    response = benchmark.pedantic(
+        lambda: event_loop_runner(client.post(endpoint, json=body)),
+        setup=lambda: event_loop_runner(clear_caches()),
+        rounds=10
+    )
+    assert response.status_code == 200
@@ -0,0 +1,28 @@
+import pytest
+from config import settings
+from unittest.mock import patch
+from schemas import WeatherResponse
+from services.forecast import Forecast
+from services.weather_report import build_weather_report, encode_weather_report, weather_response
+
+pytestmark = pytest.mark.benchmark(group="forecast")
+
+def bench_parse_forecast_payload(benchmark, forecast_payload):
+    # Open-Meteo JSON into typed columns, once per upstream fetch.
+    benchmark(Forecast.from_payload, forecast_payload)
+
+@pytest.fixture
+def report(event_loop_runner, coordinates, forecast, make_service, agronomic_logic):
+    return event_loop_runner(build_weather_report(coordinates, forecast, make_service(), agronomic_logic))
+
+def bench_weather_response_validation(benchmark, report):
+    benchmark(weather_response, report)
+
+def bench_weather_response_json_validation(benchmark, report):
+    body = encode_weather_report(report)
+    benchmark(WeatherResponse.model_validate_json, body)
+
+@pytest.mark.parametrize("encoder", ["orjson", "pydantic"])
+def bench_encode_weather_report(benchmark, report, encoder):
+    with patch.object(settings, "JSON_ENCODER", encoder):
+        benchmark(encode_weather_report, report)
@@ -0,0 +1,40 @@
+import random
+from datetime import date, timedelta
+
+WEATHER_CODES = (0, 1, 2, 3, 45, 61, 63, 80, 95)
+
+def synthetic_forecast(days: int = 7, seed: int = 0, start: date = date(2024, 10, 1)) -> dict:
+    """A full Open-Meteo forecast payload (days * 24 hourly rows) with plausible cane-belt values."""
+    rng = random.Random(seed)
+    hours = days * 24
+    dates = [start + timedelta(days=day) for day in range(days)]
+
+    hourly = {
+        "time": [f"{dates[hour // 24].isoformat()}T{hour % 24:02d}:00" for hour in range(hours)],
+        "temperature_2m": [round(rng.uniform(12, 36), 1) for _ in range(hours)],
+        "relativehumidity_2m": [rng.randint(25, 100) for _ in range(hours)],
+        "windspeed_10m": [round(rng.uniform(0, 25), 1) for _ in range(hours)],
+        "weathercode": [rng.choice(WEATHER_CODES) for _ in range(hours)],
+        "soil_moisture_0_to_1cm": [round(rng.uniform(0.1, 0.5), 3) for _ in range(hours)],
+        "soil_moisture_27_to_81cm": [round(rng.uniform(0.15, 0.45), 3) for _ in range(hours)]
+    }
+    daily = {
+        "time": [day.isoformat() for day in dates],
+        "precipitation_sum": [round(rng.choice([0, 0, 0, rng.uniform(0, 40)]), 1) for _ in range(days)],
+        "et0_fao_evapotranspiration": [round(rng.uniform(2, 7), 2) for _ in range(days)],
+        "shortwave_radiation_sum": [round(rng.uniform(8, 28), 2) for _ in range(days)],
+        "weathercode": [rng.choice(WEATHER_CODES) for _ in range(days)]
+    }
+
+    return {
+        "latitude": -21.2, "longitude": -47.8, "timezone": "America/Sao_Paulo",
+        "current_weather": {
+            "temperature": round(rng.uniform(15, 32), 1),
+            "windspeed": round(rng.uniform(0, 20), 1),
+            "winddirection": rng.randint(0, 359),
+            "weathercode": rng.choice(WEATHER_CODES),
+            "time": f"{start.isoformat()}T12:00"
+        },
+        "hourly": hourly,
+        "daily": daily
+    }
@@ -0,0 +1,115 @@
+"""Closed-loop load generator for a running backend.
+
+    cd backend && python -m benchmarks.load --url http://127.0.0.1:8000 --concurrency 50 --duration 30
+
+Each of --concurrency workers sends requests back to back for --duration seconds
+(after --warmup seconds that are not counted), cycling through --cities and
+--paths. Prints throughput, latency percentiles and status counts; --json writes
+them to a file so runs can be compared. Run the backend against
+benchmarks.mock_open_meteo for repeatable upstream behaviour, and give the
+generator its own cores: on a shared CPU it measures itself as much as the app.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import time
+from collections import Counter
+from typing import Dict, List
+from urllib.parse import quote
+import httpx
+import numpy as np
+
+DEFAULT_CITIES = [
+    "Ribeirão Preto", "Piracicaba", "Sertãozinho", "Jaboticabal", "Araraquara",
+    "Barretos", "Franca", "Bauru", "Jaú", "Presidente Prudente"
+]
+
+class LoadResult:
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.statuses: Counter = Counter()
+
+    def record(self, latency: float, status: str) -> None:
+        self.latencies.append(latency)
+        self.statuses[status] += 1
+
+    def summary(self, duration: float) -> Dict[str, object]:
+        latencies = np.array(self.latencies) * 1000
+        p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) if len(latencies) else (0.0, 0.0, 0.0)
+        return {
+            "requests": len(self.latencies),
+            "duration_s": round(duration, 2),
+            "throughput_rps": round(len(self.latencies) / duration, 1) if duration else 0.0,
+            "latency_ms": {
+                "p50": round(float(p50), 2),
+                "p95": round(float(p95), 2),
+                "p99": round(float(p99), 2),
+                "max": round(float(latencies.max()), 2) if len(latencies) else 0.0,
+                "mean": round(float(latencies.mean()), 2) if len(latencies) else 0.0
+            },
+            "statuses": dict(sorted(self.statuses.items()))
+        }
+
+async def run_load(
+    url: str,
+    paths: List[str],
+    cities: List[str],
+    concurrency: int,
+    duration: float,
+    warmup: float = 0.0,
+    timeout: float = 30.0
+) -> Dict[str, object]:
+    targets = itertools.cycle([path.format(city=quote(city)) for city in cities for path in paths])
+    result = LoadResult()
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=timeout) as client:
+        started = time.perf_counter()
+        measure_from = started + warmup
+        stop_at = measure_from + duration
+
+        async def worker():
+            while True:
+                sent = time.perf_counter()
+                if sent >= stop_at:
+                    return
+                try:
+                    response = await client.get(next(targets))
+                    status = str(response.status_code)
+                except httpx.HTTPError as e:
+                    status = type(e).__name__
+                if sent >= measure_from:
+                    result.record(time.perf_counter() - sent, status)
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - measure_from
+
+    return {"url": url, "paths": paths, "concurrency": concurrency, **result.summary(elapsed)}
+
+def print_summary(summary: Dict[str, object]) -> None:
+    latency = summary["latency_ms"]
+    print(f"{summary['requests']} requests in {summary['duration_s']} s at concurrency {summary['concurrency']}")
+    print(f"throughput  {summary['throughput_rps']} req/s")
+    print(
+        f"latency ms  p50 {latency['p50']}  p95 {latency['p95']}  p99 {latency['p99']}"
+        f"  max {latency['max']}  mean {latency['mean']}"
+    )
+    print("statuses    " + "  ".join(f"{status}: {count}" for status, count in summary["statuses"].items()))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--paths", nargs="+", default=["/weather/{city}"], help="Path templates with {city}")
+    parser.add_argument("--cities", nargs="+", default=DEFAULT_CITIES)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--warmup", type=float, default=2.0)
+    parser.add_argument("--json", help="Also write the summary to this file")
+    args = parser.parse_args()
+
+    summary = asyncio.run(run_load(args.url, args.paths, args.cities, args.concurrency, args.duration, args.warmup))
+    print_summary(summary)
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(summary, file, indent=2)
@@ -0,0 +1,164 @@
+"""Local stand-in for the Open-Meteo geocoding, forecast and archive APIs, for load tests.
+
+    cd backend && MOCK_LATENCY=0.05 MOCK_ERROR_RATE=0.01 uvicorn benchmarks.mock_open_meteo:app --port 8081
+
+Then point the backend at it:
+
+    OPEN_METEO_GEOCODING_URL=http://127.0.0.1:8081/v1/search \\
+    OPEN_METEO_WEATHER_URL=http://127.0.0.1:8081/v1/forecast \\
+    OPEN_METEO_ARCHIVE_URL=http://127.0.0.1:8081/v1/archive uvicorn main:app --port 8000
+
+Forecasts are synthetic and deterministic per coordinate, and honour the
+hourly/daily variables and forecast_days the backend asks for; archive responses
+cover start_date to end_date the same way. Every response
+waits MOCK_LATENCY seconds (+/- MOCK_LATENCY_JITTER). A MOCK_ERROR_RATE fraction
+of requests answers 503 and a MOCK_TIMEOUT_RATE fraction stalls for
+MOCK_TIMEOUT_SECONDS before answering, longer than the backend's HTTP timeout.
+Failures are drawn from a generator seeded with MOCK_SEED. GET /_stats counts
+what was served.
+"""
+import asyncio
+import os
+import random
+import zlib
+from datetime import date
+from typing import Any, Dict, List, Optional
+import httpx
+from fastapi import FastAPI, Query
+from fastapi.responses import JSONResponse
+from benchmarks.fixtures import synthetic_forecast
+
+def _seed(*parts: Any) -> int:
+    return zlib.crc32(",".join(str(part) for part in parts).encode("utf-8"))
+
+def _floats(value: str) -> List[float]:
+    return [float(item) for item in value.split(",")]
+
+def _names(value: Optional[str]) -> List[str]:
+    return [name for name in (value or "").split(",") if name]
+
+def keep_requested(payload: Dict[str, Any], hourly: List[str], daily: List[str]) -> Dict[str, Any]:
+    # Open-Meteo leaves out a block that was not requested.
+    for block, names in (("hourly", hourly), ("daily", daily)):
+        if names:
+            payload[block] = {key: payload[block][key] for key in ["time", *names] if key in payload[block]}
+        else:
+            del payload[block]
+    return payload
+
+def forecast_for(latitude: float, longitude: float, days: int, hourly: List[str], daily: List[str]) -> Dict[str, Any]:
+    payload = synthetic_forecast(days, seed=_seed(round(latitude, 4), round(longitude, 4)))
+    payload["latitude"], payload["longitude"] = latitude, longitude
+    return keep_requested(payload, hourly, daily)
+
+def archive_for(latitude: float, longitude: float, start: date, end: date, hourly: List[str], daily: List[str]) -> Dict[str, Any]:
+    days = (end - start).days + 1
+    payload = synthetic_forecast(days, seed=_seed(round(latitude, 4), round(longitude, 4), start), start=start)
+    temperature = payload["hourly"]["temperature_2m"]
+    by_day = [temperature[day * 24:(day + 1) * 24] for day in range(days)]
+    payload["daily"].update({
+        "temperature_2m_max": [max(values) for values in by_day],
+        "temperature_2m_min": [min(values) for values in by_day],
+        "temperature_2m_mean": [round(sum(values) / 24, 1) for values in by_day]
+    })
+    del payload["current_weather"]
+    payload["latitude"], payload["longitude"] = latitude, longitude
+    return keep_requested(payload, hourly, daily)
+
+def geocode(name: str) -> Dict[str, Any]:
+    """A made-up place in the São Paulo cane belt, stable for a given name."""
+    rng = random.Random(_seed(name.strip().lower()))
+    return {
+        "name": name.strip().title(),
+        "latitude": round(rng.uniform(-23.0, -20.0), 4),
+        "longitude": round(rng.uniform(-51.0, -47.0), 4),
+        "country": "Brasil",
+        "admin1": "São Paulo"
+    }
+
+def create_app(
+    latency: float = 0.0,
+    latency_jitter: float = 0.0,
+    error_rate: float = 0.0,
+    timeout_rate: float = 0.0,
+    timeout_seconds: float = 30.0,
+    seed: int = 0
+) -> FastAPI:
+    app = FastAPI(title="Open-Meteo stand-in")
+    rng = random.Random(seed)
+    stats = {"requests": 0, "geocoding": 0, "forecast": 0, "archive": 0, "locations": 0, "errors": 0, "timeouts": 0}
+
+    async def upstream_delay() -> Optional[JSONResponse]:
+        """Waits like the real API would; returns an error response when one is injected."""
+        stats["requests"] += 1
+        draw = rng.random()
+        if draw < error_rate:
+            stats["errors"] += 1
+            await asyncio.sleep(latency)
+            return JSONResponse(status_code=503, content={"error": True, "reason": "Injected upstream error"})
+        if draw < error_rate + timeout_rate:
+            stats["timeouts"] += 1
+            await asyncio.sleep(timeout_seconds)
+        elif latency or latency_jitter:
+            await asyncio.sleep(max(latency + rng.uniform(-latency_jitter, latency_jitter), 0.0))
+        return None
+
+    @app.get("/v1/search")
+    async def search(name: str = Query(...), count: int = Query(10)):
+        error = await upstream_delay()
+        if error:
+            return error
+        stats["geocoding"] += 1
+        return {"results": [geocode(name)][:count]}
+
+    @app.get("/v1/forecast")
+    async def forecast(
+        latitude: str = Query(...),
+        longitude: str = Query(...),
+        hourly: Optional[str] = Query(None),
+        daily: Optional[str] = Query(None),
+        forecast_days: int = Query(7, ge=1, le=16)
+    ):
+        error = await upstream_delay()
+        if error:
+            return error
+        points = list(zip(_floats(latitude), _floats(longitude)))
+        stats["forecast"] += 1
+        stats["locations"] += len(points)
+        payloads = [forecast_for(lat, lon, forecast_days, _names(hourly), _names(daily)) for lat, lon in points]
+        # A single coordinate is answered with an object, several with a list.
+        return payloads[0] if len(payloads) == 1 else payloads
+
+    @app.get("/v1/archive")
+    async def archive(
+        latitude: float = Query(...),
+        longitude: float = Query(...),
+        start_date: date = Query(...),
+        end_date: date = Query(...),
+        hourly: Optional[str] = Query(None),
+        daily: Optional[str] = Query(None)
+    ):
+        error = await upstream_delay()
+        if error:
+            return error
+        stats["archive"] += 1
+        return archive_for(latitude, longitude, start_date, end_date, _names(hourly), _names(daily))
+
+    @app.get("/_stats")
+    async def get_stats():
+        return stats
+
+    return app
+
+def mock_transport(**options: Any) -> httpx.ASGITransport:
+    """An httpx transport serving create_app(**options) in-process, for tests and benchmarks."""
+    return httpx.ASGITransport(app=create_app(**options))
+
+app = create_app(
+    latency=float(os.environ.get("MOCK_LATENCY", 0.0)),
+    latency_jitter=float(os.environ.get("MOCK_LATENCY_JITTER", 0.0)),
+    error_rate=float(os.environ.get("MOCK_ERROR_RATE", 0.0)),
+    timeout_rate=float(os.environ.get("MOCK_TIMEOUT_RATE", 0.0)),
+    timeout_seconds=float(os.environ.get("MOCK_TIMEOUT_SECONDS", 30.0)),
+    seed=int(os.environ.get("MOCK_SEED", 0))
+)
@@ -0,0 +1,62 @@
+"""Fixtures for the benchmark suite, loaded with -p from benchmarks/pytest.ini
+(a conftest.py here would also be picked up by the regular test run)."""
+import asyncio
+import pytest
+import httpx
+from main import app
+from routers.weather import get_open_meteo_service
+from schemas import Coordinates
+from services.agronomic import AgronomicLogic
+from services.forecast import Forecast
+from services.open_meteo import OpenMeteoService, stamp_content_hash
+from benchmarks.fixtures import synthetic_forecast
+from benchmarks.mock_open_meteo import mock_transport
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--upstream-latency", type=float, default=0.02,
+        help="Seconds the mocked Open-Meteo waits before answering (default 0.02)"
+    )
+
+@pytest.fixture(scope="session")
+def upstream_latency(request) -> float:
+    return request.config.getoption("--upstream-latency")
+
+@pytest.fixture(scope="session")
+def event_loop_runner():
+    # pytest-benchmark calls plain functions; async code runs on one loop kept for the session.
+    loop = asyncio.new_event_loop()
+    yield loop.run_until_complete
+    loop.close()
+
+@pytest.fixture(scope="session")
+def forecast_payload() -> dict:
+    return stamp_content_hash(synthetic_forecast())
+
+@pytest.fixture
+def forecast(forecast_payload) -> Forecast:
+    return Forecast.from_payload(forecast_payload)
+
+@pytest.fixture(scope="session")
+def agronomic_logic() -> AgronomicLogic:
+    return AgronomicLogic()
+
+@pytest.fixture
+def coordinates() -> Coordinates:
+    return Coordinates(name="Ribeirão Preto", latitude=-21.18, longitude=-47.81, country="Brasil", state="São Paulo")
+
+@pytest.fixture
+def make_service(upstream_latency):
+    def make(latency: float = upstream_latency) -> OpenMeteoService:
+        return OpenMeteoService(httpx.AsyncClient(transport=mock_transport(latency=latency)))
+    return make
+
+@pytest.fixture
+def api(make_service, event_loop_runner):
+    """An ASGI client for the app, wired to a service on the mocked upstream."""
+    service = make_service()
+    app.dependency_overrides[get_open_meteo_service] = lambda: service
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://benchmark")
+    yield client, service
+    app.dependency_overrides.clear()
+    event_loop_runner(client.aclose())
@@ -0,0 +1,94 @@
+"""Per-request CPU to turn a full 7-day / 168-hour forecast into a GET /weather response body.
+
+    cd backend && python -m benchmarks.serialization [--requests N]
+
+"legacy" replays the previous path on the plain Open-Meteo dict: the series are
+validated for the analyzers, again for WeatherResponse, and the returned model
+goes through the route's response_model validation and serialization. The other
+rows are the current path on a cached Forecast with each JSON_ENCODER. Agronomic
+analysis is memoized in every variant, so the numbers isolate validation and encoding.
+"""
+import argparse
+import asyncio
+import time
+from unittest.mock import patch
+import httpx
+from fastapi.routing import APIRoute, serialize_response
+from config import settings
+from routers import weather
+from schemas import Coordinates, WeatherResponse, DailyWeather, HourlyWeather
+from constants import get_weather_description
+from services.agronomic import AgronomicLogic
+from services.open_meteo import OpenMeteoService, stamp_content_hash
+from services.forecast import Forecast
+from services.weather_report import build_weather_report, encode_weather_report
+from benchmarks.fixtures import synthetic_forecast
+
+COORDINATES = Coordinates(name="Ribeirão Preto", latitude=-21.18, longitude=-47.81, country="Brasil", state="São Paulo")
+
+RESPONSE_FIELD = next(
+    route.response_field for route in weather.router.routes
+    if isinstance(route, APIRoute) and route.path.endswith("/{city_name}")
+)
+
+LEGACY_ANALYSIS: dict = {}
+
+async def legacy_body(payload: dict, service: OpenMeteoService, agronomic_service: AgronomicLogic) -> bytes:
+    daily = DailyWeather(**payload["daily"])
+    hourly = HourlyWeather(**payload["hourly"])
+    # Memoized like the current path, so both sides skip the rule evaluation.
+    if payload["content_hash"] not in LEGACY_ANALYSIS:
+        LEGACY_ANALYSIS[payload["content_hash"]] = agronomic_service.analyze(payload["current_weather"], daily, hourly)
+    tips, diagnostics = LEGACY_ANALYSIS[payload["content_hash"]]
+    response = WeatherResponse(
+        city=COORDINATES.name,
+        country=COORDINATES.country,
+        state=COORDINATES.state,
+        latitude=COORDINATES.latitude,
+        longitude=COORDINATES.longitude,
+        grid_cell=service.grid_cell(COORDINATES.latitude, COORDINATES.longitude),
+        weather=payload["current_weather"],
+        condition_description=get_weather_description(payload["current_weather"]["weathercode"]),
+        daily=payload["daily"],
+        hourly=payload["hourly"],
+        agronomic_tips=tips,
+        diagnostics=diagnostics
+    )
+    return await serialize_response(field=RESPONSE_FIELD, response_content=response, dump_json=True)
+
+async def current_body(forecast: Forecast, service: OpenMeteoService, agronomic_service: AgronomicLogic) -> bytes:
+    report = await build_weather_report(COORDINATES, forecast, service, agronomic_service)
+    return encode_weather_report(report)
+
+async def measure(build, forecast, encoder: str, requests: int) -> float:
+    service = OpenMeteoService(httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(503))))
+    agronomic_service = AgronomicLogic()
+
+    with patch.object(settings, "JSON_ENCODER", encoder):
+        await build(forecast, service, agronomic_service)
+        started = time.process_time()
+        for _ in range(requests):
+            await build(forecast, service, agronomic_service)
+        elapsed = time.process_time() - started
+
+    await service.aclose()
+    return elapsed / requests * 1e6
+
+async def main(requests: int):
+    payload = stamp_content_hash(synthetic_forecast())
+    forecast = Forecast.from_payload(payload)
+    rows = [
+        ("legacy (validate x2 + response_model)", legacy_body, payload, "pydantic"),
+        ("current, JSON_ENCODER=pydantic", current_body, forecast, "pydantic"),
+        ("current, JSON_ENCODER=orjson", current_body, forecast, "orjson")
+    ]
+    baseline = None
+    for label, build, source, encoder in rows:
+        per_request = await measure(build, source, encoder, requests)
+        baseline = baseline or per_request
+        print(f"{label:<40} {per_request:8.1f} µs/request  ({baseline / per_request:.2f}x)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    asyncio.run(main(parser.parse_args().requests))
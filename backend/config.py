@@ -1,8 +1,109 @@
+from pathlib import Path
+from typing import List, Literal
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
     OPEN_METEO_GEOCODING_URL: str = "https://geocoding-api.open-meteo.com/v1/search"
     OPEN_METEO_WEATHER_URL: str = "https://api.open-meteo.com/v1/forecast"
+    OPEN_METEO_ARCHIVE_URL: str = "https://archive-api.open-meteo.com/v1/archive"
+
+    # Shared HTTP client
+    HTTP2_ENABLED: bool = True
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    HTTP_TIMEOUT: float = 10.0
+    HTTP_CONNECT_TIMEOUT: float = 5.0
+    HTTP_POOL_TIMEOUT: float = 5.0
+
+    # Upstream resilience. GET requests must finish within REQUEST_DEADLINE seconds
+    # (0 disables): retries stop when their backoff would not leave
+    # UPSTREAM_MIN_ATTEMPT_TIME for another attempt, and attempt timeouts are cut to
+    # what is left. After CIRCUIT_FAILURE_THRESHOLD consecutive failures an upstream's
+    # circuit opens and calls fail fast for CIRCUIT_RESET_TIMEOUT, then one probe is let through.
+    REQUEST_DEADLINE: float = 10.0
+    UPSTREAM_RETRY_ATTEMPTS: int = 3
+    UPSTREAM_RETRY_WAIT_MIN: float = 0.5
+    UPSTREAM_RETRY_WAIT_MAX: float = 4.0
+    UPSTREAM_MIN_ATTEMPT_TIME: float = 1.0
+    CIRCUIT_FAILURE_THRESHOLD: int = 5
+    CIRCUIT_RESET_TIMEOUT: float = 30.0
+
+    # Response cache (TTLs in seconds). The sqlite backend is shared by all workers on a host.
+    CACHE_BACKEND: Literal["memory", "sqlite"] = "memory"
+    CACHE_SQLITE_PATH: str = ".cache/open_meteo.sqlite3"
+    GEOCODING_CACHE_TTL: int = 7 * 24 * 3600
+    GEOCODING_CACHE_MAXSIZE: int = 5000
+    FORECAST_CACHE_TTL: int = 3600
+    FORECAST_CACHE_MAXSIZE: int = 1000
+    # Past FORECAST_CACHE_TTL a forecast is served stale while it is refreshed in the
+    # background, and for longer still when Open-Meteo cannot be reached (0 disables).
+    FORECAST_STALE_WHILE_REVALIDATE: int = 3600
+    FORECAST_STALE_IF_ERROR: int = 24 * 3600
+    # GET /weather/{city_name}/now: current_weather only, refreshed far more often
+    CURRENT_CACHE_TTL: int = 300
+    CURRENT_CACHE_MAXSIZE: int = 2000
+    # Upper bound of ?days= on GET /weather/{city_name} (Open-Meteo serves up to 16)
+    FORECAST_MAX_DAYS: int = 16
+
+    # Forecast grid snapping: nearby points share one cache entry and upstream call.
+    # "degrees" snaps to FORECAST_GRID_RESOLUTION (0 disables), "geohash" to a geohash cell.
+    FORECAST_GRID_MODE: Literal["degrees", "geohash"] = "degrees"
+    FORECAST_GRID_RESOLUTION: float = 0.1
+    FORECAST_GEOHASH_PRECISION: int = 5
+
+    # Local gazetteer of Brazilian places, queried before the remote geocoding API
+    GAZETTEER_ENABLED: bool = True
+    GAZETTEER_PATH: str = str(Path(__file__).parent / "data" / "municipios_br.csv")
+
+    # Declarative agronomic rule table, compiled at startup
+    AGRONOMIC_RULES_PATH: str = str(Path(__file__).parent / "services" / "agronomic" / "rules.json")
+
+    # Pre-encoded GET /weather/{city_name} bodies, served with ETag / Cache-Control
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_MAXSIZE: int = 256
+    RESPONSE_CACHE_MAX_AGE: int = 300
+
+    # Response body encoder: "orjson" encodes the validated source data directly,
+    # "pydantic" dumps the response model with model_dump_json
+    JSON_ENCODER: Literal["orjson", "pydantic"] = "orjson"
+
+    # Prometheus metrics at /metrics and per-request timing middleware
+    METRICS_ENABLED: bool = True
+
+    # Debug profiling of single requests sent with "X-Profile: <PROFILING_SECRET>"
+    # (and optionally "X-Profile-Format: speedscope"). Disabled while the secret is empty.
+    PROFILING_SECRET: str = ""
+    PROFILING_DIR: str = ".profiles"
+
+    # Background refresh of watched locations' forecasts before their cache entries expire.
+    # PREFETCH_LOCATIONS seeds the watch list with city names (JSON list in the environment);
+    # with PREFETCH_WATCH_REQUESTED, cities requested on GET /weather are watched until idle
+    # for PREFETCH_IDLE_TTL seconds. Each worker refreshes its own list; workers sharing the
+    # sqlite cache skip cells another worker has refreshed or is refreshing.
+    PREFETCH_ENABLED: bool = True
+    PREFETCH_LOCATIONS: List[str] = []
+    PREFETCH_WATCH_REQUESTED: bool = False
+    PREFETCH_IDLE_TTL: int = 24 * 3600
+    PREFETCH_MAX_LOCATIONS: int = 500
+    PREFETCH_CONCURRENCY: int = 4
+    # Refresh when this fraction of FORECAST_CACHE_TTL is left, +/- PREFETCH_JITTER of the interval
+    PREFETCH_REFRESH_AHEAD: float = 0.2
+    PREFETCH_JITTER: float = 0.1
+    PREFETCH_RETRY_DELAY: float = 60.0
+
+    # Historical daily weather ingested from the Open-Meteo archive (/archive endpoints).
+    # Degree-days above ARCHIVE_BASE_TEMPERATURE (°C) are precomputed; other bases are
+    # summed on request. ARCHIVE_MAX_DAYS bounds one ingestion or query range.
+    ARCHIVE_SQLITE_PATH: str = ".archive/archive.sqlite3"
+    ARCHIVE_BASE_TEMPERATURE: float = 10.0
+    ARCHIVE_MAX_DAYS: int = 10 * 366
+    ARCHIVE_MAX_WINDOW: int = 90
+
+    # POST /weather/batch
+    BATCH_MAX_LOCATIONS: int = 500
+    BATCH_CONCURRENCY: int = 8
+    BATCH_UPSTREAM_CHUNK_SIZE: int = 50
 
     model_config = SettingsConfigDict(env_file=".env")
 
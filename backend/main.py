@@ -1,8 +1,17 @@
 import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from routers import weather
+from config import settings
+from routers import weather, stats, cities, watch, archive, metrics
+from services.http_client import create_http_client
+from services.open_meteo import OpenMeteoService
+from services.agronomic import AgronomicLogic
+from services.prefetch import PrefetchScheduler
+from services.archive import ArchiveStore
+from services.metrics import MetricsMiddleware, UNHANDLED_ERRORS
+from services.profiling import ProfilingMiddleware
 
 logging.basicConfig(
     level=logging.INFO,
@@ -10,7 +19,21 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="Cana e Clima API", version="1.0.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.open_meteo_service = OpenMeteoService(create_http_client())
+    # Compiles the agronomic rule table once, before the first request.
+    app.state.agronomic_logic = AgronomicLogic()
+    app.state.archive_store = ArchiveStore(settings.ARCHIVE_SQLITE_PATH, settings.ARCHIVE_BASE_TEMPERATURE)
+    app.state.prefetch_scheduler = PrefetchScheduler(app.state.open_meteo_service)
+    if settings.PREFETCH_ENABLED:
+        app.state.prefetch_scheduler.start()
+    yield
+    await app.state.prefetch_scheduler.stop()
+    await app.state.open_meteo_service.aclose()
+    app.state.archive_store.close()
+
+app = FastAPI(title="Cana e Clima API", version="1.0.0", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -22,10 +45,24 @@ app.add_middleware(
 
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
+    UNHANDLED_ERRORS.labels(type(exc).__name__).inc()
     logger.error(f"Global error occurred: {str(exc)}", exc_info=True)
     return JSONResponse(
         status_code=500,
         content={"detail": "Internal Server Error. Please try again later."},
     )
 
-app.include_router(weather.router)
\ No newline at end of file
+app.include_router(weather.router)
+app.include_router(cities.router)
+app.include_router(watch.router)
+app.include_router(archive.router)
+app.include_router(stats.router)
+
+if settings.PROFILING_SECRET:
+    logger.warning("Request profiling is enabled")
+    app.add_middleware(ProfilingMiddleware, secret=settings.PROFILING_SECRET, directory=settings.PROFILING_DIR)
+
+if settings.METRICS_ENABLED:
+    # Added last so it wraps the other middleware and times whole requests.
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(metrics.router)
@@ -0,0 +1,141 @@
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional
+import numpy as np
+from fastapi import APIRouter, Body, Depends, HTTPException, Path, Query, Request
+from config import settings
+from services.open_meteo import OpenMeteoService
+from services.archive import ArchiveStore, day_date, parse_archive_payload, rolling_sums
+from services.batch import resolve_location
+from services.resilience import request_deadline
+from routers.weather import get_open_meteo_service
+from schemas import (
+    AccumulationResponse, ArchiveIngestRequest, ArchiveIngestResponse, ArchiveLocation, RollingResponse
+)
+
+router = APIRouter(
+    prefix="/archive",
+    tags=["archive"],
+    responses={404: {"description": "Not found"}},
+)
+
+def get_archive_store(request: Request) -> ArchiveStore:
+    store = getattr(request.app.state, "archive_store", None)
+    if store is None:
+        store = ArchiveStore(settings.ARCHIVE_SQLITE_PATH, settings.ARCHIVE_BASE_TEMPERATURE)
+        request.app.state.archive_store = store
+    return store
+
+def check_date_range(start_date: date, end_date: date):
+    if end_date < start_date:
+        raise HTTPException(status_code=422, detail="end_date must not be before start_date")
+    if (end_date - start_date).days + 1 > settings.ARCHIVE_MAX_DAYS:
+        raise HTTPException(status_code=422, detail=f"Date range is limited to {settings.ARCHIVE_MAX_DAYS} days")
+
+async def archived_location(city_name: str, service: OpenMeteoService, store: ArchiveStore) -> Dict[str, Any]:
+    coordinates = await service.get_coordinates(city_name)
+    cell = service.grid_cell(coordinates.latitude, coordinates.longitude)
+    location = await store.location(cell.key)
+    if location is None:
+        raise HTTPException(status_code=404, detail="No archived weather for this location")
+    return location
+
+@router.get("/locations", response_model=List[ArchiveLocation])
+async def list_archived_locations(store: ArchiveStore = Depends(get_archive_store)):
+    return await store.locations()
+
+@router.post("/ingest", response_model=ArchiveIngestResponse, dependencies=[Depends(request_deadline)])
+async def ingest_archive(
+    ingest: ArchiveIngestRequest,
+    service: OpenMeteoService = Depends(get_open_meteo_service),
+    store: ArchiveStore = Depends(get_archive_store)
+):
+    check_date_range(ingest.start_date, ingest.end_date)
+    if ingest.end_date >= date.today():
+        raise HTTPException(status_code=422, detail="The archive only covers past days")
+    coordinates = await resolve_location(ingest.location, service)
+    cell = service.grid_cell(coordinates.latitude, coordinates.longitude)
+    payload = await service.get_archive(cell, ingest.start_date, ingest.end_date)
+    try:
+        rows = parse_archive_payload(payload)
+    except (KeyError, ValueError) as e:
+        raise HTTPException(status_code=502, detail=f"Unexpected archive response: {str(e)}")
+    ingested = await store.ingest(cell, coordinates.name, rows)
+    return {"location": await store.location(cell.key), "ingested_days": ingested}
+
+@router.post("/import", response_model=ArchiveIngestResponse)
+async def import_archive(
+    payload: Dict[str, Any] = Body(..., description="Resposta JSON da API de arquivo do Open-Meteo (daily e/ou hourly)"),
+    name: Optional[str] = Query(None, description="Nome do local (padrão: coordenadas)"),
+    service: OpenMeteoService = Depends(get_open_meteo_service),
+    store: ArchiveStore = Depends(get_archive_store)
+):
+    try:
+        latitude, longitude = float(payload["latitude"]), float(payload["longitude"])
+        rows = parse_archive_payload(payload)
+    except (KeyError, TypeError, ValueError) as e:
+        raise HTTPException(status_code=422, detail=f"Invalid archive payload: {str(e)}")
+    if len(rows.days):
+        check_date_range(day_date(rows.days.min()), day_date(rows.days.max()))
+    cell = service.grid_cell(latitude, longitude)
+    ingested = await store.ingest(cell, name or f"{latitude:.4f},{longitude:.4f}", rows)
+    if not ingested:
+        raise HTTPException(status_code=422, detail="Archive payload has no days")
+    return {"location": await store.location(cell.key), "ingested_days": ingested}
+
+@router.get("/{city_name}/accumulation", response_model=AccumulationResponse, dependencies=[Depends(request_deadline)])
+async def get_accumulation(
+    city_name: str = Path(..., min_length=2, description="Nome da cidade para busca"),
+    start_date: date = Query(..., description="Primeiro dia do período (ex.: plantio)"),
+    end_date: date = Query(..., description="Último dia do período"),
+    base_temperature: Optional[float] = Query(None, description="Temperatura base dos graus-dia em °C (padrão: configurada)"),
+    service: OpenMeteoService = Depends(get_open_meteo_service),
+    store: ArchiveStore = Depends(get_archive_store)
+):
+    check_date_range(start_date, end_date)
+    location = await archived_location(city_name, service, store)
+    totals = await store.accumulate(location["cell"], start_date, end_date, base_temperature)
+    if totals is None:
+        raise HTTPException(status_code=404, detail="No archived weather in this period")
+
+    balance = totals["precipitation"] - totals["et0"]
+    return {
+        "location": location,
+        "start_date": start_date,
+        "end_date": end_date,
+        "days": totals["days"],
+        "missing_days": totals["missing_days"],
+        "base_temperature": store.base_temperature if base_temperature is None else base_temperature,
+        "degree_days": round(totals["degree_days"], 2),
+        "precipitation_mm": round(totals["precipitation"], 2),
+        "et0_mm": round(totals["et0"], 2),
+        "water_balance_mm": round(balance, 2),
+        "water_deficit_mm": round(max(-balance, 0.0), 2),
+        "radiation_mj_m2": round(totals["radiation"], 2)
+    }
+
+@router.get("/{city_name}/rolling", response_model=RollingResponse, dependencies=[Depends(request_deadline)])
+async def get_rolling_sums(
+    city_name: str = Path(..., min_length=2, description="Nome da cidade para busca"),
+    start_date: date = Query(..., description="Primeiro dia da série"),
+    end_date: date = Query(..., description="Último dia da série"),
+    window: int = Query(7, ge=1, le=settings.ARCHIVE_MAX_WINDOW, description="Janela móvel em dias"),
+    base_temperature: Optional[float] = Query(None, description="Temperatura base dos graus-dia em °C (padrão: configurada)"),
+    service: OpenMeteoService = Depends(get_open_meteo_service),
+    store: ArchiveStore = Depends(get_archive_store)
+):
+    check_date_range(start_date, end_date)
+    location = await archived_location(city_name, service, store)
+    # The first day's window reaches back window - 1 days before start_date.
+    daily = await store.daily(location["cell"], start_date - timedelta(days=window - 1), end_date, base_temperature)
+    sums = {name: rolling_sums(values, window) for name, values in daily.columns.items()}
+
+    return {
+        "location": location,
+        "window": window,
+        "base_temperature": store.base_temperature if base_temperature is None else base_temperature,
+        "time": [start_date + timedelta(days=offset) for offset in range(len(sums["precipitation"]))],
+        "degree_days": np.round(sums["degree_days"], 2).tolist(),
+        "precipitation_mm": np.round(sums["precipitation"], 2).tolist(),
+        "et0_mm": np.round(sums["et0"], 2).tolist(),
+        "water_balance_mm": np.round(sums["precipitation"] - sums["et0"], 2).tolist()
+    }
@@ -0,0 +1,20 @@
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query
+from services.open_meteo import OpenMeteoService
+from routers.weather import get_open_meteo_service
+from schemas import Coordinates
+
+router = APIRouter(
+    prefix="/cities",
+    tags=["cities"],
+)
+
+@router.get("/search", response_model=List[Coordinates])
+async def search_cities(
+    q: str = Query(..., min_length=2, description="Início do nome da cidade, opcionalmente com a UF (ex: 'Ribeirão, SP')"),
+    limit: int = Query(10, ge=1, le=50),
+    service: OpenMeteoService = Depends(get_open_meteo_service)
+):
+    if not service.gazetteer:
+        raise HTTPException(status_code=503, detail="Local gazetteer is not available")
+    return service.gazetteer.search(q, limit)
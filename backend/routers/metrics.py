@@ -0,0 +1,22 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import Response
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, generate_latest
+from services.open_meteo import OpenMeteoService
+from services.prefetch import PrefetchScheduler
+from services.metrics import REGISTRY, ServiceCollector
+from routers.weather import get_open_meteo_service, get_prefetch_scheduler
+
+router = APIRouter(tags=["metrics"])
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics(
+    service: OpenMeteoService = Depends(get_open_meteo_service),
+    scheduler: PrefetchScheduler = Depends(get_prefetch_scheduler)
+):
+    # The service state is collected for this scrape only, from whichever service the app runs.
+    service_registry = CollectorRegistry(auto_describe=False)
+    service_registry.register(ServiceCollector(service, scheduler))
+    return Response(
+        content=generate_latest(REGISTRY) + generate_latest(service_registry),
+        media_type=CONTENT_TYPE_LATEST
+    )
@@ -0,0 +1,29 @@
+from fastapi import APIRouter, Depends
+from services.open_meteo import OpenMeteoService
+from services.prefetch import PrefetchScheduler
+from routers.weather import get_open_meteo_service, get_prefetch_scheduler
+
+router = APIRouter(
+    prefix="/stats",
+    tags=["stats"],
+)
+
+@router.get("/http")
+async def get_http_stats(service: OpenMeteoService = Depends(get_open_meteo_service)):
+    return service.pool_stats()
+
+@router.get("/cache")
+async def get_cache_stats(service: OpenMeteoService = Depends(get_open_meteo_service)):
+    return service.cache_stats()
+
+@router.get("/upstream")
+async def get_upstream_stats(service: OpenMeteoService = Depends(get_open_meteo_service)):
+    return service.upstream_stats()
+
+@router.get("/singleflight")
+async def get_singleflight_stats(service: OpenMeteoService = Depends(get_open_meteo_service)):
+    return service.singleflight_stats()
+
+@router.get("/prefetch")
+async def get_prefetch_stats(scheduler: PrefetchScheduler = Depends(get_prefetch_scheduler)):
+    return scheduler.stats()
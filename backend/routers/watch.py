@@ -0,0 +1,38 @@
+import time
+from fastapi import APIRouter, Depends, HTTPException
+from config import settings
+from services.open_meteo import OpenMeteoService
+from services.prefetch import PrefetchScheduler
+from services.batch import resolve_location
+from routers.weather import get_open_meteo_service, get_prefetch_scheduler
+from schemas import BatchLocation
+
+router = APIRouter(
+    prefix="/watch",
+    tags=["watch"],
+)
+
+@router.get("")
+async def list_watched_locations(scheduler: PrefetchScheduler = Depends(get_prefetch_scheduler)):
+    return scheduler.stats()["locations"]
+
+@router.post("", status_code=201)
+async def watch_location(
+    location: BatchLocation,
+    service: OpenMeteoService = Depends(get_open_meteo_service),
+    scheduler: PrefetchScheduler = Depends(get_prefetch_scheduler)
+):
+    coordinates = await resolve_location(location, service)
+    cell = service.grid_cell(coordinates.latitude, coordinates.longitude)
+    watched = scheduler.watch(cell, coordinates.name)
+    if watched is None:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Watch list is limited to {settings.PREFETCH_MAX_LOCATIONS} locations"
+        )
+    return watched.to_dict(time.monotonic())
+
+@router.delete("/{key}", status_code=204)
+async def unwatch_location(key: str, scheduler: PrefetchScheduler = Depends(get_prefetch_scheduler)):
+    if not scheduler.registry.unwatch(key):
+        raise HTTPException(status_code=404, detail="Location is not watched")
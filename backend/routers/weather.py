@@ -1,8 +1,19 @@
-from fastapi import APIRouter, Depends, Path
+from typing import List, Literal, Optional, Tuple
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request
+from fastapi.responses import Response, StreamingResponse
+from config import settings
 from services.open_meteo import OpenMeteoService
 from services.agronomic import AgronomicLogic
-from schemas import WeatherResponse, DailyWeather, HourlyWeather
-from constants import get_weather_description
+from services.forecast import DAILY_COLUMNS, FORECAST_DAYS, HOURLY_COLUMNS
+from services.weather_report import (
+    ReportOptions, build_current_report, build_weather_report, encode_current_report, encode_weather_report,
+    encoded_weather_response, response_etag
+)
+from services.serialization import ORJSONResponse
+from services.batch import run_batch, stream_batch
+from services.prefetch import PrefetchScheduler
+from services.resilience import request_deadline
+from schemas import WeatherResponse, CurrentConditionsResponse, BatchLocation, BatchWeatherRequest, BatchWeatherResponse
 
 router = APIRouter(
     prefix="/weather",
@@ -10,50 +21,140 @@ router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
-def get_open_meteo_service():
-    return OpenMeteoService()
+def get_open_meteo_service(request: Request) -> OpenMeteoService:
+    # The service (and its pooled HTTP client) is created by the app lifespan.
+    # Fall back to a lazily created one when the app runs without it (e.g. TestClient).
+    service = getattr(request.app.state, "open_meteo_service", None)
+    if service is None:
+        service = OpenMeteoService()
+        request.app.state.open_meteo_service = service
+    return service
 
-def get_agronomic_logic():
-    return AgronomicLogic()
+def get_agronomic_logic(request: Request) -> AgronomicLogic:
+    agronomic_logic = getattr(request.app.state, "agronomic_logic", None)
+    if agronomic_logic is None:
+        agronomic_logic = AgronomicLogic()
+        request.app.state.agronomic_logic = agronomic_logic
+    return agronomic_logic
 
-@router.get("/{city_name}", response_model=WeatherResponse)
-async def get_weather(
-    city_name: str = Path(..., min_length=2, description="Nome da cidade para busca"), 
+def get_prefetch_scheduler(request: Request) -> PrefetchScheduler:
+    # Without the lifespan the scheduler only keeps the registry; it is never started.
+    scheduler = getattr(request.app.state, "prefetch_scheduler", None)
+    if scheduler is None:
+        scheduler = PrefetchScheduler(get_open_meteo_service(request))
+        request.app.state.prefetch_scheduler = scheduler
+    return scheduler
+
+def check_batch_size(locations: List[BatchLocation]):
+    if len(locations) > settings.BATCH_MAX_LOCATIONS:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Batch is limited to {settings.BATCH_MAX_LOCATIONS} locations"
+        )
+
+@router.post("/batch", response_model=BatchWeatherResponse)
+async def get_weather_batch(
+    batch: BatchWeatherRequest,
+    service: OpenMeteoService = Depends(get_open_meteo_service),
+    agronomic_service: AgronomicLogic = Depends(get_agronomic_logic)
+):
+    check_batch_size(batch.locations)
+    results = await run_batch(batch.locations, service, agronomic_service)
+    # Results are already validated models; encode them here instead of having the
+    # response_model validate them a second time.
+    return ORJSONResponse(content=BatchWeatherResponse(results=results).model_dump_json().encode("utf-8"))
+
+@router.post("/batch/stream")
+async def stream_weather_batch(
+    batch: BatchWeatherRequest,
+    format: Literal["ndjson", "sse"] = Query("ndjson", description="ndjson ou sse (Server-Sent Events)"),
+    service: OpenMeteoService = Depends(get_open_meteo_service),
+    agronomic_service: AgronomicLogic = Depends(get_agronomic_logic)
+):
+    check_batch_size(batch.locations)
+
+    async def ndjson():
+        async for result in stream_batch(batch.locations, service, agronomic_service):
+            yield result.model_dump_json() + "\n"
+
+    async def sse():
+        async for result in stream_batch(batch.locations, service, agronomic_service):
+            yield f"event: result\ndata: {result.model_dump_json()}\n\n"
+        yield "event: end\ndata: {}\n\n"
+
+    if format == "sse":
+        return StreamingResponse(sse(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+@router.get("/{city_name}/now", response_model=CurrentConditionsResponse, dependencies=[Depends(request_deadline)])
+async def get_current_conditions(
+    city_name: str = Path(..., min_length=2, description="Nome da cidade para busca"),
     service: OpenMeteoService = Depends(get_open_meteo_service),
     agronomic_service: AgronomicLogic = Depends(get_agronomic_logic)
 ):
     coordinates = await service.get_coordinates(city_name)
-    weather_data = await service.get_weather(coordinates.latitude, coordinates.longitude)
-    
-    weather_data = service.enrich_weather_data(weather_data)
-    
-    current_weather_code = weather_data.get("current_weather", {}).get("weathercode", 0)
-
-    daily_data = DailyWeather(**weather_data.get("daily")) if weather_data.get("daily") else None
-    hourly_data = HourlyWeather(**weather_data.get("hourly")) if weather_data.get("hourly") else None
-    
-    tips = agronomic_service.generate_tips(
-        weather_data.get("current_weather", {}),
-        daily_data,
-        hourly_data
+    forecast = await service.get_current(coordinates.latitude, coordinates.longitude)
+    report = build_current_report(coordinates, forecast, service, agronomic_service)
+    return ORJSONResponse(
+        content=encode_current_report(report),
+        headers={"Cache-Control": f"public, max-age={settings.CURRENT_CACHE_TTL}"}
     )
 
-    diagnostics = agronomic_service.generate_diagnostics(
-        weather_data.get("current_weather", {}),
-        daily_data,
-        hourly_data
-    )
+def split_values(values: Optional[List[str]]) -> Tuple[str, ...]:
+    # Accepts both ?fields=a&fields=b and ?fields=a,b
+    return tuple(dict.fromkeys(
+        item.strip() for value in values or [] for item in value.split(",") if item.strip()
+    ))
+
+def report_options(days: int, phases: Optional[List[str]], fields: Optional[List[str]], agronomic_service: AgronomicLogic) -> ReportOptions:
+    phases, fields = split_values(phases), split_values(fields)
+
+    unknown_phases = [phase for phase in phases if phase not in agronomic_service.rule_set.phases]
+    if unknown_phases:
+        raise HTTPException(status_code=422, detail=f"Unknown phases: {', '.join(unknown_phases)}")
+    unknown_fields = [field for field in fields if field not in HOURLY_COLUMNS + DAILY_COLUMNS]
+    if unknown_fields:
+        raise HTTPException(status_code=422, detail=f"Unknown fields: {', '.join(unknown_fields)}")
 
-    return WeatherResponse(
-        city=coordinates.name,
-        country=coordinates.country,
-        state=coordinates.state,
-        latitude=coordinates.latitude,
-        longitude=coordinates.longitude,
-        weather=weather_data.get("current_weather", {}),
-        condition_description=get_weather_description(current_weather_code),
-        daily=weather_data.get("daily"),
-        hourly=weather_data.get("hourly"),
-        agronomic_tips=tips,
-        diagnostics=diagnostics
+    # Sorted so equivalent requests share cache entries.
+    return ReportOptions(days, tuple(sorted(phases)), tuple(sorted(fields)))
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+@router.get("/{city_name}", response_model=WeatherResponse, dependencies=[Depends(request_deadline)])
+async def get_weather(
+    request: Request,
+    city_name: str = Path(..., min_length=2, description="Nome da cidade para busca"), 
+    days: int = Query(FORECAST_DAYS, ge=1, le=settings.FORECAST_MAX_DAYS, description="Dias de previsão"),
+    phases: Optional[List[str]] = Query(None, description="Fases a analisar: sprouting, growth, ripening (padrão: todas)"),
+    fields: Optional[List[str]] = Query(None, description="Séries horárias/diárias a retornar (padrão: todas)"),
+    service: OpenMeteoService = Depends(get_open_meteo_service),
+    agronomic_service: AgronomicLogic = Depends(get_agronomic_logic),
+    scheduler: PrefetchScheduler = Depends(get_prefetch_scheduler)
+):
+    options = report_options(days, phases, fields, agronomic_service)
+    coordinates = await service.get_coordinates(city_name)
+    if settings.PREFETCH_WATCH_REQUESTED:
+        # Requested cities are kept warm until they go unrequested for PREFETCH_IDLE_TTL.
+        scheduler.watch(service.grid_cell(coordinates.latitude, coordinates.longitude), coordinates.name, pinned=False)
+    forecast = await service.get_weather(
+        coordinates.latitude, coordinates.longitude, options.selection(agronomic_service)
     )
+
+    etag = response_etag(coordinates, forecast, agronomic_service, options) if settings.RESPONSE_CACHE_ENABLED else None
+    if etag is None:
+        report = await build_weather_report(coordinates, forecast, service, agronomic_service, options)
+        return ORJSONResponse(content=encode_weather_report(report))
+
+    # Clients should not keep a stale forecast; the next request may already find it refreshed.
+    cache_control = "no-cache" if forecast.stale else f"public, max-age={settings.RESPONSE_CACHE_MAX_AGE}"
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    body = await encoded_weather_response(etag, coordinates, forecast, service, agronomic_service, options)
+    return ORJSONResponse(content=body, headers=headers)
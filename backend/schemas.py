@@ -1,4 +1,5 @@
-from pydantic import BaseModel
+from datetime import date
+from pydantic import BaseModel, Field, model_validator
 from typing import Optional, Dict, Any, List
 
 class Coordinates(BaseModel):
@@ -8,23 +9,28 @@ class Coordinates(BaseModel):
     country: Optional[str] = None
     state: Optional[str] = None
 
+class GridCell(BaseModel):
+    key: str
+    latitude: float
+    longitude: float
+    resolution: str
+
+# Series are optional because clients can ask for a subset of them (?fields=).
 class DailyWeather(BaseModel):
     time: List[str]
-    precipitation_sum: List[Optional[float]]
-    et0_fao_evapotranspiration: List[Optional[float]]
-    shortwave_radiation_sum: List[Optional[float]]
-    weathercode: List[Optional[int]]
-    weather_description: List[str]
+    precipitation_sum: Optional[List[Optional[float]]] = None
+    et0_fao_evapotranspiration: Optional[List[Optional[float]]] = None
+    shortwave_radiation_sum: Optional[List[Optional[float]]] = None
+    weathercode: Optional[List[Optional[int]]] = None
 
 class HourlyWeather(BaseModel):
     time: List[str]
-    temperature_2m: List[Optional[float]]
-    relativehumidity_2m: List[Optional[float]]
-    windspeed_10m: List[Optional[float]]
-    weathercode: List[Optional[int]]
-    soil_moisture_0_to_1cm: List[Optional[float]]
-    soil_moisture_27_to_81cm: List[Optional[float]]
-    weather_description: List[str]
+    temperature_2m: Optional[List[Optional[float]]] = None
+    relativehumidity_2m: Optional[List[Optional[float]]] = None
+    windspeed_10m: Optional[List[Optional[float]]] = None
+    weathercode: Optional[List[Optional[int]]] = None
+    soil_moisture_0_to_1cm: Optional[List[Optional[float]]] = None
+    soil_moisture_27_to_81cm: Optional[List[Optional[float]]] = None
 
 class AgronomicTip(BaseModel):
     message: str
@@ -41,9 +47,93 @@ class WeatherResponse(BaseModel):
     state: Optional[str]
     latitude: float
     longitude: float
+    grid_cell: Optional[GridCell] = None
     weather: Dict[str, Any]
     condition_description: str
     daily: Optional[DailyWeather] = None
     hourly: Optional[HourlyWeather] = None
+    # Text for every weathercode in current/daily/hourly, sent once per response.
+    weather_descriptions: Optional[Dict[int, str]] = None
     agronomic_tips: Optional[List[Dict[str, List[AgronomicTip]]]] = None
     diagnostics: Optional[List[Dict[str, List[Diagnostic]]]] = None
+    # True when the forecast is past its cache TTL: being refreshed, or Open-Meteo is unavailable.
+    stale: bool = False
+
+class CurrentConditionsResponse(BaseModel):
+    city: str
+    country: Optional[str]
+    state: Optional[str]
+    latitude: float
+    longitude: float
+    grid_cell: Optional[GridCell] = None
+    weather: Dict[str, Any]
+    condition_description: str
+    agronomic_tips: Dict[str, List[AgronomicTip]]
+    diagnostics: Dict[str, List[Diagnostic]]
+
+class BatchLocation(BaseModel):
+    city: Optional[str] = None
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
+    name: Optional[str] = None
+
+    @model_validator(mode="after")
+    def check_city_or_coordinates(self):
+        if not self.city and (self.latitude is None or self.longitude is None):
+            raise ValueError("Provide either 'city' or both 'latitude' and 'longitude'")
+        return self
+
+class BatchWeatherRequest(BaseModel):
+    locations: List[BatchLocation]
+
+class BatchWeatherResult(BaseModel):
+    index: int
+    location: BatchLocation
+    status: int
+    data: Optional[WeatherResponse] = None
+    error: Optional[str] = None
+
+class BatchWeatherResponse(BaseModel):
+    results: List[BatchWeatherResult]
+
+class ArchiveIngestRequest(BaseModel):
+    location: BatchLocation
+    start_date: date
+    end_date: date
+
+class ArchiveLocation(BaseModel):
+    cell: str
+    label: str
+    latitude: float
+    longitude: float
+    first_day: date
+    last_day: date
+    days: int
+
+class ArchiveIngestResponse(BaseModel):
+    location: ArchiveLocation
+    ingested_days: int
+
+class AccumulationResponse(BaseModel):
+    location: ArchiveLocation
+    start_date: date
+    end_date: date
+    days: int
+    missing_days: int
+    base_temperature: float
+    degree_days: float
+    precipitation_mm: float
+    et0_mm: float
+    water_balance_mm: float
+    water_deficit_mm: float
+    radiation_mj_m2: float
+
+class RollingResponse(BaseModel):
+    location: ArchiveLocation
+    window: int
+    base_temperature: float
+    time: List[date]
+    degree_days: List[float]
+    precipitation_mm: List[float]
+    et0_mm: List[float]
+    water_balance_mm: List[float]
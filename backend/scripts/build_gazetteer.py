@@ -0,0 +1,50 @@
+"""Builds data/municipios_br.csv from the GeoNames populated places dataset (CC BY 4.0).
+
+Usage (from backend/): pip install geonamescache && python scripts/build_gazetteer.py
+"""
+import csv
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from geonamescache import GeonamesCache
+from services.gazetteer import normalize_name
+
+# GeoNames admin1 codes for Brazil
+GEONAMES_ADMIN1_TO_UF = {
+    "01": "AC", "02": "AL", "03": "AP", "04": "AM", "05": "BA", "06": "CE", "07": "DF",
+    "08": "ES", "11": "MS", "13": "MA", "14": "MT", "15": "MG", "16": "PA", "17": "PB",
+    "18": "PR", "20": "PI", "21": "RJ", "22": "RN", "23": "RS", "24": "RO", "25": "RR",
+    "26": "SC", "27": "SP", "28": "SE", "29": "GO", "30": "PE", "31": "TO"
+}
+
+OUTPUT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "municipios_br.csv")
+
+def main():
+    places = {}
+    for city in GeonamesCache(min_city_population=500).get_cities().values():
+        state_code = GEONAMES_ADMIN1_TO_UF.get(city["admin1code"])
+        if city["countrycode"] != "BR" or not state_code:
+            continue
+
+        # Keep the most populous place when a name repeats within a state.
+        key = (normalize_name(city["name"]), state_code)
+        if key not in places or city["population"] > places[key]["population"]:
+            places[key] = {
+                "name": city["name"],
+                "state_code": state_code,
+                "latitude": round(city["latitude"], 5),
+                "longitude": round(city["longitude"], 5),
+                "population": city["population"]
+            }
+
+    with open(OUTPUT_PATH, "w", newline="", encoding="utf-8") as csv_file:
+        writer = csv.DictWriter(csv_file, fieldnames=["name", "state_code", "latitude", "longitude", "population"])
+        writer.writeheader()
+        writer.writerows(sorted(places.values(), key=lambda place: (place["state_code"], normalize_name(place["name"]))))
+
+    print(f"Wrote {len(places)} places to {OUTPUT_PATH}")
+
+if __name__ == "__main__":
+    main()
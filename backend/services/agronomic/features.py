@@ -0,0 +1,158 @@
+import math
+from typing import Any, Dict, Optional, Sequence, Tuple, Union
+import numpy as np
+from schemas import DailyWeather, HourlyWeather
+from services.forecast import FORECAST_DAYS, SeriesTable
+
+HOURS_PER_DAY = 24
+# The "recent" soil moisture reading of a day is its 13th valid hour (index 12, around noon).
+NOON_RANK = 13
+
+HOURLY_SERIES = (
+    "temperature_2m",
+    "relativehumidity_2m",
+    "windspeed_10m",
+    "soil_moisture_0_to_1cm",
+    "soil_moisture_27_to_81cm"
+)
+
+# Where each feature comes from: (block, variable), block being current_weather/hourly/daily.
+FEATURE_SOURCES = {
+    "is_today": None,
+    "current_temperature": ("current_weather", "temperature"),
+    "current_windspeed": ("current_weather", "windspeed"),
+    "temp_min": ("hourly", "temperature_2m"),
+    "temp_max": ("hourly", "temperature_2m"),
+    "temp_mean": ("hourly", "temperature_2m"),
+    "temp_amplitude": ("hourly", "temperature_2m"),
+    "humidity_mean": ("hourly", "relativehumidity_2m"),
+    "wind_max": ("hourly", "windspeed_10m"),
+    "surface_moisture": ("hourly", "soil_moisture_0_to_1cm"),
+    "root_moisture": ("hourly", "soil_moisture_27_to_81cm"),
+    "rain": ("daily", "precipitation_sum"),
+    "radiation": ("daily", "shortwave_radiation_sum")
+}
+
+FEATURE_NAMES = frozenset(FEATURE_SOURCES)
+
+def feature_block(feature: str) -> Optional[str]:
+    source = FEATURE_SOURCES[feature]
+    return source[0] if source else None
+
+def feature_variables(features: Sequence[str], block: str) -> Tuple[str, ...]:
+    """Upstream variables of one block the given features are computed from, in a stable order."""
+    sources = filter(None, (FEATURE_SOURCES[feature] for feature in features))
+    return tuple(sorted({variable for source_block, variable in sources if source_block == block}))
+
+Series = Union[SeriesTable, DailyWeather, HourlyWeather, None]
+
+def series_values(block: Series, name: str) -> np.ndarray:
+    """One series as a float array with NaN for missing values, from a SeriesTable or a schema model."""
+    if isinstance(block, SeriesTable):
+        return block.column(name)
+    return np.array(getattr(block, name, None) or [], dtype=float)
+
+def fit(values: np.ndarray, length: int) -> np.ndarray:
+    vector = np.full(length, np.nan)
+    values = values[:length]
+    vector[:len(values)] = values
+    return vector
+
+def hourly_cube(hourly: Series, series: Sequence[str], days: int) -> np.ndarray:
+    """Stacks hourly series into one (series, days, 24) array, NaN for missing hours."""
+    hours = days * HOURS_PER_DAY
+    rows = [fit(series_values(hourly, name), hours) for name in series]
+    return np.stack(rows).reshape(len(series), days, HOURS_PER_DAY)
+
+def daily_vector(daily: Series, name: str, days: int) -> np.ndarray:
+    return fit(series_values(daily, name), days)
+
+def current_value(current_weather: Dict[str, Any], key: str) -> float:
+    value = current_weather.get(key)
+    return math.nan if value is None else float(value)
+
+class HourlyStats:
+    """Per-day aggregates of hourly series, computed for every series and day at once.
+
+    Missing hours are ignored; a day with no valid hours yields NaN, and every
+    comparison against NaN is False, just like the "is not None" guards it replaces.
+    """
+
+    def __init__(self, cube: np.ndarray):
+        valid = ~np.isnan(cube)
+        if valid.all():
+            self._complete(cube)
+        else:
+            self._partial(cube, valid)
+
+    def _complete(self, cube: np.ndarray):
+        # Common case: every hour is present, so no masking is needed.
+        self.max = cube.max(axis=-1)
+        self.min = cube.min(axis=-1)
+        # cumsum adds hours in order, matching sum() over the day's list bit for bit.
+        self.mean = np.cumsum(cube, axis=-1)[..., -1] / HOURS_PER_DAY
+        self.noon = cube[..., NOON_RANK - 1]
+
+    def _partial(self, cube: np.ndarray, valid: np.ndarray):
+        count = valid.sum(axis=-1)
+        has_data = count > 0
+        empty = np.full(count.shape, np.nan)
+
+        self.max = np.where(has_data, np.where(valid, cube, -np.inf).max(axis=-1), empty)
+        self.min = np.where(has_data, np.where(valid, cube, np.inf).min(axis=-1), empty)
+        total = np.cumsum(np.where(valid, cube, 0.0), axis=-1)[..., -1]
+        self.mean = np.where(has_data, total / np.maximum(count, 1), empty)
+
+        rank = np.cumsum(valid, axis=-1)
+        at_noon = valid & (rank == NOON_RANK)
+        index = np.where(at_noon.any(axis=-1), at_noon.argmax(axis=-1), valid.argmax(axis=-1))
+        self.noon = np.where(has_data, np.take_along_axis(cube, index[..., None], axis=-1)[..., 0], empty)
+
+class DayFeatures:
+    """Hourly and daily forecast series reshaped to (days, 24) and reduced once per forecast.
+
+    Only the hourly series listed in `series` are reduced; features of the others are NaN.
+    """
+
+    def __init__(self, daily: Series, hourly: Series, days: int = FORECAST_DAYS, series: Sequence[str] = HOURLY_SERIES):
+        self.days = days
+        self.is_today = np.arange(days) == 0
+
+        series = [name for name in HOURLY_SERIES if name in series]
+        stats = HourlyStats(hourly_cube(hourly, series, days)) if series else None
+        rows = {name: row for row, name in enumerate(series)}
+
+        def reduce(name: str, statistic: str) -> np.ndarray:
+            if name not in rows:
+                return np.full(days, np.nan)
+            return getattr(stats, statistic)[rows[name]]
+
+        self.temp_min = reduce("temperature_2m", "min")
+        self.temp_max = reduce("temperature_2m", "max")
+        self.temp_mean = reduce("temperature_2m", "mean")
+        self.temp_amplitude = self.temp_max - self.temp_min
+        self.humidity_mean = reduce("relativehumidity_2m", "mean")
+        self.wind_max = reduce("windspeed_10m", "max")
+        self.surface_moisture = reduce("soil_moisture_0_to_1cm", "noon")
+        self.root_moisture = reduce("soil_moisture_27_to_81cm", "noon")
+
+        self.rain = daily_vector(daily, "precipitation_sum", days)
+        self.radiation = daily_vector(daily, "shortwave_radiation_sum", days)
+
+    def table(self, current_weather: Dict[str, Any]) -> Dict[str, np.ndarray]:
+        """Every feature the rule table can reference, as one value per day."""
+        return {
+            "is_today": self.is_today.astype(float),
+            "current_temperature": np.full(self.days, current_value(current_weather, "temperature")),
+            "current_windspeed": np.full(self.days, current_value(current_weather, "windspeed")),
+            "temp_min": self.temp_min,
+            "temp_max": self.temp_max,
+            "temp_mean": self.temp_mean,
+            "temp_amplitude": self.temp_amplitude,
+            "humidity_mean": self.humidity_mean,
+            "wind_max": self.wind_max,
+            "surface_moisture": self.surface_moisture,
+            "root_moisture": self.root_moisture,
+            "rain": self.rain,
+            "radiation": self.radiation
+        }
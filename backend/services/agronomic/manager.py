@@ -1,60 +1,37 @@
-from typing import List, Dict, Any
-from schemas import DailyWeather, HourlyWeather
-from .sprouting import SproutingAnalyzer
-from .growth import GrowthAnalyzer
-from .ripening import RipeningAnalyzer
+from typing import Dict, Any, Optional, Sequence, Tuple
+from services.forecast import FORECAST_DAYS
+from .features import DayFeatures, Series
+from .rules import DailyResults, PhaseResults, RuleSet, get_rule_set
 
 class AgronomicLogic:
-    def __init__(self):
-        self.sprouting = SproutingAnalyzer()
-        self.growth = GrowthAnalyzer()
-        self.ripening = RipeningAnalyzer()
-
-    def generate_diagnostics(self, current_weather: Dict[str, Any], daily: DailyWeather, hourly: HourlyWeather) -> List[Dict[str, List[Dict[str, str]]]]:
-        daily_diagnostics = []
-
-        for day_index in range(7):
-            is_today = (day_index == 0)
-            
-            diagnostics = {
-                "sprouting": self.sprouting.analyze_diagnostics(current_weather, daily, hourly, day_index, is_today),
-                "growth": self.growth.analyze_diagnostics(current_weather, daily, hourly, day_index, is_today),
-                "ripening": self.ripening.analyze_diagnostics(current_weather, daily, hourly, day_index, is_today)
-            }
-
-            # Default Diagnostics
-            for phase in diagnostics:
-                if not diagnostics[phase]:
-                    diagnostics[phase].append({
-                        "title": "Condições Normais",
-                        "message": "Monitoramento de rotina. Nenhuma condição crítica.",
-                        "type": "success"
-                    })
-            
-            daily_diagnostics.append(diagnostics)
-
-        return daily_diagnostics
-
-    def generate_tips(self, current_weather: Dict[str, Any], daily: DailyWeather, hourly: HourlyWeather) -> List[Dict[str, List[Dict[str, str]]]]:
-        daily_tips = []
-
-        for day_index in range(7):
-            is_today = (day_index == 0)
-            
-            tips = {
-                "sprouting": self.sprouting.analyze_tips(current_weather, daily, hourly, day_index, is_today),
-                "growth": self.growth.analyze_tips(current_weather, daily, hourly, day_index, is_today),
-                "ripening": self.ripening.analyze_tips(current_weather, daily, hourly, day_index, is_today)
-            }
-
-            # Default Tips
-            for phase in tips:
-                if not tips[phase]:
-                    tips[phase].append({
-                        "message": "✅ Condições Normais: Monitoramento de rotina.",
-                        "type": "success"
-                    })
-            
-            daily_tips.append(tips)
-
-        return daily_tips
+    def __init__(self, rule_set: Optional[RuleSet] = None):
+        self.rule_set = rule_set or get_rule_set()
+
+    def analyze(
+        self,
+        current_weather: Dict[str, Any],
+        daily: Series,
+        hourly: Series,
+        days: int = FORECAST_DAYS,
+        phases: Optional[Sequence[str]] = None
+    ) -> Tuple[DailyResults, DailyResults]:
+        """Computes the day features once and returns (tips, diagnostics) from the same pass.
+
+        With phases, only those phases' rules run and only the hourly series they read are reduced.
+        """
+        rule_set = self.rule_set.for_phases(phases)
+        features = DayFeatures(daily, hourly, days, rule_set.hourly_variables)
+        return rule_set.evaluate(features.table(current_weather), features.days)
+
+    def generate_diagnostics(self, current_weather: Dict[str, Any], daily: Series, hourly: Series) -> DailyResults:
+        return self.analyze(current_weather, daily, hourly)[1]
+
+    def generate_tips(self, current_weather: Dict[str, Any], daily: Series, hourly: Series) -> DailyResults:
+        return self.analyze(current_weather, daily, hourly)[0]
+
+    def analyze_current(self, current_weather: Dict[str, Any]) -> Tuple[PhaseResults, PhaseResults]:
+        """(tips, diagnostics) for right now, from the rules that only read current_weather."""
+        rule_set = self.rule_set.for_current_conditions()
+        features = DayFeatures(None, None, days=1, series=())
+        tips, diagnostics = rule_set.evaluate(features.table(current_weather), features.days)
+        return tips[0], diagnostics[0]
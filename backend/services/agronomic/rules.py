@@ -0,0 +1,172 @@
+import hashlib
+import json
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from config import settings
+from .features import FEATURE_NAMES, feature_block, feature_variables
+
+PhaseResults = Dict[str, List[Dict[str, str]]]
+DailyResults = List[PhaseResults]
+
+OUTPUTS = ("tips", "diagnostics")
+
+OPERATORS = {
+    "<": np.less,
+    "<=": np.less_equal,
+    ">": np.greater,
+    ">=": np.greater_equal,
+    "==": np.equal
+}
+
+# "when" is sugar for a condition on the is_today feature.
+WHEN_CONDITIONS = {
+    "always": [],
+    "today": [("is_today", "==", 1.0)],
+    "forecast": [("is_today", "==", 0.0)]
+}
+
+class RuleSet:
+    """Agronomic rules compiled from their declarative definition into an evaluation plan.
+
+    Identical conditions are deduplicated across rules, every condition is evaluated
+    for all days with one array comparison per operator, and a rule/condition
+    incidence matrix turns those into per-rule day masks with a single matrix product.
+    """
+
+    def __init__(self, definition: Dict[str, Any], version: str):
+        self.definition = definition
+        self.version = version
+        self.phases: List[str] = definition["phases"]
+        self.defaults: Dict[str, Dict[str, str]] = definition["defaults"]
+        self._subsets: Dict[Any, "RuleSet"] = {}
+
+        conditions: List[Tuple[str, str, float]] = []
+        incidence: List[List[int]] = []
+        self._emits: List[Tuple[int, str, Dict[str, str]]] = []
+
+        seen_ids = set()
+        for rule in definition["rules"]:
+            self._validate(rule)
+            if "id" in rule:
+                if rule["id"] in seen_ids:
+                    raise ValueError(f"Rule {rule['id']}: duplicate id")
+                seen_ids.add(rule["id"])
+            rule_conditions = WHEN_CONDITIONS[rule.get("when", "always")] + [
+                (feature, op, float(value)) for feature, op, value in rule["conditions"]
+            ]
+            indexes = []
+            for condition in rule_conditions:
+                if condition not in conditions:
+                    conditions.append(condition)
+                indexes.append(conditions.index(condition))
+            incidence.append(indexes)
+
+            item = {key: rule[key] for key in ("title", "message", "type") if key in rule}
+            self._emits.append((OUTPUTS.index(rule["output"]), rule["phase"], item))
+
+        self.features = sorted({feature for feature, _, _ in conditions})
+        # Upstream variables the rules need; anything else only has to be fetched for display.
+        self.hourly_variables = feature_variables(self.features, "hourly")
+        self.daily_variables = feature_variables(self.features, "daily")
+        feature_rows = {feature: row for row, feature in enumerate(self.features)}
+
+        self._by_operator = []
+        for op in OPERATORS:
+            members = [index for index, condition in enumerate(conditions) if condition[1] == op]
+            if members:
+                self._by_operator.append((
+                    OPERATORS[op],
+                    np.array(members),
+                    np.array([feature_rows[conditions[index][0]] for index in members]),
+                    np.array([[conditions[index][2]] for index in members])
+                ))
+
+        self._incidence = np.zeros((len(incidence), len(conditions)), dtype=np.int32)
+        for rule_index, indexes in enumerate(incidence):
+            self._incidence[rule_index, indexes] = 1
+        self._condition_count = len(conditions)
+
+    def _validate(self, rule: Dict[str, Any]) -> None:
+        rule_id = rule.get("id", "<unnamed>")
+        if rule.get("phase") not in self.phases:
+            raise ValueError(f"Rule {rule_id}: unknown phase {rule.get('phase')!r}")
+        if rule.get("output") not in OUTPUTS:
+            raise ValueError(f"Rule {rule_id}: unknown output {rule.get('output')!r}")
+        if rule.get("when", "always") not in WHEN_CONDITIONS:
+            raise ValueError(f"Rule {rule_id}: unknown 'when' {rule.get('when')!r}")
+        for feature, op, _ in rule["conditions"]:
+            if feature not in FEATURE_NAMES:
+                raise ValueError(f"Rule {rule_id}: unknown feature {feature!r}")
+            if op not in OPERATORS:
+                raise ValueError(f"Rule {rule_id}: unknown operator {op!r}")
+
+    def _subset(self, key: Any, rules: List[Dict[str, Any]], phases: List[str]) -> "RuleSet":
+        if key not in self._subsets:
+            self._subsets[key] = RuleSet({**self.definition, "phases": phases, "rules": rules}, self.version)
+        return self._subsets[key]
+
+    def for_phases(self, phases: Optional[Sequence[str]]) -> "RuleSet":
+        """The rule set restricted to some phases, compiled once per distinct selection."""
+        if not phases:
+            return self
+        selected = frozenset(phases)
+        unknown = selected - set(self.phases)
+        if unknown:
+            raise ValueError(f"Unknown phases: {', '.join(sorted(unknown))}")
+        if selected == set(self.phases):
+            return self
+        return self._subset(
+            selected,
+            [rule for rule in self.definition["rules"] if rule["phase"] in selected],
+            [phase for phase in self.phases if phase in selected]
+        )
+
+    def for_current_conditions(self) -> "RuleSet":
+        """Rules answerable from current_weather alone (today's rules on current_* features).
+
+        Phases without such rules are left out rather than reported as normal.
+        """
+        rules = [
+            rule for rule in self.definition["rules"]
+            if rule.get("when") == "today"
+            and all(feature_block(feature) == "current_weather" for feature, _, _ in rule["conditions"])
+        ]
+        return self._subset("current", rules, [phase for phase in self.phases if any(rule["phase"] == phase for rule in rules)])
+
+    def evaluate(self, table: Dict[str, np.ndarray], days: int) -> Tuple[DailyResults, DailyResults]:
+        # A subset without rules (or conditions) has no features to stack.
+        values = np.stack([table[feature] for feature in self.features]) if self.features else np.empty((0, days))
+
+        satisfied = np.empty((self._condition_count, days), dtype=bool)
+        for compare, members, rows, thresholds in self._by_operator:
+            satisfied[members] = compare(values[rows], thresholds)
+
+        # A rule fires on the days where none of its conditions failed.
+        fired = (self._incidence @ (~satisfied).astype(np.int32)) == 0
+
+        outputs = tuple([{phase: [] for phase in self.phases} for _ in range(days)] for _ in OUTPUTS)
+        # nonzero() walks rules in definition order, so each list keeps the rule order.
+        for rule_index, day_index in zip(*(axis.tolist() for axis in fired.nonzero())):
+            output, phase, item = self._emits[rule_index]
+            outputs[output][day_index][phase].append(dict(item))
+
+        for output, results in zip(OUTPUTS, outputs):
+            for day_results in results:
+                for phase_results in day_results.values():
+                    if not phase_results:
+                        phase_results.append(dict(self.defaults[output]))
+
+        return outputs
+
+def load_rule_set(path: str) -> RuleSet:
+    with open(path, "rb") as rules_file:
+        raw = rules_file.read()
+    definition = json.loads(raw)
+    # Content hash in the version so edited rules never reuse results cached for older ones.
+    version = f"{definition['version']}-{hashlib.sha256(raw).hexdigest()[:8]}"
+    return RuleSet(definition, version)
+
+@lru_cache(maxsize=1)
+def get_rule_set() -> RuleSet:
+    return load_rule_set(settings.AGRONOMIC_RULES_PATH)
@@ -0,0 +1,305 @@
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import date, timedelta
+from typing import Any, Dict, List, NamedTuple, Optional
+import numpy as np
+from schemas import GridCell
+
+logger = logging.getLogger(__name__)
+
+# Daily variables requested from the Open-Meteo archive and the column each one fills.
+DAILY_SOURCES = {
+    "temperature_2m_max": "t_max",
+    "temperature_2m_min": "t_min",
+    "temperature_2m_mean": "t_mean",
+    "precipitation_sum": "precipitation",
+    "et0_fao_evapotranspiration": "et0",
+    "shortwave_radiation_sum": "radiation"
+}
+ARCHIVE_DAILY_PARAMS = ",".join(DAILY_SOURCES)
+COLUMNS = tuple(DAILY_SOURCES.values())
+# Columns with a running total per location, so any range sum is two row lookups.
+SUMMED = ("degree_days", "precipitation", "et0", "radiation")
+
+# Hourly shortwave radiation is in W/m²; daily sums are in MJ/m².
+W_HOURS_TO_MJ = 0.0036
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS archive_locations (
+    cell TEXT PRIMARY KEY,
+    label TEXT NOT NULL,
+    latitude REAL NOT NULL,
+    longitude REAL NOT NULL,
+    updated_at REAL NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS archive_daily (
+    cell TEXT NOT NULL,
+    day INTEGER NOT NULL,
+    t_max REAL,
+    t_min REAL,
+    t_mean REAL,
+    precipitation REAL,
+    et0 REAL,
+    radiation REAL,
+    degree_days REAL,
+    ordinal INTEGER NOT NULL DEFAULT 0,
+    cum_degree_days REAL NOT NULL DEFAULT 0,
+    cum_precipitation REAL NOT NULL DEFAULT 0,
+    cum_et0 REAL NOT NULL DEFAULT 0,
+    cum_radiation REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (cell, day)
+) WITHOUT ROWID;
+"""
+
+class DailyRows(NamedTuple):
+    """Daily values for consecutive or sparse days; days are numbered from 1970-01-01."""
+    days: np.ndarray
+    columns: Dict[str, np.ndarray]
+
+def day_number(value: date) -> int:
+    return int(np.datetime64(value, "D").astype(np.int64))
+
+def day_date(number: int) -> date:
+    return date(1970, 1, 1) + timedelta(days=int(number))
+
+def _floats(values: Optional[List[Optional[float]]], size: int) -> np.ndarray:
+    if not values:
+        return np.full(size, np.nan)
+    return np.array([np.nan if value is None else value for value in values], dtype=float)
+
+def rollup_hourly(hourly: Dict[str, Any]) -> DailyRows:
+    """Daily min/max/mean temperature and precipitation/ET0/radiation sums from an hourly block."""
+    day = np.array(hourly["time"], dtype="datetime64[m]").astype("datetime64[D]").astype(np.int64)
+    size = len(day)
+    if not size:
+        return DailyRows(np.empty(0, dtype=np.int64), {name: np.empty(0) for name in COLUMNS})
+    starts = np.flatnonzero(np.r_[True, day[1:] != day[:-1]])
+
+    def reduce(values: np.ndarray, how: str) -> np.ndarray:
+        present = ~np.isnan(values)
+        counts = np.add.reduceat(present.astype(int), starts)
+        if how == "max":
+            result = np.fmax.reduceat(values, starts)
+        elif how == "min":
+            result = np.fmin.reduceat(values, starts)
+        else:
+            result = np.add.reduceat(np.where(present, values, 0.0), starts)
+            if how == "mean":
+                result = result / np.maximum(counts, 1)
+        return np.where(counts > 0, result, np.nan)
+
+    temperature = _floats(hourly.get("temperature_2m"), size)
+    return DailyRows(day[starts], {
+        "t_max": reduce(temperature, "max"),
+        "t_min": reduce(temperature, "min"),
+        "t_mean": reduce(temperature, "mean"),
+        "precipitation": reduce(_floats(hourly.get("precipitation"), size), "sum"),
+        "et0": reduce(_floats(hourly.get("et0_fao_evapotranspiration"), size), "sum"),
+        "radiation": reduce(_floats(hourly.get("shortwave_radiation"), size), "sum") * W_HOURS_TO_MJ
+    })
+
+def parse_archive_payload(payload: Dict[str, Any]) -> DailyRows:
+    """Daily rows from an Open-Meteo archive response.
+
+    The daily block is used when present; hourly data is rolled up into days
+    otherwise, and also fills daily variables the payload does not carry.
+    """
+    daily = payload.get("daily") or {}
+    hourly = payload.get("hourly") or {}
+    rolled = rollup_hourly(hourly) if hourly.get("time") else None
+    if not daily.get("time"):
+        if rolled is None:
+            raise ValueError("Archive payload has no daily or hourly data")
+        return rolled
+
+    days = np.array(daily["time"], dtype="datetime64[D]").astype(np.int64)
+    columns = {column: _floats(daily.get(source), len(days)) for source, column in DAILY_SOURCES.items()}
+    if rolled is not None:
+        # Days in the rolled-up hourly block, aligned with the daily block's days.
+        positions = np.searchsorted(rolled.days, days)
+        found = (positions < len(rolled.days)) & (rolled.days[np.minimum(positions, len(rolled.days) - 1)] == days)
+        for column, values in columns.items():
+            if np.isnan(values).all():
+                values[found] = rolled.columns[column][positions[found]]
+    return DailyRows(days, columns)
+
+def degree_days(t_max: np.ndarray, t_min: np.ndarray, t_mean: np.ndarray, base: float) -> np.ndarray:
+    """Growing degree-days per day above base, from (max + min) / 2 or the daily mean."""
+    mean = np.where(np.isnan(t_max) | np.isnan(t_min), t_mean, (t_max + t_min) / 2)
+    return np.maximum(mean - base, 0.0)
+
+class ArchiveStore:
+    """Historical daily weather per grid cell, stored in SQLite.
+
+    Each row holds a day's values plus running totals of the summed variables
+    for its location, so a season's accumulation is the difference of two rows
+    found through the primary key. Degree-days are precomputed above
+    base_temperature; other bases are summed from the day rows.
+    """
+
+    def __init__(self, path: str, base_temperature: float):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.base_temperature = base_temperature
+        self._conn = sqlite3.connect(path, timeout=5.0, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def _ingest(self, cell: GridCell, label: str, rows: DailyRows) -> int:
+        if not len(rows.days):
+            return 0
+        columns = rows.columns
+        gdd = degree_days(columns["t_max"], columns["t_min"], columns["t_mean"], self.base_temperature)
+        values = np.column_stack([rows.days, *(columns[name] for name in COLUMNS), gdd]).astype(object)
+        values[np.isnan(values.astype(float))] = None
+
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    f"INSERT OR REPLACE INTO archive_daily (cell, day, {', '.join(COLUMNS)}, degree_days) "
+                    f"VALUES (?, ?, {', '.join('?' for _ in COLUMNS)}, ?)",
+                    [(cell.key, int(row[0]), *row[1:]) for row in values]
+                )
+                self._update_running_totals(cell.key, int(rows.days.min()))
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO archive_locations (cell, label, latitude, longitude, updated_at) VALUES (?, ?, ?, ?, ?)",
+                    (cell.key, label, cell.latitude, cell.longitude, time.time())
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        logger.info(f"Ingested {len(rows.days)} archive days for {label} ({cell.key})")
+        return len(rows.days)
+
+    def _update_running_totals(self, cell: str, from_day: int) -> None:
+        totals = ", ".join(f"cum_{name}" for name in SUMMED)
+        previous = self._conn.execute(
+            f"SELECT ordinal, {totals} FROM archive_daily WHERE cell = ? AND day < ? ORDER BY day DESC LIMIT 1",
+            (cell, from_day)
+        ).fetchone() or (0, *(0.0 for _ in SUMMED))
+        rows = self._conn.execute(
+            f"SELECT day, {', '.join(SUMMED)} FROM archive_daily WHERE cell = ? AND day >= ? ORDER BY day",
+            (cell, from_day)
+        ).fetchall()
+        data = np.array([row[1:] for row in rows], dtype=float)
+        running = np.nancumsum(data, axis=0) + np.array(previous[1:], dtype=float)
+        ordinals = previous[0] + np.arange(1, len(rows) + 1)
+        self._conn.executemany(
+            f"UPDATE archive_daily SET ordinal = ?, {', '.join(f'cum_{name} = ?' for name in SUMMED)} WHERE cell = ? AND day = ?",
+            [(int(ordinal), *map(float, total), cell, row[0]) for ordinal, total, row in zip(ordinals, running, rows)]
+        )
+
+    def _accumulate(self, cell: str, start: int, end: int, base_temperature: Optional[float]) -> Optional[Dict[str, Any]]:
+        columns = f"day, ordinal, {', '.join(SUMMED)}, {', '.join(f'cum_{name}' for name in SUMMED)}"
+        with self._lock:
+            first = self._conn.execute(
+                f"SELECT {columns} FROM archive_daily WHERE cell = ? AND day BETWEEN ? AND ? ORDER BY day LIMIT 1",
+                (cell, start, end)
+            ).fetchone()
+            last = self._conn.execute(
+                f"SELECT {columns} FROM archive_daily WHERE cell = ? AND day BETWEEN ? AND ? ORDER BY day DESC LIMIT 1",
+                (cell, start, end)
+            ).fetchone()
+        if first is None:
+            return None
+
+        count = len(SUMMED)
+        first_values = [value or 0.0 for value in first[2:2 + count]]
+        sums = {
+            name: last[2 + count + index] - first[2 + count + index] + first_values[index]
+            for index, name in enumerate(SUMMED)
+        }
+        if base_temperature is not None and base_temperature != self.base_temperature:
+            sums["degree_days"] = float(np.nansum(self._degree_days(cell, start, end, base_temperature)))
+
+        days_with_data = last[1] - first[1] + 1
+        return {
+            "first_day": day_date(first[0]),
+            "last_day": day_date(last[0]),
+            "days": end - start + 1,
+            "missing_days": end - start + 1 - days_with_data,
+            **sums
+        }
+
+    def _degree_days(self, cell: str, start: int, end: int, base_temperature: float) -> np.ndarray:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT t_max, t_min, t_mean FROM archive_daily WHERE cell = ? AND day BETWEEN ? AND ?",
+                (cell, start, end)
+            ).fetchall()
+        data = np.array(rows, dtype=float).reshape(-1, 3)
+        return degree_days(data[:, 0], data[:, 1], data[:, 2], base_temperature)
+
+    def _daily(self, cell: str, start: int, end: int, base_temperature: Optional[float]) -> DailyRows:
+        """Daily sums for every calendar day in [start, end]; days without data are NaN."""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT day, {', '.join(SUMMED)}, t_max, t_min, t_mean FROM archive_daily "
+                "WHERE cell = ? AND day BETWEEN ? AND ? ORDER BY day",
+                (cell, start, end)
+            ).fetchall()
+        dense = np.full((end - start + 1, len(SUMMED) + 3), np.nan)
+        if rows:
+            data = np.array(rows, dtype=float)
+            dense[data[:, 0].astype(np.int64) - start] = data[:, 1:]
+        columns = {name: dense[:, index] for index, name in enumerate(SUMMED)}
+        if base_temperature is not None and base_temperature != self.base_temperature:
+            t_max, t_min, t_mean = dense[:, -3], dense[:, -2], dense[:, -1]
+            columns["degree_days"] = degree_days(t_max, t_min, t_mean, base_temperature)
+        return DailyRows(np.arange(start, end + 1), columns)
+
+    def _locations(self, cell: Optional[str] = None) -> List[Dict[str, Any]]:
+        where, params = ("WHERE l.cell = ? ", (cell,)) if cell else ("", ())
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT l.cell, l.label, l.latitude, l.longitude, MIN(d.day), MAX(d.day), COUNT(d.day) "
+                f"FROM archive_locations l JOIN archive_daily d ON d.cell = l.cell {where}"
+                "GROUP BY l.cell ORDER BY l.label",
+                params
+            ).fetchall()
+        return [
+            {
+                "cell": cell, "label": label, "latitude": latitude, "longitude": longitude,
+                "first_day": day_date(first), "last_day": day_date(last), "days": days
+            }
+            for cell, label, latitude, longitude, first, last, days in rows
+        ]
+
+    async def ingest(self, cell: GridCell, label: str, rows: DailyRows) -> int:
+        return await asyncio.to_thread(self._ingest, cell, label, rows)
+
+    async def accumulate(self, cell: str, start: date, end: date, base_temperature: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(self._accumulate, cell, day_number(start), day_number(end), base_temperature)
+
+    async def daily(self, cell: str, start: date, end: date, base_temperature: Optional[float] = None) -> DailyRows:
+        return await asyncio.to_thread(self._daily, cell, day_number(start), day_number(end), base_temperature)
+
+    async def locations(self) -> List[Dict[str, Any]]:
+        return await asyncio.to_thread(self._locations)
+
+    async def location(self, cell: str) -> Optional[Dict[str, Any]]:
+        found = await asyncio.to_thread(self._locations, cell)
+        return found[0] if found else None
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+def rolling_sums(values: np.ndarray, window: int) -> np.ndarray:
+    """Sums over each trailing window of days, days without data counting as zero.
+
+    The result starts at the first full window, so it is window - 1 shorter than values.
+    """
+    running = np.r_[0.0, np.nancumsum(values)]
+    return running[window:] - running[:-window]
@@ -0,0 +1,137 @@
+import asyncio
+import httpx
+import logging
+from typing import AsyncIterator, List, Optional, Set, Union
+from fastapi import HTTPException
+from config import settings
+from schemas import BatchLocation, BatchWeatherResult, Coordinates
+from services.open_meteo import OpenMeteoService
+from services.agronomic import AgronomicLogic
+from services.forecast import Forecast
+from services.weather_report import build_weather_response
+
+logger = logging.getLogger(__name__)
+
+async def resolve_location(location: BatchLocation, service: OpenMeteoService) -> Coordinates:
+    if location.city:
+        return await service.get_coordinates(location.city)
+    return Coordinates(
+        name=location.name or f"{location.latitude:.4f},{location.longitude:.4f}",
+        latitude=location.latitude,
+        longitude=location.longitude
+    )
+
+def error_result(index: int, location: BatchLocation, error: BaseException) -> BatchWeatherResult:
+    if isinstance(error, HTTPException):
+        return BatchWeatherResult(index=index, location=location, status=error.status_code, error=str(error.detail))
+    if isinstance(error, httpx.HTTPStatusError):
+        return BatchWeatherResult(index=index, location=location, status=502, error="Upstream weather service error")
+
+    logger.error(f"Batch location {index} failed: {str(error)}", exc_info=error)
+    return BatchWeatherResult(index=index, location=location, status=500, error="Internal Server Error")
+
+async def build_result(
+    index: int,
+    location: BatchLocation,
+    coordinates: Optional[Coordinates],
+    outcome: Union[Forecast, BaseException],
+    service: OpenMeteoService,
+    agronomic_service: AgronomicLogic
+) -> BatchWeatherResult:
+    if isinstance(outcome, BaseException):
+        return error_result(index, location, outcome)
+    try:
+        data = await build_weather_response(coordinates, outcome, service, agronomic_service)
+    except Exception as e:
+        return error_result(index, location, e)
+    return BatchWeatherResult(index=index, location=location, status=200, data=data)
+
+async def run_batch(
+    locations: List[BatchLocation],
+    service: OpenMeteoService,
+    agronomic_service: AgronomicLogic
+) -> List[BatchWeatherResult]:
+    semaphore = asyncio.Semaphore(settings.BATCH_CONCURRENCY)
+
+    async def resolve(location: BatchLocation) -> Coordinates:
+        async with semaphore:
+            return await resolve_location(location, service)
+
+    resolved: List[Union[Coordinates, BaseException]] = await asyncio.gather(
+        *(resolve(location) for location in locations), return_exceptions=True
+    )
+
+    located = [index for index, outcome in enumerate(resolved) if isinstance(outcome, Coordinates)]
+    forecasts = await service.get_weather_many(
+        [(resolved[index].latitude, resolved[index].longitude) for index in located]
+    )
+    forecast_by_index = dict(zip(located, forecasts))
+
+    results = []
+    for index, location in enumerate(locations):
+        coordinates = resolved[index] if index in forecast_by_index else None
+        outcome = forecast_by_index.get(index, resolved[index])
+        results.append(await build_result(index, location, coordinates, outcome, service, agronomic_service))
+    return results
+
+async def stream_batch(
+    locations: List[BatchLocation],
+    service: OpenMeteoService,
+    agronomic_service: AgronomicLogic
+) -> AsyncIterator[BatchWeatherResult]:
+    """Yields results in completion order, each as soon as its forecast is known.
+
+    Geocoding runs at most BATCH_CONCURRENCY lookups at once. The points located
+    together are handed to forecast_futures, which fetches them in upstream
+    chunks, and each result is built when the client reads it, so only forecasts
+    (which the cache holds anyway) wait on a slow client.
+    """
+    semaphore = asyncio.Semaphore(settings.BATCH_CONCURRENCY)
+    ready: asyncio.Queue = asyncio.Queue()
+
+    async def resolve(index: int, location: BatchLocation):
+        try:
+            async with semaphore:
+                return index, await resolve_location(location, service)
+        except Exception as e:
+            return index, e
+
+    def deliver(index: int, coordinates: Coordinates):
+        return lambda future: future.cancelled() or ready.put_nowait((index, coordinates, future.result()))
+
+    async def locate(pending: Set[asyncio.Future]):
+        handed: Set[int] = set()
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                located = []
+                for task in done:
+                    index, outcome = task.result()
+                    if isinstance(outcome, Coordinates):
+                        located.append((index, outcome))
+                    else:
+                        ready.put_nowait((index, None, outcome))
+                        handed.add(index)
+                if located:
+                    futures = service.forecast_futures([(c.latitude, c.longitude) for _, c in located])
+                    for (index, coordinates), future in zip(located, futures):
+                        future.add_done_callback(deliver(index, coordinates))
+                        forecasts.append(future)
+                        handed.add(index)
+        except Exception as e:
+            # Every location not handed on yet fails with it, or the stream would wait for them forever.
+            for index in range(len(locations)):
+                if index not in handed:
+                    ready.put_nowait((index, None, e))
+
+    forecasts: List[asyncio.Future] = []
+    resolving = [asyncio.ensure_future(resolve(index, location)) for index, location in enumerate(locations)]
+    locator = asyncio.ensure_future(locate(set(resolving)))
+
+    try:
+        for _ in range(len(locations)):
+            index, coordinates, outcome = await ready.get()
+            yield await build_result(index, locations[index], coordinates, outcome, service, agronomic_service)
+    finally:
+        for task in [locator, *resolving, *forecasts]:
+            task.cancel()
@@ -0,0 +1,10 @@
+from config import settings
+from .base import CacheBackend, CacheEntry
+from .memory import MemoryCacheBackend
+from .sqlite import SQLiteCacheBackend
+from .namespace import CacheNamespace, ResponseCache, ValueCodec
+
+def create_cache_backend() -> CacheBackend:
+    if settings.CACHE_BACKEND == "sqlite":
+        return SQLiteCacheBackend(settings.CACHE_SQLITE_PATH)
+    return MemoryCacheBackend()
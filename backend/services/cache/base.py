@@ -0,0 +1,55 @@
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, NamedTuple, Optional
+
+class CacheEntry(NamedTuple):
+    value: Any
+    # Wall-clock time, so that ages agree between processes sharing a backend.
+    stored_at: float
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.stored_at
+
+class CacheBackend(ABC):
+    """Storage for cached payloads, partitioned by namespace.
+
+    Values must be JSON-serializable so that backends shared between worker
+    processes can store them. Backends with stores_objects keep values as
+    they are, so namespaces can skip their codec (see CacheNamespace).
+    """
+
+    stores_objects = False
+
+    @abstractmethod
+    def configure(self, namespace: str, maxsize: int, ttl: float) -> None:
+        ...
+
+    @abstractmethod
+    async def get_entry(self, namespace: str, key: str) -> Optional[CacheEntry]:
+        ...
+
+    async def get(self, namespace: str, key: str) -> Optional[Any]:
+        entry = await self.get_entry(namespace, key)
+        return entry.value if entry is not None else None
+
+    @abstractmethod
+    async def set(self, namespace: str, key: str, value: Any) -> None:
+        ...
+
+    @abstractmethod
+    async def clear(self, namespace: str) -> None:
+        ...
+
+    @abstractmethod
+    def stats(self, namespace: str) -> Dict[str, Any]:
+        ...
+
+    async def acquire_lease(self, name: str, ttl: float) -> bool:
+        """Claims name for ttl seconds, unless an unexpired claim exists. Lets processes
+        sharing a backend agree on who does a piece of work; a per-process backend
+        has nobody to agree with."""
+        return True
+
+    async def close(self) -> None:
+        pass
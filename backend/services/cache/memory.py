@@ -0,0 +1,51 @@
+import time
+from typing import Any, Dict, Optional
+from cachetools import TTLCache
+from .base import CacheBackend, CacheEntry
+
+class _CountingTTLCache(TTLCache):
+    def __init__(self, maxsize: int, ttl: float):
+        super().__init__(maxsize=maxsize, ttl=ttl)
+        self.evictions = 0
+        self.expirations = 0
+
+    def popitem(self):
+        item = super().popitem()
+        self.evictions += 1
+        return item
+
+    def expire(self, time=None):
+        expired = super().expire(time)
+        self.expirations += len(expired)
+        return expired
+
+class MemoryCacheBackend(CacheBackend):
+    """Per-process TTL cache. Reads and writes never await, so they are atomic
+    on the event loop and need no lock."""
+
+    stores_objects = True
+
+    def __init__(self):
+        self._caches: Dict[str, _CountingTTLCache] = {}
+
+    def configure(self, namespace: str, maxsize: int, ttl: float) -> None:
+        self._caches[namespace] = _CountingTTLCache(maxsize, ttl)
+
+    async def get_entry(self, namespace: str, key: str) -> Optional[CacheEntry]:
+        return self._caches[namespace].get(key)
+
+    async def set(self, namespace: str, key: str, value: Any) -> None:
+        self._caches[namespace][key] = CacheEntry(value, time.time())
+
+    async def clear(self, namespace: str) -> None:
+        self._caches[namespace].clear()
+
+    def stats(self, namespace: str) -> Dict[str, Any]:
+        cache = self._caches[namespace]
+        return {
+            "backend": "memory",
+            "size": len(cache),
+            "maxsize": cache.maxsize,
+            "evictions": cache.evictions,
+            "expirations": cache.expirations
+        }
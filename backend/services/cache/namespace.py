@@ -0,0 +1,182 @@
+import asyncio
+import contextvars
+import logging
+from typing import Any, Awaitable, Callable, Dict, NamedTuple, Optional, Tuple
+from .base import CacheBackend, CacheEntry
+from .memory import MemoryCacheBackend
+
+logger = logging.getLogger(__name__)
+
+class ValueCodec(NamedTuple):
+    """Converts a namespace's values to and from JSON-serializable data."""
+    encode: Callable[[Any], Any]
+    decode: Callable[[Any], Any]
+
+class CacheNamespace:
+    """A named partition of a cache backend.
+
+    Entries are fresh for ttl. With stale_while_revalidate or stale_if_error
+    they are kept that much longer, so get_or_revalidate can still serve them
+    while a refresh runs in the background or after the refresh has failed.
+    """
+
+    def __init__(
+        self,
+        backend: CacheBackend,
+        name: str,
+        maxsize: int,
+        ttl: float,
+        codec: Optional[ValueCodec] = None,
+        stale_while_revalidate: float = 0,
+        stale_if_error: float = 0
+    ):
+        self.backend = backend
+        self.name = name
+        self.ttl = ttl
+        self.stale_while_revalidate = stale_while_revalidate
+        self.stale_if_error = stale_if_error
+        self.counters = {"hits": 0, "misses": 0, "stale_hits": 0, "stale_on_error": 0, "revalidation_errors": 0}
+        # Backends that keep objects as they are never need the codec.
+        self.codec = None if backend.stores_objects else codec
+        self._revalidating: Dict[str, asyncio.Task] = {}
+        backend.configure(name, maxsize, ttl + max(stale_while_revalidate, stale_if_error))
+
+    async def get_entry(self, key: str) -> Optional[CacheEntry]:
+        """The stored entry, fresh or stale, without counting a lookup."""
+        entry = await self.backend.get_entry(self.name, key)
+        if entry is None or not self.codec:
+            return entry
+        return entry._replace(value=self.codec.decode(entry.value))
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        return entry.age < self.ttl
+
+    def servable_on_error(self, entry: CacheEntry) -> bool:
+        return entry.age < self.ttl + self.stale_if_error
+
+    async def get(self, key: str) -> Optional[Any]:
+        """The value if it is fresh."""
+        entry = await self.get_entry(key)
+        if entry is None or not self.is_fresh(entry):
+            self.counters["misses"] += 1
+            return None
+        self.counters["hits"] += 1
+        return entry.value
+
+    async def set(self, key: str, value: Any) -> None:
+        await self.backend.set(self.name, key, self.codec.encode(value) if self.codec else value)
+
+    async def get_or_fetch(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        value = await self.get(key)
+        if value is None:
+            value = await fetch()
+            await self.set(key, value)
+        return value
+
+    async def get_or_revalidate(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """The value for key and whether it is stale.
+
+        A fresh entry is returned as is. An entry within stale_while_revalidate
+        past its ttl is returned at once while fetch refreshes it in the background.
+        Otherwise fetch runs in the request, and if it fails an entry within
+        stale_if_error is returned instead of the error.
+        """
+        entry, servable = await self.lookup(key, fetch)
+        if servable:
+            return entry.value, not self.is_fresh(entry)
+        return await self.fetch_or_stale(key, entry, fetch)
+
+    async def lookup(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> Tuple[Optional[CacheEntry], bool]:
+        """The first half of get_or_revalidate: the stored entry and whether it can be
+        served now, starting its background refresh when it is stale."""
+        entry = await self.get_entry(key)
+        if entry is not None:
+            if self.is_fresh(entry):
+                self.counters["hits"] += 1
+                return entry, True
+            if entry.age < self.ttl + self.stale_while_revalidate:
+                self.counters["stale_hits"] += 1
+                self._revalidate(key, fetch)
+                return entry, True
+        self.counters["misses"] += 1
+        return entry, False
+
+    async def fetch_or_stale(self, key: str, entry: Optional[CacheEntry], fetch: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """The second half of get_or_revalidate, after lookup found nothing servable."""
+        try:
+            value = await fetch()
+        except Exception as e:
+            if entry is None or not self.servable_on_error(entry):
+                raise
+            self.counters["stale_on_error"] += 1
+            logger.warning(f"Serving stale {self.name} entry {key} ({entry.age:.0f}s old): {str(e)}")
+            return entry.value, True
+        await self.set(key, value)
+        return value, False
+
+    def _revalidate(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> None:
+        if key in self._revalidating:
+            return
+
+        async def revalidate():
+            try:
+                await self.set(key, await fetch())
+            except Exception as e:
+                self.counters["revalidation_errors"] += 1
+                logger.warning(f"Background refresh of {self.name} entry {key} failed: {str(e)}")
+            finally:
+                self._revalidating.pop(key, None)
+
+        # Started from an empty context: the refresh outlives the request and must not
+        # inherit its state (such as its deadline).
+        self._revalidating[key] = contextvars.Context().run(asyncio.create_task, revalidate())
+
+    async def cancel_revalidations(self) -> None:
+        """Cancels background refreshes and waits for them, before what they use is closed."""
+        tasks = list(self._revalidating.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def clear(self) -> None:
+        await self.backend.clear(self.name)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.counters["hits"] + self.counters["stale_hits"] + self.counters["misses"]
+        return {
+            **self.counters,
+            **self.backend.stats(self.name),
+            "ttl": self.ttl,
+            "revalidating": len(self._revalidating),
+            "hit_ratio": self.counters["hits"] / lookups if lookups else 0.0
+        }
+
+class ResponseCache:
+    def __init__(self, backend: Optional[CacheBackend] = None):
+        self.backend = backend or MemoryCacheBackend()
+        self.namespaces: Dict[str, CacheNamespace] = {}
+
+    def namespace(
+        self,
+        name: str,
+        maxsize: int,
+        ttl: float,
+        codec: Optional[ValueCodec] = None,
+        stale_while_revalidate: float = 0,
+        stale_if_error: float = 0
+    ) -> CacheNamespace:
+        if name not in self.namespaces:
+            self.namespaces[name] = CacheNamespace(
+                self.backend, name, maxsize, ttl, codec, stale_while_revalidate, stale_if_error
+            )
+        return self.namespaces[name]
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: namespace.stats() for name, namespace in self.namespaces.items()}
+
+    async def acquire_lease(self, name: str, ttl: float) -> bool:
+        return await self.backend.acquire_lease(name, ttl)
+
+    async def close(self) -> None:
+        await asyncio.gather(*(namespace.cancel_revalidations() for namespace in self.namespaces.values()))
+        await self.backend.close()
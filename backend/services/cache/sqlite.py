@@ -0,0 +1,159 @@
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Dict, Optional, Tuple
+from .base import CacheBackend, CacheEntry
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache_entries (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value BLOB NOT NULL,
+    stored_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS cache_entries_expiry ON cache_entries (namespace, expires_at);
+CREATE TABLE IF NOT EXISTS cache_leases (
+    name TEXT PRIMARY KEY,
+    expires_at REAL NOT NULL
+) WITHOUT ROWID;
+"""
+
+_COMPRESSION_LEVEL = 6
+
+def encode_value(value: Any) -> bytes:
+    return zlib.compress(json.dumps(value, separators=(",", ":")).encode("utf-8"), _COMPRESSION_LEVEL)
+
+def decode_value(blob: bytes) -> Any:
+    return json.loads(zlib.decompress(blob))
+
+class SQLiteCacheBackend(CacheBackend):
+    """Cache stored in a local SQLite file, shared by every worker process on the host.
+
+    Entries are zlib-compressed JSON. The database runs in WAL mode so readers in
+    other processes are not blocked by a writer; queries run in a worker thread
+    to keep the event loop free. At most every purge_interval seconds, a write also
+    purges expired and over-size entries of every namespace and counts what is left,
+    which is what stats() reports, so reading stats never queries the database.
+    """
+
+    def __init__(self, path: str, purge_interval: float = 60.0):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.purge_interval = purge_interval
+        self._conn = sqlite3.connect(path, timeout=5.0, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+        self._config: Dict[str, Dict[str, float]] = {}
+        self._evictions: Dict[str, int] = {}
+        self._expirations: Dict[str, int] = {}
+        self._sizes: Dict[str, Tuple[int, int]] = {}
+        self._purged_at = time.monotonic()
+        logger.info(f"Using SQLite cache backend at {path}")
+
+    def configure(self, namespace: str, maxsize: int, ttl: float) -> None:
+        self._config[namespace] = {"maxsize": maxsize, "ttl": ttl}
+        self._evictions.setdefault(namespace, 0)
+        self._expirations.setdefault(namespace, 0)
+        # Counted once here, at startup; later by each purge.
+        self._sizes[namespace] = self._count(namespace)
+
+    def _execute(self, sql: str, params: tuple = ()) -> int:
+        with self._lock:
+            return self._conn.execute(sql, params).rowcount
+
+    def _fetchone(self, sql: str, params: tuple = ()) -> Optional[tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchone()
+
+    def _get_entry(self, namespace: str, key: str) -> Optional[CacheEntry]:
+        row = self._fetchone(
+            "SELECT value, stored_at FROM cache_entries WHERE namespace = ? AND key = ? AND expires_at > ?",
+            (namespace, key, time.time())
+        )
+        return CacheEntry(decode_value(row[0]), row[1]) if row else None
+
+    def _set(self, namespace: str, key: str, value: Any) -> None:
+        blob = encode_value(value)
+        now = time.time()
+        self._execute(
+            "INSERT OR REPLACE INTO cache_entries (namespace, key, value, stored_at, expires_at) VALUES (?, ?, ?, ?, ?)",
+            (namespace, key, blob, now, now + self._config[namespace]["ttl"])
+        )
+        if time.monotonic() - self._purged_at >= self.purge_interval:
+            self._purge()
+
+    def _count(self, namespace: str) -> Tuple[int, int]:
+        return self._fetchone(
+            "SELECT COUNT(*), COALESCE(SUM(LENGTH(value)), 0) FROM cache_entries WHERE namespace = ? AND expires_at > ?",
+            (namespace, time.time())
+        )
+
+    def _purge(self) -> None:
+        self._purged_at = time.monotonic()
+        for namespace, config in list(self._config.items()):
+            expired = self._execute(
+                "DELETE FROM cache_entries WHERE namespace = ? AND expires_at <= ?",
+                (namespace, time.time())
+            )
+            evicted = self._execute(
+                "DELETE FROM cache_entries WHERE namespace = ? AND key IN ("
+                "SELECT key FROM cache_entries WHERE namespace = ? ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+                (namespace, namespace, int(config["maxsize"]))
+            )
+            self._expirations[namespace] += expired
+            self._evictions[namespace] += evicted
+            self._sizes[namespace] = self._count(namespace)
+
+    def _acquire_lease(self, name: str, ttl: float) -> bool:
+        now = time.time()
+        return self._execute(
+            "INSERT INTO cache_leases (name, expires_at) VALUES (?, ?) "
+            "ON CONFLICT (name) DO UPDATE SET expires_at = excluded.expires_at WHERE cache_leases.expires_at <= ?",
+            (name, now + ttl, now)
+        ) == 1
+
+    async def get_entry(self, namespace: str, key: str) -> Optional[CacheEntry]:
+        return await asyncio.to_thread(self._get_entry, namespace, key)
+
+    async def set(self, namespace: str, key: str, value: Any) -> None:
+        await asyncio.to_thread(self._set, namespace, key, value)
+
+    async def acquire_lease(self, name: str, ttl: float) -> bool:
+        return await asyncio.to_thread(self._acquire_lease, name, ttl)
+
+    async def purge(self) -> None:
+        await asyncio.to_thread(self._purge)
+
+    async def clear(self, namespace: str) -> None:
+        await asyncio.to_thread(self._execute, "DELETE FROM cache_entries WHERE namespace = ?", (namespace,))
+
+    def stats(self, namespace: str) -> Dict[str, Any]:
+        # As of the last purge: the table is shared with other processes, so no
+        # in-process count could be exact anyway.
+        size, stored_bytes = self._sizes[namespace]
+        return {
+            "backend": "sqlite",
+            "size": size,
+            "maxsize": int(self._config[namespace]["maxsize"]),
+            "stored_bytes": stored_bytes,
+            "evictions": self._evictions[namespace],
+            "expirations": self._expirations[namespace]
+        }
+
+    async def close(self) -> None:
+        with self._lock:
+            self._conn.close()
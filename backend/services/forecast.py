@@ -0,0 +1,183 @@
+import copy
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+import numpy as np
+from constants import get_weather_description, OPEN_METEO_HOURLY_PARAMS, OPEN_METEO_DAILY_PARAMS
+
+FORECAST_DAYS = 7
+MISSING_CODE = -1
+CODE_COLUMNS = frozenset({"weathercode"})
+
+HOURLY_COLUMNS = tuple(OPEN_METEO_HOURLY_PARAMS.split(","))
+DAILY_COLUMNS = tuple(OPEN_METEO_DAILY_PARAMS.split(","))
+
+class ForecastSelection(NamedTuple):
+    """What to request from Open-Meteo: the horizon and the hourly/daily variables."""
+    days: int = FORECAST_DAYS
+    hourly: Tuple[str, ...] = HOURLY_COLUMNS
+    daily: Tuple[str, ...] = DAILY_COLUMNS
+
+    @classmethod
+    def of(cls, days: int, variables: Iterable[str]) -> "ForecastSelection":
+        variables = set(variables)
+        return cls(
+            days,
+            tuple(name for name in HOURLY_COLUMNS if name in variables),
+            tuple(name for name in DAILY_COLUMNS if name in variables)
+        )
+
+    def cache_key(self, cell_key: str) -> str:
+        # The full default forecast keeps the bare cell key.
+        if self == FULL_FORECAST:
+            return cell_key
+        return f"{cell_key}|{self.days}|{','.join(self.hourly)}|{','.join(self.daily)}"
+
+FULL_FORECAST = ForecastSelection()
+CURRENT_ONLY = ForecastSelection(days=1, hourly=(), daily=())
+
+def _readonly(array: np.ndarray) -> np.ndarray:
+    array.flags.writeable = False
+    return array
+
+def _code_array(values: List[Optional[int]]) -> np.ndarray:
+    try:
+        return np.array(values, dtype=np.int8)
+    except TypeError:
+        return np.array([MISSING_CODE if value is None else value for value in values], dtype=np.int8)
+
+class SeriesTable:
+    """One Open-Meteo series block (hourly or daily) stored column-wise.
+
+    Measurements are float64 arrays with NaN for missing values and weather codes
+    are int8 arrays with MISSING_CODE, instead of lists of boxed Optional floats.
+    Timestamps are checked once and kept as a single comma-joined string: splitting
+    it is far cheaper than formatting datetime64 values on every response.
+    Instances are shared through the forecast cache, so the arrays are read-only.
+    """
+
+    def __init__(self, time: List[str], columns: Dict[str, np.ndarray]):
+        self._time = ",".join(time)
+        self.size = len(time)
+        self.columns = {name: _readonly(values) for name, values in columns.items()}
+
+    @classmethod
+    def from_block(cls, block: Dict[str, Any], names: Iterable[str]) -> "SeriesTable":
+        time = list(block.get("time") or [])
+        # Rejects anything that is not an ISO 8601 date/time before it is stored as text.
+        np.array(time, dtype="datetime64")
+        columns = {}
+        for name in names:
+            if name not in block:
+                continue
+            values = block[name] or []
+            columns[name] = _code_array(values) if name in CODE_COLUMNS else np.array(values, dtype=float)
+        return cls(time, columns)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def column(self, name: str) -> np.ndarray:
+        values = self.columns.get(name)
+        if values is None:
+            return np.full(len(self), np.nan)
+        if name in CODE_COLUMNS:
+            return np.where(values == MISSING_CODE, np.nan, values)
+        return values
+
+    def select(self, names: Iterable[str]) -> "SeriesTable":
+        """A table with only some columns, sharing their arrays."""
+        return SeriesTable(self.time_strings(), {name: self.columns[name] for name in names if name in self.columns})
+
+    def codes(self) -> np.ndarray:
+        codes = self.columns.get("weathercode")
+        if codes is None:
+            return np.empty(0, dtype=np.int8)
+        return np.unique(codes[codes != MISSING_CODE])
+
+    def time_strings(self) -> List[str]:
+        return self._time.split(",") if self.size else []
+
+    def to_block(self) -> Dict[str, list]:
+        """The block as plain lists with None for missing values, as Open-Meteo sends it."""
+        block: Dict[str, list] = {"time": self.time_strings()}
+        for name, values in self.columns.items():
+            missing = values == MISSING_CODE if name in CODE_COLUMNS else np.isnan(values)
+            block[name] = np.where(missing, None, values).tolist() if missing.any() else values.tolist()
+        return block
+
+    def to_json_content(self) -> Dict[str, Any]:
+        """The block for orjson with OPT_SERIALIZE_NUMPY: float arrays encode NaN as null
+        directly, only code columns with gaps need a list."""
+        content: Dict[str, Any] = {"time": self.time_strings()}
+        for name, values in self.columns.items():
+            if name in CODE_COLUMNS and (values == MISSING_CODE).any():
+                content[name] = np.where(values == MISSING_CODE, None, values).tolist()
+            else:
+                content[name] = values
+        return content
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._time) + sum(values.nbytes for values in self.columns.values())
+
+class Forecast:
+    """An Open-Meteo forecast payload with its series held as SeriesTables.
+
+    descriptions maps each weather code in the forecast to its text, sent once
+    per response instead of once per hour. stale marks a forecast served past
+    its cache TTL (see CacheNamespace.get_or_revalidate).
+    """
+
+    def __init__(
+        self,
+        current_weather: Dict[str, Any],
+        hourly: Optional[SeriesTable],
+        daily: Optional[SeriesTable],
+        content_hash: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ):
+        self.current_weather = current_weather
+        self.hourly = hourly
+        self.daily = daily
+        self.content_hash = content_hash
+        self.metadata = metadata or {}
+        self.stale = False
+        self.descriptions = {code: get_weather_description(code) for code in self.weather_codes()}
+
+    @classmethod
+    def from_payload(cls, payload: Dict[str, Any]) -> "Forecast":
+        return cls(
+            current_weather=payload.get("current_weather") or {},
+            hourly=SeriesTable.from_block(payload["hourly"], HOURLY_COLUMNS) if payload.get("hourly") else None,
+            daily=SeriesTable.from_block(payload["daily"], DAILY_COLUMNS) if payload.get("daily") else None,
+            content_hash=payload.get("content_hash"),
+            metadata={
+                key: value for key, value in payload.items()
+                if key not in ("current_weather", "hourly", "daily", "content_hash") and not isinstance(value, (dict, list))
+            }
+        )
+
+    def to_payload(self) -> Dict[str, Any]:
+        payload = {**self.metadata, "current_weather": self.current_weather}
+        if self.hourly is not None:
+            payload["hourly"] = self.hourly.to_block()
+        if self.daily is not None:
+            payload["daily"] = self.daily.to_block()
+        if self.content_hash:
+            payload["content_hash"] = self.content_hash
+        return payload
+
+    def as_stale(self) -> "Forecast":
+        # Cached instances are shared, so the flag goes on a copy sharing the tables.
+        forecast = copy.copy(self)
+        forecast.stale = True
+        return forecast
+
+    def weather_codes(self) -> List[int]:
+        codes = {int(code) for table in (self.hourly, self.daily) if table is not None for code in table.codes()}
+        if self.current_weather.get("weathercode") is not None:
+            codes.add(int(self.current_weather["weathercode"]))
+        return sorted(codes)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(table.nbytes for table in (self.hourly, self.daily) if table is not None)
@@ -0,0 +1,126 @@
+import csv
+import logging
+import re
+import sqlite3
+import unicodedata
+from functools import lru_cache
+from typing import List, Optional, Tuple
+from config import settings
+from schemas import Coordinates
+
+logger = logging.getLogger(__name__)
+
+BRAZILIAN_STATES = {
+    "AC": "Acre", "AL": "Alagoas", "AP": "Amapá", "AM": "Amazonas", "BA": "Bahia",
+    "CE": "Ceará", "DF": "Distrito Federal", "ES": "Espírito Santo", "GO": "Goiás",
+    "MA": "Maranhão", "MT": "Mato Grosso", "MS": "Mato Grosso do Sul", "MG": "Minas Gerais",
+    "PA": "Pará", "PB": "Paraíba", "PR": "Paraná", "PE": "Pernambuco", "PI": "Piauí",
+    "RJ": "Rio de Janeiro", "RN": "Rio Grande do Norte", "RS": "Rio Grande do Sul",
+    "RO": "Rondônia", "RR": "Roraima", "SC": "Santa Catarina", "SP": "São Paulo",
+    "SE": "Sergipe", "TO": "Tocantins"
+}
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+_STATE_SEPARATOR = re.compile(r"\s*[,/]\s*|\s+-\s+")
+
+def normalize_name(name: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", name)
+    ascii_name = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return _NON_ALNUM.sub(" ", ascii_name.lower()).strip()
+
+_STATE_CODES_BY_NAME = {normalize_name(name): code for code, name in BRAZILIAN_STATES.items()}
+
+def resolve_state(value: str) -> Optional[str]:
+    normalized = normalize_name(value)
+    if normalized.upper() in BRAZILIAN_STATES:
+        return normalized.upper()
+    return _STATE_CODES_BY_NAME.get(normalized)
+
+def parse_query(query: str) -> Tuple[str, Optional[str]]:
+    """Splits "Ribeirão Preto, SP" / "Ribeirão Preto - São Paulo" into (normalized name, state code)."""
+    parts = _STATE_SEPARATOR.split(query.strip())
+    if len(parts) > 1:
+        state = resolve_state(parts[-1])
+        if state:
+            return normalize_name(" ".join(parts[:-1])), state
+    return normalize_name(query), None
+
+class Gazetteer:
+    """In-memory SQLite index of Brazilian places for local geocoding.
+
+    Names are indexed accent- and case-insensitively, so both exact lookups and
+    prefix searches are index range scans.
+    """
+
+    def __init__(self, rows: List[dict]):
+        self._conn = sqlite3.connect(":memory:", check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE places (name TEXT, normalized TEXT, state_code TEXT, "
+            "latitude REAL, longitude REAL, population INTEGER)"
+        )
+        self._conn.executemany(
+            "INSERT INTO places VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (row["name"], normalize_name(row["name"]), row["state_code"],
+                 float(row["latitude"]), float(row["longitude"]), int(row["population"] or 0))
+                for row in rows
+            ]
+        )
+        self._conn.execute("CREATE INDEX places_normalized ON places (normalized, population DESC)")
+        self.size = len(rows)
+
+    @classmethod
+    def from_csv(cls, path: str) -> "Gazetteer":
+        with open(path, newline="", encoding="utf-8") as csv_file:
+            return cls(list(csv.DictReader(csv_file)))
+
+    def _to_coordinates(self, row: tuple) -> Coordinates:
+        name, state_code, latitude, longitude = row
+        return Coordinates(
+            name=name,
+            latitude=latitude,
+            longitude=longitude,
+            country="Brasil",
+            state=BRAZILIAN_STATES.get(state_code)
+        )
+
+    def lookup(self, query: str) -> Optional[Coordinates]:
+        name, state = parse_query(query)
+        if not name:
+            return None
+
+        sql = "SELECT name, state_code, latitude, longitude FROM places WHERE normalized = ?"
+        params: tuple = (name,)
+        if state:
+            sql += " AND state_code = ?"
+            params += (state,)
+
+        row = self._conn.execute(sql + " ORDER BY population DESC LIMIT 1", params).fetchone()
+        return self._to_coordinates(row) if row else None
+
+    def search(self, prefix: str, limit: int = 10) -> List[Coordinates]:
+        name, state = parse_query(prefix)
+        if not name:
+            return []
+
+        # "\x7f" sorts after every character normalize_name can produce.
+        sql = "SELECT name, state_code, latitude, longitude FROM places WHERE normalized >= ? AND normalized < ?"
+        params: tuple = (name, name + "\x7f")
+        if state:
+            sql += " AND state_code = ?"
+            params += (state,)
+
+        rows = self._conn.execute(sql + " ORDER BY population DESC LIMIT ?", params + (limit,)).fetchall()
+        return [self._to_coordinates(row) for row in rows]
+
+@lru_cache(maxsize=1)
+def get_gazetteer() -> Optional[Gazetteer]:
+    if not settings.GAZETTEER_ENABLED:
+        return None
+    try:
+        gazetteer = Gazetteer.from_csv(settings.GAZETTEER_PATH)
+    except OSError as e:
+        logger.warning(f"Gazetteer not available, using remote geocoding only: {str(e)}")
+        return None
+    logger.info(f"Loaded gazetteer with {gazetteer.size} places from {settings.GAZETTEER_PATH}")
+    return gazetteer
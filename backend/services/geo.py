@@ -0,0 +1,69 @@
+from typing import Tuple
+from schemas import GridCell
+
+_GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+def snap_to_degrees(lat: float, lon: float, resolution: float) -> Tuple[float, float]:
+    if resolution <= 0:
+        return lat, lon
+    return (
+        round(round(lat / resolution) * resolution, 6),
+        round(round(lon / resolution) * resolution, 6)
+    )
+
+def geohash_encode(lat: float, lon: float, precision: int) -> str:
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, bit_count, even = [], 0, 0, True
+
+    while len(chars) < precision:
+        interval, value = (lon_range, lon) if even else (lat_range, lat)
+        mid = (interval[0] + interval[1]) / 2
+        bits <<= 1
+        if value >= mid:
+            bits |= 1
+            interval[0] = mid
+        else:
+            interval[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_GEOHASH_ALPHABET[bits])
+            bits, bit_count = 0, 0
+
+    return "".join(chars)
+
+def geohash_center(geohash: str) -> Tuple[float, float]:
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    even = True
+
+    for char in geohash:
+        bits = _GEOHASH_ALPHABET.index(char)
+        for shift in range(4, -1, -1):
+            interval = lon_range if even else lat_range
+            mid = (interval[0] + interval[1]) / 2
+            if (bits >> shift) & 1:
+                interval[0] = mid
+            else:
+                interval[1] = mid
+            even = not even
+
+    return (
+        round((lat_range[0] + lat_range[1]) / 2, 6),
+        round((lon_range[0] + lon_range[1]) / 2, 6)
+    )
+
+def snap_to_grid(lat: float, lon: float, mode: str, resolution: float, geohash_precision: int) -> GridCell:
+    if mode == "geohash":
+        geohash = geohash_encode(lat, lon, geohash_precision)
+        cell_lat, cell_lon = geohash_center(geohash)
+        return GridCell(key=geohash, latitude=cell_lat, longitude=cell_lon, resolution=f"geohash:{geohash_precision}")
+
+    cell_lat, cell_lon = snap_to_degrees(lat, lon, resolution)
+    # Exact cells key on the full coordinates: any rounding would merge distinct points.
+    key = f"{cell_lat:.4f},{cell_lon:.4f}" if resolution > 0 else f"{cell_lat!r},{cell_lon!r}"
+    return GridCell(
+        key=key,
+        latitude=cell_lat,
+        longitude=cell_lon,
+        resolution=f"{resolution}deg" if resolution > 0 else "exact"
+    )
@@ -0,0 +1,39 @@
+import httpx
+import logging
+from typing import Dict
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+def create_http_client() -> httpx.AsyncClient:
+    limits = httpx.Limits(
+        max_connections=settings.HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY
+    )
+    timeout = httpx.Timeout(
+        settings.HTTP_TIMEOUT,
+        connect=settings.HTTP_CONNECT_TIMEOUT,
+        pool=settings.HTTP_POOL_TIMEOUT
+    )
+    logger.info(
+        f"Creating shared HTTP client (http2={settings.HTTP2_ENABLED}, "
+        f"max_connections={settings.HTTP_MAX_CONNECTIONS}, "
+        f"max_keepalive={settings.HTTP_MAX_KEEPALIVE_CONNECTIONS})"
+    )
+    return httpx.AsyncClient(http2=settings.HTTP2_ENABLED, limits=limits, timeout=timeout)
+
+def get_pool_stats(client: httpx.AsyncClient) -> Dict[str, int]:
+    # httpx does not expose pool state publicly, so we read it from the httpcore pool.
+    pool = getattr(getattr(client, "_transport", None), "_pool", None)
+    connections = list(getattr(pool, "connections", []))
+
+    return {
+        "connections": len(connections),
+        "idle": sum(1 for conn in connections if conn.is_idle()),
+        "active": sum(1 for conn in connections if not conn.is_idle() and not conn.is_closed()),
+        "http2": sum(1 for conn in connections if "HTTP/2" in conn.info()),
+        "queued_requests": sum(1 for req in getattr(pool, "_requests", []) if req.is_queued()),
+        "max_connections": settings.HTTP_MAX_CONNECTIONS,
+        "max_keepalive_connections": settings.HTTP_MAX_KEEPALIVE_CONNECTIONS
+    }
@@ -0,0 +1,131 @@
+import time
+from typing import Any, Dict, Iterable, Optional
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from prometheus_client.registry import Collector
+
+# Request-path metrics live in their own registry; /metrics adds the service
+# state (caches, circuits, prefetch) read at scrape time, so it costs nothing per request.
+REGISTRY = CollectorRegistry()
+
+STAGES = ("geocode", "forecast", "analysis", "validation", "serialization")
+
+STAGE_SECONDS = Histogram(
+    "cana_stage_duration_seconds", "Time spent in each stage of building a weather response",
+    ["stage"], registry=REGISTRY,
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+)
+REQUEST_SECONDS = Histogram(
+    "cana_http_request_duration_seconds", "HTTP request latency by route",
+    ["method", "route", "status"], registry=REGISTRY,
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+)
+IN_FLIGHT = Gauge("cana_http_requests_in_flight", "HTTP requests being served", registry=REGISTRY)
+UPSTREAM_RESPONSES = Counter(
+    "cana_upstream_responses_total", "Open-Meteo responses by status code, or the error for failed calls",
+    ["upstream", "status"], registry=REGISTRY
+)
+UPSTREAM_RETRIES = Counter("cana_upstream_retries_total", "Open-Meteo call retries", ["upstream"], registry=REGISTRY)
+UNHANDLED_ERRORS = Counter(
+    "cana_unhandled_exceptions_total", "Exceptions answered with a 500 by the global handler",
+    ["type"], registry=REGISTRY
+)
+
+# Label lookups are resolved once; observe() on a child is all a stage costs.
+_STAGE_CHILDREN = {stage: STAGE_SECONDS.labels(stage) for stage in STAGES}
+
+class timed:
+    """Records the duration of a with block as one of STAGES."""
+    __slots__ = ("_child", "_start")
+
+    def __init__(self, stage: str):
+        self._child = _STAGE_CHILDREN[stage]
+
+    def __enter__(self) -> None:
+        self._start = time.perf_counter()
+
+    def __exit__(self, *exc_info) -> None:
+        self._child.observe(time.perf_counter() - self._start)
+
+def record_upstream(upstream: str, status: Any) -> None:
+    UPSTREAM_RESPONSES.labels(upstream, str(status)).inc()
+
+class MetricsMiddleware:
+    """ASGI middleware timing every HTTP request by its route template.
+
+    Plain ASGI rather than BaseHTTPMiddleware, which runs the app in a separate
+    task and adds noticeable per-request overhead.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            IN_FLIGHT.dec()
+            # Route templates, not raw paths, keep the label set bounded.
+            route = getattr(scope.get("route"), "path", "unmatched")
+            REQUEST_SECONDS.labels(scope["method"], route, str(status)).observe(time.perf_counter() - start)
+
+_CIRCUIT_STATES = {"closed": 0, "half_open": 1, "open": 2}
+
+class ServiceCollector(Collector):
+    """Exposes OpenMeteoService and prefetch statistics as metrics when scraped."""
+
+    def __init__(self, service, scheduler: Optional[Any] = None):
+        self.service = service
+        self.scheduler = scheduler
+
+    def collect(self) -> Iterable[Any]:
+        cache = self.service.cache_stats()
+        for name, help_text, key in (
+            ("cana_cache_hits_total", "Fresh cache hits", "hits"),
+            ("cana_cache_misses_total", "Cache misses", "misses"),
+            ("cana_cache_stale_hits_total", "Stale entries served while revalidating", "stale_hits"),
+            ("cana_cache_stale_on_error_total", "Stale entries served after an upstream error", "stale_on_error")
+        ):
+            yield _family(CounterMetricFamily, name, help_text, "namespace", cache, key)
+        yield _family(GaugeMetricFamily, "cana_cache_hit_ratio", "Fresh hits over lookups", "namespace", cache, "hit_ratio")
+        yield _family(GaugeMetricFamily, "cana_cache_entries", "Entries stored", "namespace", cache, "size")
+
+        circuits = self.service.upstream_stats()
+        states = {name: {"state": _CIRCUIT_STATES[stats["state"]]} for name, stats in circuits.items()}
+        yield _family(GaugeMetricFamily, "cana_circuit_state", "0 closed, 1 half open, 2 open", "upstream", states, "state")
+        yield _family(
+            CounterMetricFamily, "cana_circuit_rejected_total", "Calls failed fast by an open circuit",
+            "upstream", circuits, "rejected"
+        )
+        yield _family(
+            CounterMetricFamily, "cana_singleflight_coalesced_total", "Calls joined to one already in flight",
+            "flight", self.service.singleflight_stats(), "coalesced"
+        )
+
+        if self.scheduler is not None:
+            stats = self.scheduler.stats()
+            yield GaugeMetricFamily("cana_prefetch_locations", "Watched locations", value=len(stats["locations"]))
+            refreshes = CounterMetricFamily("cana_prefetch_refreshes_total", "Prefetch refreshes", labels=["outcome"])
+            refreshes.add_metric(["success"], stats["refreshes"])
+            refreshes.add_metric(["failure"], stats["failures"])
+            yield refreshes
+
+def _family(family_type, name: str, help_text: str, label: str, stats: Dict[str, Dict[str, Any]], key: str):
+    family = family_type(name, help_text, labels=[label])
+    for label_value, values in stats.items():
+        family.add_metric([label_value], values[key])
+    return family
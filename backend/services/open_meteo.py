@@ -1,92 +1,361 @@
+import asyncio
+import hashlib
 import httpx
+import json
 import logging
+from datetime import date
+from typing import Dict, List, Optional, Set, Tuple, Union
 from fastapi import HTTPException
-from cachetools import TTLCache, cached
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception
 from config import settings
-from schemas import Coordinates
-from constants import get_weather_description, OPEN_METEO_HOURLY_PARAMS, OPEN_METEO_DAILY_PARAMS
+from schemas import Coordinates, GridCell
+from services.http_client import create_http_client, get_pool_stats
+from services.cache import CacheEntry, MemoryCacheBackend, ResponseCache, ValueCodec, create_cache_backend
+from services.forecast import CURRENT_ONLY, FULL_FORECAST, Forecast, ForecastSelection
+from services.singleflight import SingleFlight
+from services.resilience import CircuitBreaker, upstream_retry
+from services.metrics import timed
+from services.archive import ARCHIVE_DAILY_PARAMS
+from services.geo import snap_to_grid
+from services.gazetteer import Gazetteer, get_gazetteer
 
 logger = logging.getLogger(__name__)
 
-def is_retryable(e):
-    return not (isinstance(e, HTTPException) and e.status_code == 404)
+def stamp_content_hash(payload: dict) -> dict:
+    # Hashed once per upstream fetch; identifies the forecast for derived-result caches.
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    payload["content_hash"] = hashlib.blake2b(encoded, digest_size=16).hexdigest()
+    return payload
+
+# Shared backends store the Open-Meteo JSON; the memory backend keeps the Forecast itself.
+FORECAST_CODEC = ValueCodec(encode=Forecast.to_payload, decode=Forecast.from_payload)
 
 class OpenMeteoService:
-  
-    cache = TTLCache(maxsize=100, ttl=3600)
-
-    @cached(cache)
-    @retry(
-        stop=stop_after_attempt(3), 
-        wait=wait_exponential(multiplier=1, min=4, max=10),
-        retry=retry_if_exception(is_retryable)
-    )
+
+    def __init__(
+        self,
+        client: Optional[httpx.AsyncClient] = None,
+        cache: Optional[ResponseCache] = None,
+        gazetteer: Optional[Gazetteer] = None
+    ):
+        self.client = client or create_http_client()
+        self.gazetteer = gazetteer or get_gazetteer()
+        self.cache = cache or ResponseCache(create_cache_backend())
+        self.geocoding_cache = self.cache.namespace(
+            "geocoding", settings.GEOCODING_CACHE_MAXSIZE, settings.GEOCODING_CACHE_TTL
+        )
+        self.forecast_cache = self.cache.namespace(
+            "forecast", settings.FORECAST_CACHE_MAXSIZE, settings.FORECAST_CACHE_TTL, FORECAST_CODEC,
+            stale_while_revalidate=settings.FORECAST_STALE_WHILE_REVALIDATE,
+            stale_if_error=settings.FORECAST_STALE_IF_ERROR
+        )
+        self.current_cache = self.cache.namespace(
+            "current", settings.CURRENT_CACHE_MAXSIZE, settings.CURRENT_CACHE_TTL, FORECAST_CODEC
+        )
+        self.analysis_cache = self.cache.namespace(
+            "analysis", settings.FORECAST_CACHE_MAXSIZE, settings.FORECAST_CACHE_TTL
+        )
+        # Encoded response bodies are only useful as an in-process memory copy.
+        self.local_cache = ResponseCache(MemoryCacheBackend())
+        self.encoded_response_cache = self.local_cache.namespace(
+            "encoded_responses", settings.RESPONSE_CACHE_MAXSIZE, settings.FORECAST_CACHE_TTL
+        )
+        self.geocoding_flight = SingleFlight("geocoding")
+        self.forecast_flight = SingleFlight("forecast")
+        self._batch_tasks: Set[asyncio.Task] = set()
+        self.geocoding_breaker = CircuitBreaker(
+            "geocoding", settings.CIRCUIT_FAILURE_THRESHOLD, settings.CIRCUIT_RESET_TIMEOUT
+        )
+        self.forecast_breaker = CircuitBreaker(
+            "forecast", settings.CIRCUIT_FAILURE_THRESHOLD, settings.CIRCUIT_RESET_TIMEOUT
+        )
+        self.archive_breaker = CircuitBreaker(
+            "archive", settings.CIRCUIT_FAILURE_THRESHOLD, settings.CIRCUIT_RESET_TIMEOUT
+        )
+
+    async def aclose(self):
+        # Background revalidations and the shielded calls they started still use the
+        # client; cancel them before closing it.
+        await self.cache.close()
+        await self.local_cache.close()
+        for task in self._batch_tasks:
+            task.cancel()
+        await asyncio.gather(*self._batch_tasks, return_exceptions=True)
+        await asyncio.gather(self.geocoding_flight.cancel(), self.forecast_flight.cancel())
+        await self.client.aclose()
+
+    def pool_stats(self) -> dict:
+        return get_pool_stats(self.client)
+
+    def cache_stats(self) -> dict:
+        return {**self.cache.stats(), **self.local_cache.stats()}
+
+    def upstream_stats(self) -> dict:
+        return {
+            "geocoding": self.geocoding_breaker.stats(),
+            "forecast": self.forecast_breaker.stats(),
+            "archive": self.archive_breaker.stats()
+        }
+
+    def singleflight_stats(self) -> dict:
+        return {
+            "geocoding": self.geocoding_flight.stats(),
+            "forecast": self.forecast_flight.stats()
+        }
+
     async def get_coordinates(self, city_name: str) -> Coordinates:
-      
+        with timed("geocode"):
+            if self.gazetteer:
+                coordinates = self.gazetteer.lookup(city_name)
+                if coordinates:
+                    return coordinates
+
+            key = city_name.strip().lower()
+
+            async def fetch() -> dict:
+                coordinates = await self._fetch_coordinates(city_name)
+                return coordinates.model_dump()
+
+            data = await self.geocoding_cache.get_or_fetch(key, lambda: self.geocoding_flight.do(key, fetch))
+            return Coordinates(**data)
+
+    def grid_cell(self, lat: float, lon: float) -> GridCell:
+        return snap_to_grid(
+            lat, lon,
+            settings.FORECAST_GRID_MODE,
+            settings.FORECAST_GRID_RESOLUTION,
+            settings.FORECAST_GEOHASH_PRECISION
+        )
+
+    async def get_weather(self, lat: float, lon: float, selection: ForecastSelection = FULL_FORECAST) -> Forecast:
+        cell = self.grid_cell(lat, lon)
+        key = selection.cache_key(cell.key)
+        with timed("forecast"):
+            forecast, stale = await self.forecast_cache.get_or_revalidate(
+                key,
+                lambda: self.forecast_flight.do(key, lambda: self._fetch_weather(cell.latitude, cell.longitude, selection))
+            )
+        return forecast.as_stale() if stale else forecast
+
+    async def refresh_weather(self, cell: GridCell, selection: ForecastSelection = FULL_FORECAST) -> Forecast:
+        """Fetches a cell's forecast regardless of the cache and stores it, resetting its TTL."""
+        key = selection.cache_key(cell.key)
+        forecast = await self.forecast_flight.do(
+            key, lambda: self._fetch_weather(cell.latitude, cell.longitude, selection)
+        )
+        await self.forecast_cache.set(key, forecast)
+        return forecast
+
+    async def forecast_age(self, cell: GridCell, selection: ForecastSelection = FULL_FORECAST) -> Optional[float]:
+        """Seconds since the cell's cached forecast was stored, None when it is not cached."""
+        entry = await self.forecast_cache.get_entry(selection.cache_key(cell.key))
+        return None if entry is None else entry.age
+
+    async def get_current(self, lat: float, lon: float) -> Forecast:
+        """Current conditions only: no hourly/daily series, cached with a short TTL of their own."""
+        cell = self.grid_cell(lat, lon)
+        key = f"current:{cell.key}"
+        with timed("forecast"):
+            return await self.current_cache.get_or_fetch(
+                cell.key,
+                lambda: self.forecast_flight.do(key, lambda: self._fetch_weather(cell.latitude, cell.longitude, CURRENT_ONLY))
+            )
+
+    @upstream_retry("geocoding")
+    async def _fetch_coordinates(self, city_name: str) -> Coordinates:
+
         logger.info(f"Fetching coordinates for city: {city_name}")
-        async with httpx.AsyncClient() as client:
+        try:
+            response = await self.geocoding_breaker.get(
+                self.client,
+                settings.OPEN_METEO_GEOCODING_URL,
+                {"name": city_name, "count": 1, "language": "pt", "format": "json"}
+            )
+            data = response.json()
+
+            if not data.get("results"):
+                logger.warning(f"City not found: {city_name}")
+                raise HTTPException(status_code=404, detail="City not found")
+
+            result = data["results"][0]
+            logger.info(f"Found coordinates for {city_name}: {result['latitude']}, {result['longitude']}")
+            return Coordinates(
+                name=result["name"],
+                latitude=result["latitude"],
+                longitude=result["longitude"],
+                country=result.get("country"),
+                state=result.get("admin1")
+            )
+        except httpx.RequestError as e:
+            logger.error(f"Error connecting to geocoding service: {str(e)}")
+            raise HTTPException(status_code=503, detail=f"Error connecting to geocoding service: {str(e)}")
+
+    async def get_weather_many(self, points: List[Tuple[float, float]]) -> List[Union[Forecast, Exception]]:
+        """Forecasts for many points: a forecast or the exception it failed with, per point."""
+        return list(await asyncio.gather(*self.forecast_futures(points)))
+
+    def forecast_futures(self, points: List[Tuple[float, float]]) -> List[asyncio.Future]:
+        """One future per point, done as soon as that point's forecast is known, with the
+        forecast or the exception as its result. The cache is read like get_weather does;
+        cells it cannot serve are fetched with Open-Meteo's multi-coordinate requests,
+        except those already being fetched, which are joined through the single flight.
+        A cell whose fetch fails yields a stale forecast when one is still servable, and
+        a point that cannot be placed on the grid fails on its own."""
+        loop = asyncio.get_running_loop()
+        cells: List[Union[GridCell, asyncio.Future]] = []
+        for lat, lon in points:
             try:
-                response = await client.get(
-                    settings.OPEN_METEO_GEOCODING_URL,
-                    params={"name": city_name, "count": 1, "language": "pt", "format": "json"}
-                )
-                response.raise_for_status()
-                data = response.json()
-                
-                if not data.get("results"):
-                    logger.warning(f"City not found: {city_name}")
-                    raise HTTPException(status_code=404, detail="City not found")
-                
-                result = data["results"][0]
-                logger.info(f"Found coordinates for {city_name}: {result['latitude']}, {result['longitude']}")
-                return Coordinates(
-                    name=result["name"],
-                    latitude=result["latitude"],
-                    longitude=result["longitude"],
-                    country=result.get("country"),
-                    state=result.get("admin1")
-                )
-            except httpx.RequestError as e:
-                logger.error(f"Error connecting to geocoding service: {str(e)}")
-                raise HTTPException(status_code=503, detail=f"Error connecting to geocoding service: {str(e)}")
-
-    @cached(cache)
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
-    async def get_weather(self, lat: float, lon: float) -> dict:
-     
+                cells.append(self.grid_cell(lat, lon))
+            except (OverflowError, ValueError) as e:
+                invalid = loop.create_future()
+                invalid.set_result(HTTPException(status_code=422, detail=f"Invalid coordinates: {str(e)}"))
+                cells.append(invalid)
+
+        unique = list({cell.key: cell for cell in cells if isinstance(cell, GridCell)}.values())
+        futures = {cell.key: loop.create_future() for cell in unique}
+        if unique:
+            task = asyncio.ensure_future(self._resolve_forecasts(unique, futures))
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
+        return [futures[cell.key] if isinstance(cell, GridCell) else cell for cell in cells]
+
+    async def _resolve_forecasts(self, unique: List[GridCell], futures: Dict[str, asyncio.Future]):
+        def settle(cell: GridCell, outcome: Union[Forecast, Exception]):
+            if not futures[cell.key].done():
+                futures[cell.key].set_result(outcome)
+
+        def fetch_one(cell: GridCell):
+            return lambda: self.forecast_flight.do(cell.key, lambda: self._fetch_weather(cell.latitude, cell.longitude))
+
+        try:
+            lookups = await asyncio.gather(*(self.forecast_cache.lookup(cell.key, fetch_one(cell)) for cell in unique))
+            missing: List[Tuple[GridCell, Optional[CacheEntry]]] = []
+            for cell, (entry, servable) in zip(unique, lookups):
+                if servable:
+                    settle(cell, entry.value if self.forecast_cache.is_fresh(entry) else entry.value.as_stale())
+                else:
+                    missing.append((cell, entry))
+
+            # Cells another request is already fetching are joined rather than fetched again.
+            to_fetch = [cell for cell, _ in missing if not self.forecast_flight.in_flight(cell.key)]
+            chunk_size = settings.BATCH_UPSTREAM_CHUNK_SIZE
+            semaphore = asyncio.Semaphore(settings.BATCH_CONCURRENCY)
+            chunk_tasks: Dict[str, Tuple[asyncio.Future, int]] = {}
+
+            async def fetch_chunk(chunk: List[GridCell]) -> List[Forecast]:
+                async with semaphore:
+                    return await self._fetch_weather_many(chunk)
+
+            for start in range(0, len(to_fetch), chunk_size):
+                chunk = to_fetch[start:start + chunk_size]
+                task = asyncio.ensure_future(fetch_chunk(chunk))
+                # Cells joined to another fetch in the meantime leave nobody awaiting the task.
+                task.add_done_callback(lambda done: done.cancelled() or done.exception())
+                for position, cell in enumerate(chunk):
+                    chunk_tasks[cell.key] = (task, position)
+
+            async def from_chunk(cell: GridCell) -> Forecast:
+                if cell.key not in chunk_tasks:
+                    return await self._fetch_weather(cell.latitude, cell.longitude)
+                task, position = chunk_tasks[cell.key]
+                forecasts = await task
+                if position >= len(forecasts):
+                    raise HTTPException(status_code=502, detail="The forecast service answered for fewer locations than requested")
+                return forecasts[position]
+
+            async def resolve(cell: GridCell, entry: Optional[CacheEntry]):
+                try:
+                    forecast, stale = await self.forecast_cache.fetch_or_stale(
+                        cell.key, entry, lambda: self.forecast_flight.do(cell.key, lambda: from_chunk(cell))
+                    )
+                except Exception as e:
+                    settle(cell, e)
+                else:
+                    settle(cell, forecast.as_stale() if stale else forecast)
+
+            await asyncio.gather(*(resolve(cell, entry) for cell, entry in missing))
+        except Exception as e:
+            for cell in unique:
+                settle(cell, e)
+        finally:
+            for future in futures.values():
+                future.cancel()
+
+    def _forecast_params(
+        self,
+        latitude: Union[float, str],
+        longitude: Union[float, str],
+        selection: ForecastSelection = FULL_FORECAST
+    ) -> dict:
+        params = {
+            "latitude": latitude,
+            "longitude": longitude,
+            "current_weather": True,
+            "forecast_days": selection.days,
+            "timezone": "auto"
+        }
+        # Open-Meteo skips a block entirely when it is not requested.
+        if selection.hourly:
+            params["hourly"] = ",".join(selection.hourly)
+        if selection.daily:
+            params["daily"] = ",".join(selection.daily)
+        return params
+
+    @upstream_retry("forecast")
+    async def _fetch_weather(self, lat: float, lon: float, selection: ForecastSelection = FULL_FORECAST) -> Forecast:
+
         logger.info(f"Fetching weather data for coordinates: {lat}, {lon}")
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(
-                    settings.OPEN_METEO_WEATHER_URL,
-                    params={
-                        "latitude": lat,
-                        "longitude": lon,
-                        "current_weather": True,
-                        "hourly": OPEN_METEO_HOURLY_PARAMS,
-                        "daily": OPEN_METEO_DAILY_PARAMS,
-                        "timezone": "auto"
-                    }
+        try:
+            response = await self.forecast_breaker.get(
+                self.client, settings.OPEN_METEO_WEATHER_URL, self._forecast_params(lat, lon, selection)
+            )
+            return Forecast.from_payload(stamp_content_hash(response.json()))
+        except httpx.RequestError as e:
+            logger.error(f"Error connecting to weather service: {str(e)}")
+            raise HTTPException(status_code=503, detail=f"Error connecting to weather service: {str(e)}")
+
+    @upstream_retry("forecast")
+    async def _fetch_weather_many(self, cells: List[GridCell]) -> List[Forecast]:
+
+        logger.info(f"Fetching weather data for {len(cells)} locations")
+        try:
+            response = await self.forecast_breaker.get(
+                self.client,
+                settings.OPEN_METEO_WEATHER_URL,
+                self._forecast_params(
+                    ",".join(str(cell.latitude) for cell in cells),
+                    ",".join(str(cell.longitude) for cell in cells)
                 )
-                response.raise_for_status()
-                return response.json()
-            except httpx.RequestError as e:
-                logger.error(f"Error connecting to weather service: {str(e)}")
-                raise HTTPException(status_code=503, detail=f"Error connecting to weather service: {str(e)}")
-
-    def enrich_weather_data(self, weather_data: dict) -> dict:
-        
-        if weather_data.get("hourly"):
-            weather_data["hourly"]["weather_description"] = [
-                get_weather_description(code) 
-                for code in weather_data["hourly"].get("weathercode", [])
+            )
+            data = response.json()
+            # Open-Meteo answers a single location with an object and several with a list.
+            return [
+                Forecast.from_payload(stamp_content_hash(payload))
+                for payload in (data if isinstance(data, list) else [data])
             ]
+        except httpx.RequestError as e:
+            logger.error(f"Error connecting to weather service: {str(e)}")
+            raise HTTPException(status_code=503, detail=f"Error connecting to weather service: {str(e)}")
 
-        if weather_data.get("daily"):
-            weather_data["daily"]["weather_description"] = [
-                get_weather_description(code) 
-                for code in weather_data["daily"].get("weathercode", [])
-            ]
-            
-        return weather_data
+    @upstream_retry("archive")
+    async def get_archive(self, cell: GridCell, start_date: date, end_date: date) -> dict:
+        """Raw Open-Meteo archive payload of daily values for a grid cell. Not cached:
+        callers ingest it into the archive store."""
+
+        logger.info(f"Fetching archive data for {cell.key} from {start_date} to {end_date}")
+        try:
+            response = await self.archive_breaker.get(
+                self.client,
+                settings.OPEN_METEO_ARCHIVE_URL,
+                {
+                    "latitude": cell.latitude,
+                    "longitude": cell.longitude,
+                    "start_date": start_date.isoformat(),
+                    "end_date": end_date.isoformat(),
+                    "daily": ARCHIVE_DAILY_PARAMS,
+                    "timezone": "auto"
+                }
+            )
+            return response.json()
+        except httpx.RequestError as e:
+            logger.error(f"Error connecting to archive service: {str(e)}")
+            raise HTTPException(status_code=503, detail=f"Error connecting to archive service: {str(e)}")
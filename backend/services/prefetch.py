@@ -0,0 +1,190 @@
+import asyncio
+import logging
+import random
+import time
+from typing import Dict, List, Optional
+from config import settings
+from schemas import GridCell
+from services.open_meteo import OpenMeteoService
+
+logger = logging.getLogger(__name__)
+
+class WatchedLocation:
+    def __init__(self, cell: GridCell, label: str, pinned: bool, now: float):
+        self.cell = cell
+        self.label = label
+        # Pinned locations stay until removed; the others expire once nobody asks for them.
+        self.pinned = pinned
+        self.last_requested = now
+        self.next_refresh = now
+        self.last_refresh: Optional[float] = None
+        self.failures = 0
+
+    def to_dict(self, now: float) -> dict:
+        return {
+            "key": self.cell.key,
+            "label": self.label,
+            "latitude": self.cell.latitude,
+            "longitude": self.cell.longitude,
+            "pinned": self.pinned,
+            "refresh_in": round(max(self.next_refresh - now, 0.0), 1),
+            "last_refresh_age": round(now - self.last_refresh, 1) if self.last_refresh is not None else None,
+            "failures": self.failures
+        }
+
+class WatchRegistry:
+    """Grid cells whose forecasts are kept warm, keyed like the forecast cache."""
+
+    def __init__(self, max_locations: int, idle_ttl: float):
+        self.max_locations = max_locations
+        self.idle_ttl = idle_ttl
+        self.locations: Dict[str, WatchedLocation] = {}
+
+    def watch(self, cell: GridCell, label: str, pinned: bool = True) -> Optional[WatchedLocation]:
+        """Adds or refreshes a location; returns None when the registry is full."""
+        now = time.monotonic()
+        location = self.locations.get(cell.key)
+        if location is not None:
+            location.last_requested = now
+            location.pinned = location.pinned or pinned
+            return location
+        if len(self.locations) >= self.max_locations:
+            return None
+        location = WatchedLocation(cell, label, pinned, now)
+        self.locations[cell.key] = location
+        return location
+
+    def unwatch(self, key: str) -> bool:
+        return self.locations.pop(key, None) is not None
+
+    def expire_idle(self, now: float) -> int:
+        idle = [
+            key for key, location in self.locations.items()
+            if not location.pinned and now - location.last_requested > self.idle_ttl
+        ]
+        for key in idle:
+            del self.locations[key]
+        return len(idle)
+
+    def due(self, now: float) -> List[WatchedLocation]:
+        return [location for location in self.locations.values() if location.next_refresh <= now]
+
+    def next_due(self) -> Optional[float]:
+        return min((location.next_refresh for location in self.locations.values()), default=None)
+
+class PrefetchScheduler:
+    """Background task refreshing watched forecasts shortly before they expire.
+
+    Each location is refreshed when PREFETCH_REFRESH_AHEAD of the forecast TTL is
+    left, with random jitter so locations watched together do not refresh together,
+    and at most PREFETCH_CONCURRENCY refreshes run at once. A location whose cached
+    forecast is younger than the interval (cached before it was watched, or refreshed
+    by another worker sharing the cache) is rescheduled by that age instead, and a
+    lease in the cache keeps two workers from refreshing the same cell at once.
+    """
+
+    def __init__(self, service: OpenMeteoService, registry: Optional[WatchRegistry] = None):
+        self.service = service
+        self.registry = registry or WatchRegistry(settings.PREFETCH_MAX_LOCATIONS, settings.PREFETCH_IDLE_TTL)
+        self.interval = settings.FORECAST_CACHE_TTL * (1 - settings.PREFETCH_REFRESH_AHEAD)
+        self.counters = {"refreshes": 0, "skipped": 0, "failures": 0, "expired": 0}
+        self._semaphore = asyncio.Semaphore(settings.PREFETCH_CONCURRENCY)
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._refreshing: Dict[str, asyncio.Task] = {}
+
+    def watch(self, cell: GridCell, label: str, pinned: bool = True) -> Optional[WatchedLocation]:
+        is_new = cell.key not in self.registry.locations
+        location = self.registry.watch(cell, label, pinned)
+        if location is not None and is_new:
+            self._wakeup.set()
+        return location
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"Prefetch scheduler started, refreshing every {self.interval:.0f}s")
+
+    async def stop(self) -> None:
+        tasks = [task for task in [self._task, *self._refreshing.values()] if task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+
+    async def seed(self, city_names: List[str]) -> None:
+        for city_name in city_names:
+            try:
+                coordinates = await self.service.get_coordinates(city_name)
+            except Exception as e:
+                logger.warning(f"Could not watch {city_name}: {str(e)}")
+                continue
+            self.watch(self.service.grid_cell(coordinates.latitude, coordinates.longitude), coordinates.name)
+
+    def _jittered(self, delay: float) -> float:
+        return max(delay + random.uniform(-1, 1) * settings.PREFETCH_JITTER * delay, 0.0)
+
+    def _skip(self, location: WatchedLocation, delay: float) -> None:
+        location.next_refresh = time.monotonic() + self._jittered(delay)
+        self.counters["skipped"] += 1
+
+    async def _refresh(self, location: WatchedLocation) -> None:
+        try:
+            async with self._semaphore:
+                age = await self.service.forecast_age(location.cell)
+                if age is not None and age < self.interval:
+                    self._skip(location, self.interval - age)
+                    return
+                lease = f"prefetch:{location.cell.key}"
+                if not await self.service.cache.acquire_lease(lease, settings.PREFETCH_RETRY_DELAY):
+                    # Another worker is refreshing it; the next check sees its result.
+                    self._skip(location, settings.PREFETCH_RETRY_DELAY)
+                    return
+                await self.service.refresh_weather(location.cell)
+        except Exception as e:
+            location.failures += 1
+            self.counters["failures"] += 1
+            location.next_refresh = time.monotonic() + self._jittered(settings.PREFETCH_RETRY_DELAY)
+            logger.warning(f"Prefetch of {location.label} ({location.cell.key}) failed: {str(e)}")
+        else:
+            now = time.monotonic()
+            location.failures = 0
+            location.last_refresh = now
+            location.next_refresh = now + self._jittered(self.interval)
+            self.counters["refreshes"] += 1
+        finally:
+            self._refreshing.pop(location.cell.key, None)
+            # _run slept until the placeholder time it set; a retry or skip may be due sooner.
+            self._wakeup.set()
+
+    async def _run(self) -> None:
+        await self.seed(settings.PREFETCH_LOCATIONS)
+        while True:
+            now = time.monotonic()
+            self.counters["expired"] += self.registry.expire_idle(now)
+
+            for location in self.registry.due(now):
+                if location.cell.key not in self._refreshing:
+                    # Pushed out while in flight; _refresh sets the real next time.
+                    location.next_refresh = now + self.interval
+                    self._refreshing[location.cell.key] = asyncio.create_task(self._refresh(location))
+
+            next_due = self.registry.next_due()
+            timeout = None if next_due is None else max(next_due - time.monotonic(), 0.0)
+            # Idle locations expire even when nothing else is due.
+            timeout = min(timeout if timeout is not None else self.registry.idle_ttl, self.registry.idle_ttl)
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        return {
+            **self.counters,
+            "running": self._task is not None and not self._task.done(),
+            "in_flight": len(self._refreshing),
+            "interval": self.interval,
+            "locations": [location.to_dict(now) for location in self.registry.locations.values()]
+        }
@@ -0,0 +1,151 @@
+import cProfile
+import hmac
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import uuid
+from typing import Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = b"x-profile"
+FORMAT_HEADER = b"x-profile-format"
+FORMATS = ("pstats", "speedscope")
+
+# One profiler can hook a thread at a time: a second enable() would replace the
+# first's hook (or raise, on Python 3.12+) and its disable() would remove it.
+_profiling = threading.Lock()
+
+class SpeedscopeRecorder:
+    """sys.setprofile hook recording call/return events as a speedscope evented profile.
+
+    A coroutine suspended at an await returns from its frames and re-enters them on
+    resume, so the recorded stacks are exactly what ran on the thread and when.
+    Events from frames entered before recording started are skipped.
+    """
+
+    def __init__(self):
+        self.frames: List[Dict[str, object]] = []
+        self._frame_index: Dict[Tuple[str, str, int], int] = {}
+        self._events: List[Dict[str, object]] = []
+        self._stack: List[int] = []
+        self._start = time.perf_counter()
+        self._end = self._start
+
+    def _frame(self, name: str, file: str, line: int) -> int:
+        key = (name, file, line)
+        index = self._frame_index.get(key)
+        if index is None:
+            index = self._frame_index[key] = len(self.frames)
+            self.frames.append({"name": name, "file": file, "line": line})
+        return index
+
+    def __call__(self, frame, event, arg):
+        at = time.perf_counter() - self._start
+        if event == "call":
+            code = frame.f_code
+            index = self._frame(getattr(code, "co_qualname", code.co_name), code.co_filename, code.co_firstlineno)
+        elif event == "c_call":
+            index = self._frame(getattr(arg, "__qualname__", repr(arg)), "<builtin>", 0)
+        elif self._stack:
+            self._events.append({"type": "C", "frame": self._stack.pop(), "at": at})
+            return
+        else:
+            return
+        self._stack.append(index)
+        self._events.append({"type": "O", "frame": index, "at": at})
+
+    # Same interface as cProfile.Profile.
+    def enable(self) -> None:
+        sys.setprofile(self)
+
+    def disable(self) -> None:
+        sys.setprofile(None)
+        self._end = time.perf_counter() - self._start
+        while self._stack:
+            self._events.append({"type": "C", "frame": self._stack.pop(), "at": self._end})
+
+    def to_json(self, name: str) -> Dict[str, object]:
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": self.frames},
+            "profiles": [{
+                "type": "evented",
+                "name": name,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": self._end,
+                "events": self._events
+            }],
+            "exporter": "cana-e-clima"
+        }
+
+class ProfilingMiddleware:
+    """Profiles single requests that carry `X-Profile: <secret>`.
+
+    `X-Profile-Format` picks pstats (cProfile, the default) or speedscope (an
+    evented trace viewable at speedscope.app). The profile is written to
+    `directory` and its file name returned in the `X-Profile-File` header.
+    Only registered when a secret is configured; other requests pass through
+    after a header lookup. Profilers see the whole thread, so requests running
+    concurrently on the same worker show up in the profile too. A profiled request
+    arriving while another is being profiled is served unprofiled, with
+    `X-Profile-Status: busy`.
+    """
+
+    def __init__(self, app, secret: str, directory: str):
+        self.app = app
+        self.secret = secret.encode("utf-8")
+        self.directory = directory
+
+    def _requested_format(self, scope) -> str:
+        headers = dict(scope["headers"])
+        token = headers.get(PROFILE_HEADER)
+        if token is None or not hmac.compare_digest(token, self.secret):
+            return ""
+        requested = headers.get(FORMAT_HEADER, b"pstats").decode("latin-1")
+        return requested if requested in FORMATS else "pstats"
+
+    async def __call__(self, scope, receive, send):
+        profile_format = self._requested_format(scope) if scope["type"] == "http" else ""
+        if not profile_format:
+            await self.app(scope, receive, send)
+            return
+
+        if not _profiling.acquire(blocking=False):
+            logger.warning(f"Not profiling {scope['method']} {scope['path']}: another request is being profiled")
+            await self.app(scope, receive, _with_header(send, b"x-profile-status", b"busy"))
+            return
+
+        suffix = ".speedscope.json" if profile_format == "speedscope" else ".pstats"
+        file_name = f"{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}{suffix}"
+        try:
+            profiler = SpeedscopeRecorder() if profile_format == "speedscope" else cProfile.Profile()
+            profiler.enable()
+            try:
+                await self.app(scope, receive, _with_header(send, b"x-profile-file", file_name.encode("latin-1")))
+            finally:
+                profiler.disable()
+                self._write(profiler, profile_format, file_name, f"{scope['method']} {scope['path']}")
+        finally:
+            _profiling.release()
+
+    def _write(self, profiler, profile_format: str, file_name: str, name: str) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, file_name)
+        if profile_format == "speedscope":
+            with open(path, "w") as file:
+                json.dump(profiler.to_json(name), file)
+        else:
+            profiler.dump_stats(path)
+        logger.info(f"Profile of {name} written to {path}")
+
+def _with_header(send, name: bytes, value: bytes):
+    async def send_with_header(message):
+        if message["type"] == "http.response.start":
+            message = {**message, "headers": [*message.get("headers", []), (name, value)]}
+        await send(message)
+    return send_with_header
@@ -0,0 +1,183 @@
+import asyncio
+import functools
+import logging
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+import httpx
+from fastapi import HTTPException
+from tenacity import RetryCallState, retry, retry_if_exception, stop_after_attempt, wait_exponential
+from config import settings
+from services.metrics import UPSTREAM_RETRIES, record_upstream
+
+logger = logging.getLogger(__name__)
+
+# Monotonic time by which the current request must be answered.
+_deadline: ContextVar[Optional[float]] = ContextVar("deadline", default=None)
+
+class DeadlineExceeded(HTTPException):
+    def __init__(self):
+        super().__init__(status_code=504, detail="Request deadline exceeded waiting for the weather service")
+
+class CircuitOpenError(HTTPException):
+    def __init__(self, upstream: str):
+        super().__init__(status_code=503, detail=f"The {upstream} service is unavailable, please try again later")
+
+class UpstreamError(HTTPException):
+    """An Open-Meteo error answer that outlasted the retries."""
+    def __init__(self, upstream: str, status_code: int):
+        super().__init__(status_code=502, detail=f"The {upstream} service answered with an error ({status_code})")
+
+async def request_deadline() -> None:
+    """Router dependency starting the REQUEST_DEADLINE budget.
+
+    Async dependencies run in the endpoint's task, so the budget is seen by every
+    upstream call the request makes. Background refreshes and prefetches do not
+    run in a request context and have no deadline.
+    """
+    set_deadline(settings.REQUEST_DEADLINE or None)
+
+def set_deadline(seconds: Optional[float]) -> None:
+    _deadline.set(time.monotonic() + seconds if seconds else None)
+
+def remaining_budget() -> Optional[float]:
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+def attempt_timeout() -> Any:
+    """The client timeout, cut to what is left of the request budget."""
+    remaining = remaining_budget()
+    if remaining is None:
+        return httpx.USE_CLIENT_DEFAULT
+    if remaining <= 0:
+        raise DeadlineExceeded()
+    return httpx.Timeout(
+        min(settings.HTTP_TIMEOUT, remaining),
+        connect=min(settings.HTTP_CONNECT_TIMEOUT, remaining),
+        pool=min(settings.HTTP_POOL_TIMEOUT, remaining)
+    )
+
+def stop_on_budget(retry_state: RetryCallState) -> bool:
+    # Tenacity computes the backoff before asking whether to stop.
+    remaining = remaining_budget()
+    if remaining is None:
+        return False
+    return remaining - retry_state.upcoming_sleep < settings.UPSTREAM_MIN_ATTEMPT_TIME
+
+def is_retryable(e: BaseException) -> bool:
+    # Tenacity also sees cancellation, which must end the call rather than retry it.
+    if not isinstance(e, Exception):
+        return False
+    # Client errors other than 429 would only be answered the same way again.
+    if isinstance(e, httpx.HTTPStatusError):
+        return is_upstream_failure(e)
+    if isinstance(e, (CircuitOpenError, DeadlineExceeded)):
+        return False
+    return not (isinstance(e, HTTPException) and e.status_code < 500)
+
+def upstream_retry(upstream: str):
+    """Retry policy for Open-Meteo calls: a few quick attempts within the request budget.
+    An error status left after the last attempt is raised as UpstreamError."""
+    retries = UPSTREAM_RETRIES.labels(upstream)
+    policy = retry(
+        stop=stop_after_attempt(settings.UPSTREAM_RETRY_ATTEMPTS) | stop_on_budget,
+        wait=wait_exponential(multiplier=settings.UPSTREAM_RETRY_WAIT_MIN, max=settings.UPSTREAM_RETRY_WAIT_MAX),
+        retry=retry_if_exception(is_retryable),
+        before_sleep=lambda retry_state: retries.inc(),
+        reraise=True
+    )
+
+    def decorate(fetch):
+        retrying = policy(fetch)
+
+        @functools.wraps(fetch)
+        async def call(*args, **kwargs):
+            try:
+                return await retrying(*args, **kwargs)
+            except httpx.HTTPStatusError as e:
+                raise UpstreamError(upstream, e.response.status_code) from e
+        return call
+    return decorate
+
+def is_upstream_failure(e: BaseException) -> bool:
+    # 4xx answers mean the upstream is up; only its unavailability opens the circuit.
+    if isinstance(e, httpx.HTTPStatusError):
+        return e.response.status_code >= 500 or e.response.status_code == 429
+    return isinstance(e, httpx.RequestError)
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker for one upstream.
+
+    closed: calls go through. open: calls fail with CircuitOpenError until
+    reset_timeout has passed. half_open: a single probe call is let through;
+    its success closes the circuit and its failure opens it again.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.counters = {"calls": 0, "failures": 0, "rejected": 0, "opened": 0}
+        self._probing = False
+
+    def before_call(self) -> None:
+        if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self.state = "half_open"
+        if self.state == "open" or (self.state == "half_open" and self._probing):
+            self.counters["rejected"] += 1
+            raise CircuitOpenError(self.name)
+        self._probing = self.state == "half_open"
+        self.counters["calls"] += 1
+
+    def record_success(self) -> None:
+        if self.state != "closed":
+            logger.info(f"Circuit for {self.name} closed")
+        self.state = "closed"
+        self.failures = 0
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self.counters["failures"] += 1
+        self._probing = False
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            if self.state != "open":
+                logger.warning(f"Circuit for {self.name} opened after {self.failures} consecutive failures")
+                self.counters["opened"] += 1
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+    async def get(self, client: httpx.AsyncClient, url: str, params: Dict[str, Any]) -> httpx.Response:
+        """GET through the breaker, within the request budget; raises for error statuses."""
+        timeout = attempt_timeout()
+        self.before_call()
+        try:
+            response = await client.get(url, params=params, timeout=timeout)
+            record_upstream(self.name, response.status_code)
+            response.raise_for_status()
+        except asyncio.CancelledError:
+            # A cancelled probe must not leave the circuit half open for good.
+            self._probing = False
+            raise
+        except Exception as e:
+            if isinstance(e, httpx.RequestError):
+                record_upstream(self.name, type(e).__name__)
+            if is_upstream_failure(e):
+                self.record_failure()
+            else:
+                self.record_success()
+            raise
+        self.record_success()
+        return response
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.counters,
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "open_for": round(max(self.reset_timeout - (time.monotonic() - self.opened_at), 0.0), 1)
+            if self.state == "open" else 0.0
+        }
@@ -0,0 +1,17 @@
+from typing import Any
+import orjson
+from fastapi.responses import JSONResponse
+
+# NumPy arrays are encoded natively (NaN as null); integer keys become strings.
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+def encode_json(content: Any) -> bytes:
+    return orjson.dumps(content, option=ORJSON_OPTIONS)
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson; bytes are taken as an already encoded body."""
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return encode_json(content)
@@ -0,0 +1,49 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+class SingleFlight:
+    """Coalesces concurrent calls for the same key into one upstream call.
+
+    The first caller starts the call as a task; callers arriving while it is
+    in flight await the same task and get the same result (or exception).
+    The task is shielded so a cancelled caller does not cancel it for the rest.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.counters = {"calls": 0, "executions": 0, "coalesced": 0}
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        self.counters["calls"] += 1
+        task = self._in_flight.get(key)
+
+        if task is None:
+            self.counters["executions"] += 1
+            task = asyncio.ensure_future(fn())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        else:
+            self.counters["coalesced"] += 1
+
+        return await asyncio.shield(task)
+
+    async def cancel(self) -> None:
+        """Cancels the calls in flight and waits for them, at shutdown."""
+        tasks = list(self._in_flight.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def in_flight(self, key: Hashable) -> bool:
+        return key in self._in_flight
+
+    def _finish(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # Mark the exception as retrieved in case every caller was cancelled.
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, int]:
+        return {**self.counters, "in_flight": len(self._in_flight)}
@@ -0,0 +1,197 @@
+import hashlib
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+from config import settings
+from services.open_meteo import OpenMeteoService
+from services.agronomic import AgronomicLogic
+from services.agronomic.rules import DailyResults
+from services.forecast import DAILY_COLUMNS, FORECAST_DAYS, HOURLY_COLUMNS, Forecast, ForecastSelection, SeriesTable
+from services.serialization import encode_json
+from services.metrics import timed
+from schemas import Coordinates, CurrentConditionsResponse, WeatherResponse
+from constants import get_weather_description
+
+class ReportOptions(NamedTuple):
+    """What a client asked for: forecast horizon, agronomic phases and series fields.
+
+    Empty phases or fields mean all of them.
+    """
+    days: int = FORECAST_DAYS
+    phases: Tuple[str, ...] = ()
+    fields: Tuple[str, ...] = ()
+
+    @property
+    def key(self) -> str:
+        return f"{self.days}|{','.join(self.phases)}|{','.join(self.fields)}"
+
+    def selection(self, agronomic_service: AgronomicLogic) -> ForecastSelection:
+        """Upstream variables to fetch: the requested fields plus what the selected phases' rules read."""
+        rule_set = agronomic_service.rule_set.for_phases(self.phases)
+        fields = self.fields or HOURLY_COLUMNS + DAILY_COLUMNS
+        return ForecastSelection.of(self.days, {*fields, *rule_set.hourly_variables, *rule_set.daily_variables})
+
+DEFAULT_OPTIONS = ReportOptions()
+
+def visible_series(table: Optional[SeriesTable], fields: Tuple[str, ...]) -> Optional[SeriesTable]:
+    # Series fetched only for the analyzers are not sent.
+    if table is None or not fields:
+        return table
+    table = table.select(fields)
+    return table if table.columns else None
+
+async def analyze_forecast(
+    forecast: Forecast,
+    service: OpenMeteoService,
+    agronomic_service: AgronomicLogic,
+    options: ReportOptions = DEFAULT_OPTIONS
+) -> Tuple[DailyResults, DailyResults]:
+    """Tips and diagnostics for a forecast, memoized by forecast content, rule-set version and options."""
+    content_hash = forecast.content_hash
+    key = f"{content_hash}:{agronomic_service.rule_set.version}" if content_hash else None
+    if key and options != DEFAULT_OPTIONS:
+        key += f":{options.days}:{','.join(options.phases)}"
+
+    if key:
+        cached = await service.analysis_cache.get(key)
+        if cached is not None:
+            return cached["tips"], cached["diagnostics"]
+
+    with timed("analysis"):
+        tips, diagnostics = agronomic_service.analyze(
+            forecast.current_weather, forecast.daily, forecast.hourly, options.days, options.phases
+        )
+
+    if key:
+        await service.analysis_cache.set(key, {"tips": tips, "diagnostics": diagnostics})
+
+    return tips, diagnostics
+
+async def build_weather_report(
+    coordinates: Coordinates,
+    forecast: Forecast,
+    service: OpenMeteoService,
+    agronomic_service: AgronomicLogic,
+    options: ReportOptions = DEFAULT_OPTIONS
+) -> Dict[str, Any]:
+    """WeatherResponse fields, with daily/hourly still as the forecast's SeriesTables.
+
+    The series were typed once when the forecast was parsed; the report is either
+    encoded straight from those arrays or turned into a WeatherResponse.
+    """
+    tips, diagnostics = await analyze_forecast(forecast, service, agronomic_service, options)
+
+    daily = visible_series(forecast.daily, options.fields)
+    hourly = visible_series(forecast.hourly, options.fields)
+
+    current_weather = forecast.current_weather
+    return {
+        "city": coordinates.name,
+        "country": coordinates.country,
+        "state": coordinates.state,
+        "latitude": coordinates.latitude,
+        "longitude": coordinates.longitude,
+        "grid_cell": service.grid_cell(coordinates.latitude, coordinates.longitude).model_dump(),
+        "weather": current_weather,
+        "condition_description": get_weather_description(current_weather.get("weathercode", 0)),
+        "daily": daily,
+        "hourly": hourly,
+        "weather_descriptions": forecast.descriptions,
+        "agronomic_tips": tips,
+        "diagnostics": diagnostics,
+        "stale": forecast.stale
+    }
+
+def weather_response(report: Dict[str, Any]) -> WeatherResponse:
+    daily, hourly = report["daily"], report["hourly"]
+    with timed("validation"):
+        return WeatherResponse(**{
+            **report,
+            "daily": daily.to_block() if daily is not None else None,
+            "hourly": hourly.to_block() if hourly is not None else None
+        })
+
+def encode_weather_report(report: Dict[str, Any]) -> bytes:
+    """JSON body for a report.
+
+    With the orjson encoder the float arrays are written directly (NaN as null)
+    and no per-value Python objects are created; otherwise the report is
+    validated into a WeatherResponse and dumped by pydantic.
+    """
+    if settings.JSON_ENCODER == "orjson":
+        daily, hourly = report["daily"], report["hourly"]
+        with timed("serialization"):
+            return encode_json({
+                **report,
+                "daily": daily.to_json_content() if daily is not None else None,
+                "hourly": hourly.to_json_content() if hourly is not None else None
+            })
+    # exclude_unset leaves out the series a client did not ask for, as the orjson path does.
+    response = weather_response(report)
+    with timed("serialization"):
+        return response.model_dump_json(exclude_unset=True).encode("utf-8")
+
+async def build_weather_response(
+    coordinates: Coordinates,
+    forecast: Forecast,
+    service: OpenMeteoService,
+    agronomic_service: AgronomicLogic
+) -> WeatherResponse:
+    return weather_response(await build_weather_report(coordinates, forecast, service, agronomic_service))
+
+def response_etag(
+    coordinates: Coordinates,
+    forecast: Forecast,
+    agronomic_service: AgronomicLogic,
+    options: ReportOptions = DEFAULT_OPTIONS
+) -> Optional[str]:
+    if not forecast.content_hash:
+        return None
+    identity = f"{coordinates.model_dump_json()}|{forecast.content_hash}|{agronomic_service.rule_set.version}|{options.key}|{forecast.stale}"
+    return '"' + hashlib.blake2b(identity.encode("utf-8"), digest_size=16).hexdigest() + '"'
+
+async def encoded_weather_response(
+    etag: str,
+    coordinates: Coordinates,
+    forecast: Forecast,
+    service: OpenMeteoService,
+    agronomic_service: AgronomicLogic,
+    options: ReportOptions = DEFAULT_OPTIONS
+) -> bytes:
+    """JSON body for a (city, forecast version, options), encoded once and then served from memory."""
+    body = await service.encoded_response_cache.get(etag)
+    if body is None:
+        report = await build_weather_report(coordinates, forecast, service, agronomic_service, options)
+        body = encode_weather_report(report)
+        await service.encoded_response_cache.set(etag, body)
+    return body
+
+def build_current_report(
+    coordinates: Coordinates,
+    forecast: Forecast,
+    service: OpenMeteoService,
+    agronomic_service: AgronomicLogic
+) -> Dict[str, Any]:
+    """CurrentConditionsResponse fields: current weather and today's current-condition rules only."""
+    current_weather = forecast.current_weather
+    with timed("analysis"):
+        tips, diagnostics = agronomic_service.analyze_current(current_weather)
+    return {
+        "city": coordinates.name,
+        "country": coordinates.country,
+        "state": coordinates.state,
+        "latitude": coordinates.latitude,
+        "longitude": coordinates.longitude,
+        "grid_cell": service.grid_cell(coordinates.latitude, coordinates.longitude).model_dump(),
+        "weather": current_weather,
+        "condition_description": get_weather_description(current_weather.get("weathercode", 0)),
+        "agronomic_tips": tips,
+        "diagnostics": diagnostics
+    }
+
+def encode_current_report(report: Dict[str, Any]) -> bytes:
+    if settings.JSON_ENCODER == "orjson":
+        with timed("serialization"):
+            return encode_json(report)
+    with timed("validation"):
+        response = CurrentConditionsResponse(**report)
+    with timed("serialization"):
+        return response.model_dump_json().encode("utf-8")
@@ -0,0 +1,39 @@
+import math
+from schemas import DailyWeather, HourlyWeather
+from services.agronomic.features import DayFeatures
+
+def make_hourly(temperatures, moisture):
+    hours = len(temperatures)
+    return HourlyWeather(
+        time=["2023-10-01T00:00"] * hours, temperature_2m=temperatures, relativehumidity_2m=[50] * hours,
+        windspeed_10m=[5] * hours, weathercode=[0] * hours, soil_moisture_0_to_1cm=moisture,
+        soil_moisture_27_to_81cm=moisture, weather_description=["Clear"] * hours
+    )
+
+def test_per_day_aggregates_for_all_days():
+    temperatures = [float(hour % 24) for hour in range(48)]
+    hourly = make_hourly(temperatures, [0.3] * 48)
+    daily = DailyWeather(
+        time=["2023-10-01", "2023-10-02"], precipitation_sum=[1, None], et0_fao_evapotranspiration=[0, 0],
+        shortwave_radiation_sum=[20, 10], weathercode=[0, 0], weather_description=["Clear", "Clear"]
+    )
+
+    features = DayFeatures(daily, hourly, days=3)
+
+    assert features.temp_min.tolist()[:2] == [0.0, 0.0]
+    assert features.temp_max.tolist()[:2] == [23.0, 23.0]
+    assert features.temp_mean[0] == sum(range(24)) / 24
+    assert math.isnan(features.temp_max[2])
+    assert math.isnan(features.rain[1])
+
+def test_noon_value_skips_missing_hours():
+    moisture = [None, None] + [0.01 * hour for hour in range(2, 24)]
+    features = DayFeatures(None, make_hourly([20.0] * 24, moisture), days=1)
+
+    # The 13th valid reading of the day, as the per-day list slices picked it.
+    assert features.surface_moisture[0] == 0.14
+
+def test_noon_value_falls_back_to_first_reading():
+    features = DayFeatures(None, make_hourly([20.0] * 5, [0.2, 0.3, 0.4, 0.5, 0.6]), days=1)
+
+    assert features.surface_moisture[0] == 0.2
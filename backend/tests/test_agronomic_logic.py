@@ -116,3 +116,97 @@ def test_generate_tips_ripening_rain(agronomic_logic):
     ripening_tips = tips[0]["ripening"]
     
     assert any("Suspender Colheita" in t["message"] for t in ripening_tips)
+
+NORMAL_TIP = "✅ Condições Normais: Monitoramento de rotina."
+
+# Expected results recorded from the original per-phase implementation, before the rule table.
+ANALYZE_CASES = {
+    "hot_rainy": (
+        {"temperature": 15, "windspeed": 12},
+        dict(time=["2023-10-01"], precipitation_sum=[35], et0_fao_evapotranspiration=[0],
+             shortwave_radiation_sum=[10], weathercode=[0], weather_description=["Rain"]),
+        dict(time=["2023-10-01T00:00"], temperature_2m=[36], relativehumidity_2m=[80],
+             windspeed_10m=[5], weathercode=[0], soil_moisture_0_to_1cm=[0.1],
+             soil_moisture_27_to_81cm=[0.2], weather_description=["Rain"]),
+        [{
+            "sprouting": [
+                "⚠️ Emergência Lenta: Solo frio atrasa a brotação. Monitore falhas.",
+                "💧 Risco de Falha: Solo seco. Irrigação de salvamento necessária.",
+                "🚀 Condições Ótimas: Calor e umidade favorecem emergência rápida."
+            ],
+            "growth": [
+                "🔥 Alerta de Respiração: Altas temperaturas consomem sacarose.",
+                "☁️ Baixa Fotossíntese: Dias nublados reduzem o crescimento.",
+                "📉 Perda de TCH: Déficit hídrico gera colmos curtos.",
+                "🚫 Parar Pulverização: Vento forte. Risco de deriva."
+            ],
+            "ripening": ["🛑 Suspender Colheita: Chuva inverte sacarose e compacta solo."]
+        }],
+        [{
+            "sprouting": [("Emergência Lenta", "warning"), ("Risco de Falha", "danger")],
+            "growth": [
+                ("Quebra de TCH", "danger"), ("Estresse Térmico", "warning"),
+                ("Baixa Fotossíntese", "warning"), ("Parar Pulverização", "danger")
+            ],
+            "ripening": [("Queda de ATR", "danger")]
+        }]
+    ),
+    "dry_windy_two_days": (
+        {"temperature": 31, "windspeed": 25},
+        dict(time=["2023-08-01", "2023-08-02"], precipitation_sum=[0, 2], et0_fao_evapotranspiration=[6.5, 5.8],
+             shortwave_radiation_sum=[24, 22], weathercode=[0, 1], weather_description=["Clear", "Mainly clear"]),
+        dict(time=[f"2023-08-0{day}T{hour:02d}:00" for day in (1, 2) for hour in (0, 12)],
+             temperature_2m=[14, 33, 17, 35], relativehumidity_2m=[45, 20, 60, 25],
+             windspeed_10m=[10, 28, 8, 22], weathercode=[0, 0, 1, 1], soil_moisture_0_to_1cm=[0.08, 0.05, 0.1, 0.07],
+             soil_moisture_27_to_81cm=[0.12, 0.11, 0.15, 0.14], weather_description=["Clear"] * 4),
+        [
+            {
+                "sprouting": ["💧 Risco de Falha: Solo seco. Irrigação de salvamento necessária."],
+                "growth": [
+                    "📉 Perda de TCH: Déficit hídrico gera colmos curtos.",
+                    "🚫 Parar Pulverização: Vento forte. Risco de deriva."
+                ],
+                "ripening": ["💰 Pico de Açúcar: Amplitude térmica favorece acúmulo de ATR."]
+            },
+            {"sprouting": [NORMAL_TIP], "growth": [NORMAL_TIP], "ripening": [NORMAL_TIP]}
+        ],
+        [
+            {
+                "sprouting": [("Risco de Falha", "danger")],
+                "growth": [("Quebra de TCH", "danger"), ("Parar Pulverização", "danger")],
+                "ripening": [("Pico de Sacarose", "success")]
+            },
+            {phase: [("Condições Normais", "success")] for phase in ("sprouting", "growth", "ripening")}
+        ]
+    ),
+    "mild_humid": (
+        {"temperature": 24, "windspeed": 5},
+        dict(time=["2023-12-01"], precipitation_sum=[8], et0_fao_evapotranspiration=[3.5],
+             shortwave_radiation_sum=[18], weathercode=[61], weather_description=["Rain"]),
+        dict(time=["2023-12-01T00:00", "2023-12-01T12:00"], temperature_2m=[21, 27], relativehumidity_2m=[95, 85],
+             windspeed_10m=[4, 6], weathercode=[61, 61], soil_moisture_0_to_1cm=[0.4, 0.38],
+             soil_moisture_27_to_81cm=[0.35, 0.36], weather_description=["Rain"] * 2),
+        [{"sprouting": [NORMAL_TIP], "growth": [NORMAL_TIP], "ripening": [NORMAL_TIP]}],
+        [{
+            "sprouting": [("Condições Ideais", "success")],
+            "growth": [("Condições Normais", "success")],
+            "ripening": [("Condições Normais", "success")]
+        }]
+    )
+}
+
+@pytest.mark.parametrize("case", ANALYZE_CASES)
+def test_analyze_matches_recorded_tips_and_diagnostics(agronomic_logic, case):
+    current_weather, daily, hourly, expected_tips, expected_diagnostics = ANALYZE_CASES[case]
+
+    tips, diagnostics = agronomic_logic.analyze(current_weather, DailyWeather(**daily), HourlyWeather(**hourly))
+
+    # Days without data get the normal-conditions entry, up to the 7-day forecast.
+    normal = {"sprouting": [NORMAL_TIP], "growth": [NORMAL_TIP], "ripening": [NORMAL_TIP]}
+    expected_tips = expected_tips + [normal] * (7 - len(expected_tips))
+    assert [{phase: [tip["message"] for tip in day[phase]] for phase in day} for day in tips] == expected_tips
+    assert [
+        {phase: [(item["title"], item["type"]) for item in day[phase]] for phase in day}
+        for day in diagnostics[:len(expected_diagnostics)]
+    ] == expected_diagnostics
+    assert len(diagnostics) == 7
@@ -0,0 +1,71 @@
+import pytest
+from schemas import HourlyWeather
+from services.agronomic import AgronomicLogic
+from services.agronomic.rules import RuleSet, get_rule_set
+
+def make_definition(rules):
+    return {
+        "version": "test",
+        "phases": ["growth"],
+        "defaults": {
+            "tips": {"message": "ok", "type": "success"},
+            "diagnostics": {"title": "ok", "message": "ok", "type": "success"}
+        },
+        "rules": rules
+    }
+
+HOT_FORECAST = {
+    "id": "growth.tips.hot_forecast", "phase": "growth", "output": "tips", "when": "forecast",
+    "conditions": [["temp_max", ">", 33]],
+    "message": "Calor previsto", "type": "warning"
+}
+
+def test_rules_are_data_not_code():
+    rule_set = RuleSet(make_definition([HOT_FORECAST]), "test")
+    hourly = HourlyWeather(
+        time=["t"] * 48, temperature_2m=[34] * 48, relativehumidity_2m=[50] * 48,
+        windspeed_10m=[5] * 48, weathercode=[0] * 48, soil_moisture_0_to_1cm=[0.3] * 48,
+        soil_moisture_27_to_81cm=[0.3] * 48, weather_description=["Clear"] * 48
+    )
+
+    tips, diagnostics = AgronomicLogic(rule_set).analyze({}, None, hourly)
+
+    assert tips[0]["growth"] == [{"message": "ok", "type": "success"}]
+    assert tips[1]["growth"] == [{"message": "Calor previsto", "type": "warning"}]
+    assert diagnostics[1]["growth"][0]["title"] == "ok"
+
+def test_unknown_feature_is_rejected_at_compile_time():
+    rule = dict(HOT_FORECAST, conditions=[["leaf_wetness", ">", 1]])
+
+    with pytest.raises(ValueError, match="unknown feature"):
+        RuleSet(make_definition([rule]), "test")
+
+def test_duplicate_rule_ids_are_rejected():
+    with pytest.raises(ValueError, match="duplicate id"):
+        RuleSet(make_definition([HOT_FORECAST, dict(HOT_FORECAST, when="today")]), "test")
+
+def test_rule_set_without_rules_evaluates_to_defaults():
+    tips, diagnostics = RuleSet(make_definition([]), "test").evaluate({}, 2)
+
+    assert tips == [{"growth": [{"message": "ok", "type": "success"}]}] * 2
+    assert diagnostics[0]["growth"][0]["title"] == "ok"
+
+def test_identical_conditions_are_evaluated_once():
+    rule_set = get_rule_set()
+
+    # "temp_max > 35" drives both the growth tip and the growth diagnostic.
+    assert rule_set._condition_count < rule_set._incidence.sum()
+
+def test_rule_set_version_tracks_content():
+    assert get_rule_set().version.startswith("2024.1-")
+
+def test_phase_subset_only_reads_its_own_series():
+    rule_set = get_rule_set()
+    ripening = rule_set.for_phases(["ripening"])
+
+    assert ripening.phases == ["ripening"]
+    assert ripening.hourly_variables == ("soil_moisture_0_to_1cm", "temperature_2m")
+    assert ripening.daily_variables == ("precipitation_sum",)
+    assert rule_set.for_phases(["ripening"]) is ripening
+    with pytest.raises(ValueError, match="Unknown phases"):
+        rule_set.for_phases(["flowering"])
@@ -2,6 +2,7 @@ from fastapi.testclient import TestClient
 from main import app
 from unittest.mock import patch, AsyncMock
 from schemas import Coordinates
+from services.forecast import Forecast
 
 client = TestClient(app)
 
@@ -38,7 +39,7 @@ MOCK_WEATHER_DATA = {
 @patch("services.open_meteo.OpenMeteoService.get_weather", new_callable=AsyncMock)
 def test_get_weather_success(mock_get_weather, mock_get_coordinates):
     mock_get_coordinates.return_value = MOCK_COORDINATES
-    mock_get_weather.return_value = MOCK_WEATHER_DATA
+    mock_get_weather.return_value = Forecast.from_payload(MOCK_WEATHER_DATA)
 
     response = client.get("/weather/Ribeirão Preto")
     
@@ -0,0 +1,124 @@
+from datetime import date, timedelta
+import httpx
+import numpy as np
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from benchmarks.mock_open_meteo import mock_transport
+from config import settings
+from main import app
+from routers.archive import get_archive_store
+from routers.weather import get_open_meteo_service
+from schemas import GridCell
+from services.archive import ArchiveStore, day_number, parse_archive_payload, rolling_sums
+from services.open_meteo import OpenMeteoService
+
+CELL = GridCell(key="-21.2000,-47.8000", latitude=-21.2, longitude=-47.8, resolution="0.1deg")
+
+def daily_payload(start: date, days: int, t_max: float = 30.0, t_min: float = 16.0, rain: float = 2.0, et0: float = 4.0) -> dict:
+    return {
+        "latitude": -21.2, "longitude": -47.8,
+        "daily": {
+            "time": [(start + timedelta(days=day)).isoformat() for day in range(days)],
+            "temperature_2m_max": [t_max] * days,
+            "temperature_2m_min": [t_min] * days,
+            "temperature_2m_mean": [(t_max + t_min) / 2] * days,
+            "precipitation_sum": [rain] * days,
+            "et0_fao_evapotranspiration": [et0] * days,
+            "shortwave_radiation_sum": [20.0] * days
+        }
+    }
+
+def test_hourly_payload_is_rolled_up_into_days():
+    hourly = {
+        "time": [f"2024-01-0{day}T{hour:02d}:00" for day in (1, 2) for hour in range(24)],
+        "temperature_2m": [20.0 + hour for hour in range(24)] * 2,
+        "precipitation": [0.5] * 48,
+        "shortwave_radiation": [100.0] * 48
+    }
+    hourly["temperature_2m"][30] = None
+    rows = parse_archive_payload({"hourly": hourly})
+
+    assert rows.days.tolist() == [day_number(date(2024, 1, 1)), day_number(date(2024, 1, 2))]
+    assert rows.columns["t_max"].tolist() == [43.0, 43.0]
+    assert rows.columns["t_min"].tolist() == [20.0, 20.0]
+    assert rows.columns["precipitation"].tolist() == [12.0, 12.0]
+    assert rows.columns["radiation"] == pytest.approx([8.64, 8.64])
+    assert np.isnan(rows.columns["et0"]).all()
+
+    with pytest.raises(ValueError):
+        parse_archive_payload({"latitude": -21.2})
+
+def test_rolling_sums_cover_each_full_window():
+    assert rolling_sums(np.array([1.0, 2.0, np.nan, 4.0]), 2).tolist() == [3.0, 2.0, 4.0]
+
+@pytest.mark.asyncio
+async def test_accumulation_uses_running_totals_across_overlapping_ingests(tmp_path):
+    store = ArchiveStore(str(tmp_path / "archive.sqlite3"), base_temperature=10.0)
+    await store.ingest(CELL, "Ribeirão Preto", parse_archive_payload(daily_payload(date(2024, 1, 1), 10)))
+    # Re-ingests days 6-10 with other values and adds days 11-20, after a gap on days 21-22.
+    await store.ingest(CELL, "Ribeirão Preto", parse_archive_payload(daily_payload(date(2024, 1, 6), 15, rain=0.0)))
+    await store.ingest(CELL, "Ribeirão Preto", parse_archive_payload(daily_payload(date(2024, 1, 23), 5)))
+
+    totals = await store.accumulate(CELL.key, date(2024, 1, 3), date(2024, 1, 25))
+    # 23 calendar days, 21 of them archived: (30 + 16) / 2 - 10 = 13 degree-days each.
+    assert totals["days"] == 23 and totals["missing_days"] == 2
+    assert totals["degree_days"] == pytest.approx(21 * 13)
+    assert totals["precipitation"] == pytest.approx(3 * 2.0 + 3 * 2.0)
+    assert totals["et0"] == pytest.approx(21 * 4.0)
+
+    other_base = await store.accumulate(CELL.key, date(2024, 1, 3), date(2024, 1, 25), base_temperature=20.0)
+    assert other_base["degree_days"] == pytest.approx(21 * 3)
+    assert await store.accumulate(CELL.key, date(2023, 1, 1), date(2023, 12, 31)) is None
+
+    [location] = await store.locations()
+    assert location["days"] == 25 and location["last_day"] == date(2024, 1, 27)
+    store.close()
+
+@pytest.fixture
+def client(tmp_path):
+    service = OpenMeteoService(httpx.AsyncClient(transport=mock_transport()))
+    store = ArchiveStore(str(tmp_path / "archive.sqlite3"), base_temperature=10.0)
+    app.dependency_overrides[get_open_meteo_service] = lambda: service
+    app.dependency_overrides[get_archive_store] = lambda: store
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+    store.close()
+
+def test_ingest_then_query_a_season(client):
+    response = client.post("/archive/ingest", json={
+        "location": {"city": "Cidade Inventada"}, "start_date": "2023-10-01", "end_date": "2024-03-31"
+    })
+    assert response.status_code == 200
+    assert response.json()["ingested_days"] == 183
+
+    season = client.get("/archive/Cidade Inventada/accumulation", params={"start_date": "2023-10-01", "end_date": "2024-03-31"})
+    assert season.status_code == 200
+    body = season.json()
+    assert body["days"] == 183 and body["missing_days"] == 0
+    assert body["degree_days"] > 0 and body["et0_mm"] > 0
+    assert body["water_balance_mm"] == pytest.approx(body["precipitation_mm"] - body["et0_mm"], abs=0.02)
+
+    rolling = client.get(
+        "/archive/Cidade Inventada/rolling", params={"start_date": "2023-10-07", "end_date": "2023-10-31", "window": 7}
+    ).json()
+    assert len(rolling["time"]) == 25 and rolling["time"][0] == "2023-10-07"
+    week = client.get("/archive/Cidade Inventada/accumulation", params={"start_date": "2023-10-01", "end_date": "2023-10-07"}).json()
+    assert rolling["et0_mm"][0] == pytest.approx(week["et0_mm"], abs=0.02)
+
+    assert client.get("/archive/locations").json()[0]["days"] == 183
+    assert client.get("/archive/Outra Cidade/accumulation", params={"start_date": "2023-10-01", "end_date": "2023-10-02"}).status_code == 404
+
+def test_import_payload_and_reject_bad_ranges(client):
+    imported = client.post("/archive/import", params={"name": "Fazenda"}, json=daily_payload(date(2024, 1, 1), 3))
+    assert imported.status_code == 200
+    assert imported.json()["location"]["label"] == "Fazenda"
+
+    assert client.post("/archive/import", json={"latitude": -21.2, "longitude": -47.8}).status_code == 422
+    with patch.object(settings, "ARCHIVE_MAX_DAYS", 2):
+        too_long = client.post("/archive/import", json=daily_payload(date(2024, 1, 1), 3))
+    assert too_long.status_code == 422
+    assert too_long.json()["detail"] == "Date range is limited to 2 days"
+    assert client.post("/archive/ingest", json={
+        "location": {"city": "Cidade Inventada"}, "start_date": "2024-02-01", "end_date": "2024-01-01"
+    }).status_code == 422
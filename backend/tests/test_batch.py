@@ -0,0 +1,185 @@
+import asyncio
+import json
+import httpx
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from main import app
+from schemas import BatchLocation
+from routers.weather import get_open_meteo_service
+from services.agronomic import AgronomicLogic
+from services.batch import stream_batch
+from services.open_meteo import OpenMeteoService
+
+def forecast_payload(temperature):
+    return {
+        "current_weather": {"temperature": temperature, "windspeed": 5, "weathercode": 0},
+        "hourly": {
+            "time": ["2023-10-01T00:00"], "temperature_2m": [temperature], "relativehumidity_2m": [60],
+            "windspeed_10m": [5], "weathercode": [0], "soil_moisture_0_to_1cm": [0.3],
+            "soil_moisture_27_to_81cm": [0.3]
+        },
+        "daily": {
+            "time": ["2023-10-01"], "precipitation_sum": [0], "et0_fao_evapotranspiration": [4],
+            "shortwave_radiation_sum": [20], "weathercode": [0]
+        }
+    }
+
+def make_service(forecast_requests):
+    def handler(request: httpx.Request) -> httpx.Response:
+        if "search" in request.url.path:
+            return httpx.Response(200, json={})
+        forecast_requests.append(request.url.params["latitude"])
+        latitudes = request.url.params["latitude"].split(",")
+        payloads = [forecast_payload(25 + i) for i in range(len(latitudes))]
+        return httpx.Response(200, json=payloads if len(payloads) > 1 else payloads[0])
+
+    return OpenMeteoService(httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+
+def test_batch_returns_per_location_results_from_one_upstream_call():
+    forecast_requests = []
+    service = make_service(forecast_requests)
+    app.dependency_overrides[get_open_meteo_service] = lambda: service
+
+    try:
+        response = TestClient(app).post("/weather/batch", json={"locations": [
+            {"city": "Ribeirão Preto, SP"},
+            {"latitude": -22.72, "longitude": -47.65, "name": "Fazenda Boa Vista"},
+            {"city": "Cidade Inexistente"}
+        ]})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [result["status"] for result in results] == [200, 200, 404]
+    assert results[0]["data"]["city"] == "Ribeirão Preto"
+    assert results[1]["data"]["city"] == "Fazenda Boa Vista"
+    assert results[2]["error"] == "City not found"
+    assert len(forecast_requests) == 1
+
+@pytest.mark.parametrize("location", [{"latitude": 95, "longitude": -47.65}, {"latitude": -22.72, "longitude": 400}])
+def test_batch_rejects_coordinates_out_of_range(location):
+    response = TestClient(app).post("/weather/batch", json={"locations": [location]})
+    assert response.status_code == 422
+
+@pytest.mark.asyncio
+async def test_a_point_off_the_grid_fails_only_its_own_location():
+    service = make_service([])
+    missing, forecast = await service.get_weather_many([(1e308, 0.0), (-22.72, -47.65)])
+
+    assert isinstance(missing, HTTPException) and missing.status_code == 422
+    assert forecast.current_weather["temperature"] == 25
+
+def test_batch_requires_city_or_coordinates():
+    response = TestClient(app).post("/weather/batch", json={"locations": [{"latitude": -22.72}]})
+
+    assert response.status_code == 422
+
+def test_batch_stream_emits_one_ndjson_line_per_location():
+    service = make_service([])
+    app.dependency_overrides[get_open_meteo_service] = lambda: service
+
+    try:
+        response = TestClient(app).post("/weather/batch/stream", json={"locations": [
+            {"latitude": -21.18, "longitude": -47.81},
+            {"latitude": -22.72, "longitude": -47.65}
+        ]})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(line["index"] for line in lines) == [0, 1]
+    assert all(line["status"] == 200 for line in lines)
+
+def test_batch_stream_sse_format():
+    service = make_service([])
+    app.dependency_overrides[get_open_meteo_service] = lambda: service
+
+    try:
+        response = TestClient(app).post(
+            "/weather/batch/stream",
+            params={"format": "sse"},
+            json={"locations": [{"latitude": -21.18, "longitude": -47.81}]}
+        )
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.text.count("event: result") == 1
+    assert response.text.endswith("event: end\ndata: {}\n\n")
+
+@pytest.mark.asyncio
+async def test_short_multi_location_answer_fails_only_the_missing_cells():
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json=[forecast_payload(25)])
+
+    service = OpenMeteoService(httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    forecast, missing = await service.get_weather_many([(-21.18, -47.81), (-22.72, -47.65)])
+
+    assert forecast.current_weather["temperature"] == 25
+    assert isinstance(missing, HTTPException) and missing.status_code == 502
+
+@pytest.mark.asyncio
+async def test_batch_joins_a_forecast_already_in_flight():
+    requested = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requested.extend(request.url.params["latitude"].split(","))
+        await asyncio.sleep(0.01)
+        latitudes = request.url.params["latitude"].split(",")
+        payloads = [forecast_payload(25) for _ in latitudes]
+        return httpx.Response(200, json=payloads if len(payloads) > 1 else payloads[0])
+
+    service = OpenMeteoService(httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    single = asyncio.create_task(service.get_weather(-21.18, -47.81))
+    await asyncio.sleep(0)
+    batch = await service.get_weather_many([(-21.18, -47.81), (-22.72, -47.65)])
+
+    assert await single is batch[0]
+    assert sorted(requested) == ["-21.2", "-22.7"]
+
+@pytest.mark.asyncio
+async def test_stream_emits_a_located_point_while_geocoding_is_still_pending():
+    geocoded = asyncio.Event()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if "search" in request.url.path:
+            await geocoded.wait()
+            return httpx.Response(200, json={})
+        return httpx.Response(200, json=forecast_payload(25))
+
+    service = OpenMeteoService(httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    stream = stream_batch([
+        BatchLocation(city="Cidade Demorada"),
+        BatchLocation(latitude=-22.72, longitude=-47.65, name="Fazenda Boa Vista")
+    ], service, AgronomicLogic())
+
+    first = await asyncio.wait_for(stream.__anext__(), 1)
+    assert first.index == 1 and first.status == 200
+    geocoded.set()
+    second = await stream.__anext__()
+    assert second.index == 0 and second.status == 404
+    await stream.aclose()
+
+def test_stream_ends_when_a_location_cannot_be_placed_on_the_grid():
+    def handler(request: httpx.Request) -> httpx.Response:
+        if "search" in request.url.path:
+            return httpx.Response(200, json={"results": [{"name": "Lugar Nenhum", "latitude": 1e308, "longitude": 0}]})
+        return httpx.Response(200, json=forecast_payload(25))
+
+    service = OpenMeteoService(httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    app.dependency_overrides[get_open_meteo_service] = lambda: service
+
+    try:
+        response = TestClient(app).post("/weather/batch/stream", json={"locations": [
+            {"city": "Lugar Nenhum"}, {"latitude": -22.72, "longitude": -47.65}
+        ]})
+    finally:
+        app.dependency_overrides.clear()
+
+    results = sorted((json.loads(line) for line in response.text.splitlines()), key=lambda result: result["index"])
+    assert [result["status"] for result in results] == [422, 200]
+    assert results[0]["error"].startswith("Invalid coordinates")
@@ -0,0 +1,168 @@
+import asyncio
+import time
+import httpx
+import pytest
+from unittest.mock import patch
+from services.cache import CacheNamespace, MemoryCacheBackend, SQLiteCacheBackend, ValueCodec
+from services.open_meteo import OpenMeteoService
+from config import settings
+
+GEOCODING_PAYLOAD = {
+    "results": [{"name": "Lisboa", "latitude": 38.72, "longitude": -9.14, "country": "Portugal", "admin1": "Lisboa"}]
+}
+
+def make_service(calls):
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        if "search" in request.url.path:
+            return httpx.Response(200, json=GEOCODING_PAYLOAD)
+        return httpx.Response(200, json={"current_weather": {"temperature": 25}})
+
+    return OpenMeteoService(httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, tmp_path):
+    if request.param == "sqlite":
+        return SQLiteCacheBackend(str(tmp_path / "cache.sqlite3"))
+    return MemoryCacheBackend()
+
+@pytest.mark.asyncio
+async def test_get_or_fetch_stores_awaited_result(backend):
+    namespace = CacheNamespace(backend, "test", maxsize=10, ttl=60)
+
+    async def fetch():
+        return {"value": 1}
+
+    assert await namespace.get_or_fetch("key", fetch) == {"value": 1}
+    assert await namespace.get_or_fetch("key", fetch) == {"value": 1}
+    assert namespace.stats()["hits"] == 1
+    assert namespace.stats()["misses"] == 1
+
+@pytest.mark.asyncio
+async def test_eviction_counter():
+    namespace = CacheNamespace(MemoryCacheBackend(), "test", maxsize=2, ttl=60)
+    for key in range(3):
+        await namespace.set(str(key), key)
+
+    assert namespace.stats()["evictions"] == 1
+    assert namespace.stats()["size"] == 2
+
+@pytest.mark.asyncio
+async def test_service_caches_results_per_namespace():
+    calls = []
+    service = make_service(calls)
+
+    first = await service.get_coordinates("Lisboa")
+    second = await service.get_coordinates("lisboa ")
+    await service.get_weather(first.latitude, first.longitude)
+    await service.get_weather(first.latitude, first.longitude)
+
+    assert first == second
+    assert len(calls) == 2
+    stats = service.cache_stats()
+    assert stats["geocoding"]["hits"] == 1
+    assert stats["forecast"]["hits"] == 1
+
+@pytest.mark.asyncio
+async def test_sqlite_backend_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    writer = CacheNamespace(SQLiteCacheBackend(path), "forecast", maxsize=10, ttl=60)
+    reader = CacheNamespace(SQLiteCacheBackend(path), "forecast", maxsize=10, ttl=60)
+
+    await writer.set("-22.7200,-47.6500", {"hourly": {"temperature_2m": [25.0, None]}})
+
+    assert await reader.get("-22.7200,-47.6500") == {"hourly": {"temperature_2m": [25.0, None]}}
+    assert reader.stats()["size"] == 0
+    await reader.backend.purge()
+    assert reader.stats()["size"] == 1 and reader.stats()["stored_bytes"] > 0
+
+@pytest.mark.asyncio
+async def test_sqlite_purge_covers_namespaces_that_are_not_written(tmp_path):
+    backend = SQLiteCacheBackend(str(tmp_path / "cache.sqlite3"), purge_interval=0)
+    idle = CacheNamespace(backend, "geocoding", maxsize=10, ttl=0.01)
+    busy = CacheNamespace(backend, "forecast", maxsize=10, ttl=60)
+
+    await idle.set("lisboa", {"name": "Lisboa"})
+    await asyncio.sleep(0.02)
+    await busy.set("-22.7200,-47.6500", {"current_weather": {}})
+
+    assert idle.stats()["expirations"] == 1 and idle.stats()["size"] == 0
+    assert busy.stats()["size"] == 1
+
+@pytest.mark.asyncio
+async def test_codec_applies_only_to_serializing_backends(backend):
+    codec = ValueCodec(encode=lambda value: {"items": sorted(value)}, decode=lambda data: set(data["items"]))
+    namespace = CacheNamespace(backend, "test", maxsize=10, ttl=60, codec=codec)
+
+    await namespace.set("key", {"b", "a"})
+
+    assert await namespace.get("key") == {"a", "b"}
+    assert (namespace.codec is None) == backend.stores_objects
+
+@pytest.mark.asyncio
+async def test_stale_entries_are_served_while_revalidating_and_on_error(backend):
+    namespace = CacheNamespace(backend, "test", maxsize=10, ttl=60, stale_while_revalidate=60, stale_if_error=600)
+    values = iter([{"value": 1}, {"value": 2}])
+
+    async def fetch():
+        return next(values)
+
+    async def fail():
+        raise RuntimeError("upstream down")
+
+    now = time.time()
+    with patch("time.time", return_value=now):
+        assert await namespace.get_or_revalidate("key", fetch) == ({"value": 1}, False)
+    with patch("time.time", return_value=now + 90):
+        assert await namespace.get_or_revalidate("key", fetch) == ({"value": 1}, True)
+        await asyncio.gather(*namespace._revalidating.values())
+        assert await namespace.get_or_revalidate("key", fetch) == ({"value": 2}, False)
+    with patch("time.time", return_value=now + 90 + 300):
+        assert await namespace.get_or_revalidate("key", fail) == ({"value": 2}, True)
+    with patch("time.time", return_value=now + 90 + 700):
+        with pytest.raises(RuntimeError):
+            await namespace.get_or_revalidate("key", fail)
+
+    assert namespace.stats()["stale_hits"] == 1
+    assert namespace.stats()["stale_on_error"] == 1
+
+@pytest.mark.asyncio
+async def test_expired_forecast_is_flagged_stale_until_refreshed():
+    calls = []
+    service = make_service(calls)
+    first = await service.get_weather(-22.72, -47.65)
+
+    with patch("time.time", return_value=time.time() + settings.FORECAST_CACHE_TTL + 1):
+        stale = await service.get_weather(-22.72, -47.65)
+        await asyncio.gather(*service.forecast_cache._revalidating.values())
+        refreshed = await service.get_weather(-22.72, -47.65)
+
+    assert not first.stale
+    assert stale.stale and stale.current_weather == first.current_weather
+    assert not refreshed.stale
+    assert len(calls) == 2
+
+@pytest.mark.asyncio
+async def test_closing_the_service_cancels_background_revalidations():
+    started = asyncio.Event()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if started.is_set():
+            started.clear()
+            await asyncio.sleep(10)
+        return httpx.Response(200, json={"current_weather": {"temperature": 25}})
+
+    service = OpenMeteoService(httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    await service.get_weather(-22.72, -47.65)
+    started.set()
+    with patch("time.time", return_value=time.time() + settings.FORECAST_CACHE_TTL + 1):
+        await service.get_weather(-22.72, -47.65)
+    [revalidation] = service.forecast_cache._revalidating.values()
+    await asyncio.sleep(0.01)
+
+    await service.aclose()
+
+    assert revalidation.cancelled()
+    assert service.forecast_cache._revalidating == {}
+    assert service.singleflight_stats()["forecast"]["in_flight"] == 0
+    assert service.client.is_closed
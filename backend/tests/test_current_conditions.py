@@ -0,0 +1,36 @@
+import httpx
+from fastapi.testclient import TestClient
+from main import app
+from routers.weather import get_open_meteo_service
+from services.open_meteo import OpenMeteoService
+
+def test_now_fetches_current_weather_only_and_runs_current_rules():
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.url.params)
+        return httpx.Response(200, json={"current_weather": {"temperature": 24.0, "windspeed": 14.0, "weathercode": 1}})
+
+    service = OpenMeteoService(httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    app.dependency_overrides[get_open_meteo_service] = lambda: service
+    client = TestClient(app)
+
+    try:
+        first = client.get("/weather/Piracicaba/now")
+        second = client.get("/weather/Piracicaba/now")
+    finally:
+        app.dependency_overrides.clear()
+
+    assert first.status_code == 200
+    assert len(requests) == 1
+    assert "hourly" not in requests[0] and "daily" not in requests[0]
+    assert requests[0]["forecast_days"] == "1"
+
+    data = first.json()
+    assert data["condition_description"] == "Principalmente Limpo"
+    assert data["diagnostics"]["growth"][0]["title"] == "Parar Pulverização"
+    assert data["diagnostics"]["sprouting"][0]["title"] == "Condições Ideais"
+    # Ripening has no rules on current conditions.
+    assert set(data["agronomic_tips"]) == {"sprouting", "growth"}
+    assert second.json() == data
+    assert service.cache_stats()["current"]["hits"] == 1
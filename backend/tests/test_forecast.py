@@ -0,0 +1,63 @@
+import math
+import numpy as np
+import orjson
+from services.forecast import Forecast, MISSING_CODE
+from services.serialization import encode_json
+
+PAYLOAD = {
+    "latitude": -21.2,
+    "timezone": "America/Sao_Paulo",
+    "current_weather": {"temperature": 25.0, "windspeed": 4.0, "weathercode": 2},
+    "hourly": {
+        "time": ["2024-10-01T00:00", "2024-10-01T01:00", "2024-10-01T02:00"],
+        "temperature_2m": [20.5, None, 22.0],
+        "relativehumidity_2m": [80, 75, 70],
+        "windspeed_10m": [3.0, 4.0, 5.0],
+        "weathercode": [0, None, 61],
+        "soil_moisture_0_to_1cm": [0.3, 0.3, 0.3],
+        "soil_moisture_27_to_81cm": [0.35, 0.35, 0.35]
+    },
+    "daily": {
+        "time": ["2024-10-01"],
+        "precipitation_sum": [1.5],
+        "et0_fao_evapotranspiration": [4.2],
+        "shortwave_radiation_sum": [18.0],
+        "weathercode": [61]
+    },
+    "content_hash": "abc"
+}
+
+def test_series_are_typed_columns():
+    forecast = Forecast.from_payload(PAYLOAD)
+
+    assert forecast.hourly.columns["temperature_2m"].dtype == np.float64
+    assert math.isnan(forecast.hourly.columns["temperature_2m"][1])
+    assert forecast.hourly.columns["weathercode"].dtype == np.int8
+    assert forecast.hourly.columns["weathercode"][1] == MISSING_CODE
+    assert math.isnan(forecast.hourly.column("weathercode")[1])
+    assert not forecast.hourly.columns["windspeed_10m"].flags.writeable
+    assert forecast.nbytes < 300
+
+def test_payload_round_trip_keeps_missing_values_and_time_strings():
+    forecast = Forecast.from_payload(PAYLOAD)
+
+    payload = forecast.to_payload()
+
+    assert payload["hourly"]["temperature_2m"] == [20.5, None, 22.0]
+    assert payload["hourly"]["weathercode"] == [0, None, 61]
+    assert payload["hourly"]["time"] == PAYLOAD["hourly"]["time"]
+    assert payload["daily"]["time"] == ["2024-10-01"]
+    assert payload["timezone"] == "America/Sao_Paulo"
+    assert payload["content_hash"] == "abc"
+
+def test_descriptions_cover_every_code_once():
+    forecast = Forecast.from_payload(PAYLOAD)
+
+    assert forecast.descriptions == {0: "Céu Limpo", 2: "Parcialmente Nublado", 61: "Chuva Fraca"}
+
+def test_json_content_matches_the_plain_block():
+    forecast = Forecast.from_payload(PAYLOAD)
+
+    encoded = orjson.loads(encode_json(forecast.hourly.to_json_content()))
+
+    assert encoded == forecast.hourly.to_block()
@@ -0,0 +1,41 @@
+import pytest
+from fastapi.testclient import TestClient
+from main import app
+from services.gazetteer import Gazetteer, normalize_name, parse_query
+
+ROWS = [
+    {"name": "Campo Grande", "state_code": "MS", "latitude": "-20.44278", "longitude": "-54.64639", "population": "786797"},
+    {"name": "Campo Grande", "state_code": "AL", "latitude": "-9.95528", "longitude": "-36.79306", "population": "9032"},
+    {"name": "Ribeirão Preto", "state_code": "SP", "latitude": "-21.1775", "longitude": "-47.81028", "population": "698642"},
+    {"name": "Ribeirão Pires", "state_code": "SP", "latitude": "-23.71056", "longitude": "-46.41333", "population": "113068"},
+]
+
+@pytest.fixture
+def gazetteer():
+    return Gazetteer(ROWS)
+
+def test_normalize_name_removes_accents_and_punctuation():
+    assert normalize_name("  Ribeirão  Preto ") == "ribeirao preto"
+    assert normalize_name("Santa Rita d'Oeste") == "santa rita d oeste"
+
+def test_parse_query_state_disambiguation():
+    assert parse_query("Campo Grande, AL") == ("campo grande", "AL")
+    assert parse_query("Campo Grande - Mato Grosso do Sul") == ("campo grande", "MS")
+    assert parse_query("Campo Grande") == ("campo grande", None)
+
+def test_lookup_prefers_most_populous_unless_state_given(gazetteer):
+    assert gazetteer.lookup("campo grande").state == "Mato Grosso do Sul"
+    assert gazetteer.lookup("Campo Grande/AL").latitude == -9.95528
+    assert gazetteer.lookup("ribeirao preto").name == "Ribeirão Preto"
+    assert gazetteer.lookup("Lisboa") is None
+
+def test_prefix_search(gazetteer):
+    results = gazetteer.search("ribeir")
+
+    assert [result.name for result in results] == ["Ribeirão Preto", "Ribeirão Pires"]
+
+def test_search_endpoint_uses_bundled_gazetteer():
+    response = TestClient(app).get("/cities/search", params={"q": "Piracicab"})
+
+    assert response.status_code == 200
+    assert response.json()[0]["name"] == "Piracicaba"
@@ -0,0 +1,32 @@
+from services.geo import geohash_encode, geohash_center, snap_to_grid
+
+def test_nearby_points_share_degree_cell():
+    farm_a = snap_to_grid(-21.1775, -47.8103, "degrees", 0.1, 5)
+    farm_b = snap_to_grid(-21.1790, -47.8080, "degrees", 0.1, 5)
+
+    assert farm_a.key == farm_b.key
+    assert (farm_a.latitude, farm_a.longitude) == (-21.2, -47.8)
+
+def test_zero_resolution_keeps_exact_coordinates():
+    cell = snap_to_grid(-21.1775, -47.8103, "degrees", 0, 5)
+
+    assert (cell.latitude, cell.longitude) == (-21.1775, -47.8103)
+    assert cell.resolution == "exact"
+
+def test_exact_cells_do_not_merge_points_equal_to_four_decimals():
+    first = snap_to_grid(-21.177512, -47.81028, "degrees", 0, 5)
+    second = snap_to_grid(-21.177549, -47.81028, "degrees", 0, 5)
+
+    assert first.key != second.key
+    assert first.key == "-21.177512,-47.81028"
+
+def test_geohash_roundtrip():
+    assert geohash_encode(57.64911, 10.40744, 11) == "u4pruydqqvj"
+    lat, lon = geohash_center("u4pruydqqvj")
+    assert abs(lat - 57.64911) < 1e-4 and abs(lon - 10.40744) < 1e-4
+
+def test_geohash_cell():
+    cell = snap_to_grid(-21.1775, -47.8103, "geohash", 0.1, 5)
+
+    assert cell.key == geohash_encode(-21.1775, -47.8103, 5)
+    assert cell.resolution == "geohash:5"
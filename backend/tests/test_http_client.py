@@ -0,0 +1,26 @@
+from fastapi.testclient import TestClient
+from main import app
+from config import settings
+from services.http_client import create_http_client, get_pool_stats
+
+def test_create_http_client_uses_settings():
+    client = create_http_client()
+
+    assert client.timeout.connect == settings.HTTP_CONNECT_TIMEOUT
+    assert client.timeout.read == settings.HTTP_TIMEOUT
+
+def test_pool_stats_empty_pool():
+    stats = get_pool_stats(create_http_client())
+
+    assert stats["connections"] == 0
+    assert stats["queued_requests"] == 0
+    assert stats["max_connections"] == settings.HTTP_MAX_CONNECTIONS
+
+def test_lifespan_shares_service_between_requests():
+    with TestClient(app) as client:
+        service = app.state.open_meteo_service
+        response = client.get("/stats/http")
+
+        assert response.status_code == 200
+        assert response.json()["connections"] == 0
+        assert app.state.open_meteo_service is service
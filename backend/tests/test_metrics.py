@@ -0,0 +1,36 @@
+import httpx
+from fastapi.testclient import TestClient
+from main import app
+from routers.weather import get_open_meteo_service
+from services.open_meteo import OpenMeteoService
+
+def sample(body: str, prefix: str) -> float:
+    return float(next(line for line in body.splitlines() if line.startswith(prefix)).rsplit(" ", 1)[1])
+
+def test_metrics_expose_stages_routes_upstream_and_caches():
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"current_weather": {"temperature": 24.0, "windspeed": 14.0, "weathercode": 1}})
+
+    service = OpenMeteoService(httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    app.dependency_overrides[get_open_meteo_service] = lambda: service
+    client = TestClient(app)
+
+    try:
+        before = client.get("/metrics").text
+        client.get("/weather/Piracicaba/now")
+        client.get("/weather/Piracicaba/now")
+        response = client.get("/metrics")
+    finally:
+        app.dependency_overrides.clear()
+
+    body = response.text
+    assert response.headers["content-type"].startswith("text/plain")
+
+    route = 'cana_http_request_duration_seconds_count{method="GET",route="/weather/{city_name}/now",status="200"}'
+    assert sample(body, route) - (sample(before, route) if route in before else 0) == 2
+    for stage in ("geocode", "forecast", "analysis", "serialization"):
+        assert f'cana_stage_duration_seconds_count{{stage="{stage}"}}' in body
+    assert sample(body, 'cana_upstream_responses_total{status="200",upstream="forecast"}') >= 1
+    assert sample(body, 'cana_cache_hits_total{namespace="current"}') == 1
+    assert sample(body, 'cana_circuit_state{upstream="forecast"}') == 0
+    assert "cana_http_requests_in_flight" in body
@@ -0,0 +1,35 @@
+import httpx
+import pytest
+from benchmarks.mock_open_meteo import mock_transport
+from services.forecast import ForecastSelection
+from services.open_meteo import OpenMeteoService
+
+@pytest.mark.asyncio
+async def test_service_runs_against_the_stand_in_with_deterministic_forecasts():
+    service = OpenMeteoService(httpx.AsyncClient(transport=mock_transport()))
+    other = OpenMeteoService(httpx.AsyncClient(transport=mock_transport()))
+
+    coordinates = await service.get_coordinates("Cidade Inventada")
+    forecast = await service.get_weather(coordinates.latitude, coordinates.longitude)
+    same = await other.get_weather(coordinates.latitude, coordinates.longitude)
+    trimmed = await service.get_weather(
+        coordinates.latitude, coordinates.longitude, ForecastSelection(3, ("temperature_2m",), ())
+    )
+
+    assert coordinates.name == "Cidade Inventada"
+    assert len(forecast.hourly) == 168 and len(forecast.daily) == 7
+    assert forecast.content_hash == same.content_hash
+    assert list(trimmed.hourly.columns) == ["temperature_2m"] and len(trimmed.hourly) == 72
+    assert trimmed.daily is None
+
+@pytest.mark.asyncio
+async def test_stand_in_injects_errors_and_answers_multi_coordinate_requests():
+    async with httpx.AsyncClient(transport=mock_transport(error_rate=1.0), base_url="http://mock") as failing:
+        response = await failing.get("/v1/forecast", params={"latitude": -21.2, "longitude": -47.8})
+    async with httpx.AsyncClient(transport=mock_transport(), base_url="http://mock") as client:
+        multi = await client.get("/v1/forecast", params={"latitude": "-21.2,-22.7", "longitude": "-47.8,-47.6"})
+        stats = (await client.get("/_stats")).json()
+
+    assert response.status_code == 503 and response.json()["error"] is True
+    assert [payload["latitude"] for payload in multi.json()] == [-21.2, -22.7]
+    assert stats["forecast"] == 1 and stats["locations"] == 2
@@ -0,0 +1,147 @@
+import asyncio
+import time
+import httpx
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from config import settings
+from main import app
+from routers.weather import get_open_meteo_service, get_prefetch_scheduler
+from schemas import GridCell
+from services.cache import ResponseCache, SQLiteCacheBackend
+from services.open_meteo import OpenMeteoService
+from services.prefetch import PrefetchScheduler, WatchRegistry
+
+def cell(key: str) -> GridCell:
+    lat, lon = map(float, key.split(","))
+    return GridCell(key=key, latitude=lat, longitude=lon, resolution="0.1deg")
+
+def test_registry_limits_size_and_expires_only_unpinned_idle_locations():
+    registry = WatchRegistry(max_locations=2, idle_ttl=100)
+    pinned = registry.watch(cell("-21.2000,-47.8000"), "Ribeirão Preto")
+    requested = registry.watch(cell("-22.7000,-47.6000"), "Piracicaba", pinned=False)
+
+    assert registry.watch(cell("-23.5000,-46.6000"), "São Paulo") is None
+    assert registry.watch(cell("-22.7000,-47.6000"), "Piracicaba", pinned=False) is requested
+
+    now = requested.last_requested + 101
+    assert registry.due(now) == [pinned, requested]
+    assert registry.expire_idle(now) == 1
+    assert list(registry.locations) == ["-21.2000,-47.8000"]
+
+@pytest.mark.asyncio
+async def test_scheduler_refreshes_watched_locations_into_the_forecast_cache():
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.url.params)
+        return httpx.Response(200, json={"current_weather": {"temperature": 24.0, "weathercode": 1}})
+
+    service = OpenMeteoService(httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    scheduler = PrefetchScheduler(service)
+    first, second = cell("-21.2000,-47.8000"), cell("-22.7000,-47.6000")
+    scheduler.watch(first, "Ribeirão Preto")
+    scheduler.watch(second, "Piracicaba")
+
+    scheduler.start()
+    for _ in range(100):
+        if scheduler.counters["refreshes"] == 2:
+            break
+        await asyncio.sleep(0.01)
+    await scheduler.stop()
+
+    assert len(requests) == 2
+    forecast = await service.get_weather(first.latitude, first.longitude)
+    assert forecast.current_weather["temperature"] == 24.0
+    assert len(requests) == 2
+
+    interval = settings.FORECAST_CACHE_TTL * (1 - settings.PREFETCH_REFRESH_AHEAD)
+    for location in scheduler.registry.locations.values():
+        assert location.failures == 0
+        assert abs(location.next_refresh - location.last_refresh - interval) <= interval * settings.PREFETCH_JITTER
+
+def test_watch_endpoints_add_list_and_remove_locations():
+    service = OpenMeteoService()
+    scheduler = PrefetchScheduler(service)
+    app.dependency_overrides[get_prefetch_scheduler] = lambda: scheduler
+    app.dependency_overrides[get_open_meteo_service] = lambda: service
+    client = TestClient(app)
+
+    try:
+        added = client.post("/watch", json={"latitude": -21.17, "longitude": -47.81, "name": "Fazenda"})
+        listed = client.get("/watch")
+        deleted = client.delete(f"/watch/{added.json()['key']}")
+        missing = client.delete("/watch/0.0000,0.0000")
+    finally:
+        app.dependency_overrides.clear()
+
+    assert added.status_code == 201
+    assert added.json()["key"] == "-21.2000,-47.8000"
+    assert added.json()["pinned"] is True
+    assert [location["label"] for location in listed.json()] == ["Fazenda"]
+    assert deleted.status_code == 204
+    assert missing.status_code == 404
+    assert scheduler.registry.locations == {}
+
+@pytest.mark.asyncio
+async def test_scheduler_skips_cells_cached_or_leased_by_another_worker(tmp_path):
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.url.params)
+        return httpx.Response(200, json={"current_weather": {"temperature": 24.0, "weathercode": 1}})
+
+    # Two workers sharing one sqlite cache.
+    path = str(tmp_path / "cache.sqlite3")
+    worker, other = [
+        OpenMeteoService(httpx.AsyncClient(transport=httpx.MockTransport(handler)), ResponseCache(SQLiteCacheBackend(path)))
+        for _ in range(2)
+    ]
+    cached, leased = cell("-21.2000,-47.8000"), cell("-22.7000,-47.6000")
+    await other.refresh_weather(cached)
+    assert await other.cache.acquire_lease(f"prefetch:{leased.key}", 60)
+
+    scheduler = PrefetchScheduler(worker)
+    for watched in (cached, leased):
+        await scheduler._refresh(scheduler.watch(watched, watched.key))
+
+    assert len(requests) == 1
+    assert scheduler.counters["skipped"] == 2 and scheduler.counters["refreshes"] == 0
+    # The cached cell is due once its entry gets old, not right away.
+    refresh_in = scheduler.registry.locations[cached.key].next_refresh - time.monotonic()
+    assert refresh_in > scheduler.interval * (1 - settings.PREFETCH_JITTER) - 5
+    assert not await worker.cache.acquire_lease(f"prefetch:{leased.key}", 60)
+    for service in (worker, other):
+        await service.aclose()
+
+@pytest.mark.asyncio
+async def test_failed_refresh_is_retried_after_the_retry_delay():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(200, json={"current_weather": {"temperature": 24.0, "weathercode": 1}})
+
+    service = OpenMeteoService(httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    refresh_weather = service.refresh_weather
+
+    async def fail_once(watched: GridCell):
+        if not calls:
+            calls.append(None)
+            raise RuntimeError("upstream down")
+        return await refresh_weather(watched)
+
+    service.refresh_weather = fail_once
+    scheduler = PrefetchScheduler(service)
+    scheduler.watch(cell("-21.2000,-47.8000"), "Ribeirão Preto")
+
+    with patch.object(settings, "PREFETCH_RETRY_DELAY", 0.05):
+        scheduler.start()
+        for _ in range(100):
+            if scheduler.counters["refreshes"]:
+                break
+            await asyncio.sleep(0.01)
+        await scheduler.stop()
+
+    assert scheduler.counters["failures"] == 1 and scheduler.counters["refreshes"] == 1
+    await service.aclose()
@@ -0,0 +1,71 @@
+import asyncio
+import json
+import pstats
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from main import app
+from routers.weather import get_open_meteo_service
+from services.open_meteo import OpenMeteoService
+from services.profiling import ProfilingMiddleware
+
+def profiled_client(tmp_path) -> TestClient:
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"current_weather": {"temperature": 24.0, "windspeed": 14.0, "weathercode": 1}})
+
+    service = OpenMeteoService(httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    app.dependency_overrides[get_open_meteo_service] = lambda: service
+    return TestClient(ProfilingMiddleware(app, secret="s3cret", directory=str(tmp_path)))
+
+def test_requests_are_profiled_only_with_the_secret(tmp_path):
+    client = profiled_client(tmp_path)
+    try:
+        profiled = client.get("/weather/Piracicaba", headers={"X-Profile": "s3cret"})
+        plain = client.get("/weather/Piracicaba")
+        wrong = client.get("/weather/Piracicaba", headers={"X-Profile": "guess"})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert "x-profile-file" not in plain.headers and "x-profile-file" not in wrong.headers
+    assert profiled.status_code == 200
+    stats = pstats.Stats(str(tmp_path / profiled.headers["x-profile-file"]))
+    functions = {name for _, _, name in stats.stats}
+    assert {"get_weather", "get_coordinates", "analyze"} <= functions
+    assert len(list(tmp_path.iterdir())) == 1
+
+def test_speedscope_profile_has_balanced_events(tmp_path):
+    client = profiled_client(tmp_path)
+    try:
+        profiled = client.get("/weather/Piracicaba", headers={"X-Profile": "s3cret", "X-Profile-Format": "speedscope"})
+    finally:
+        app.dependency_overrides.clear()
+
+    document = json.loads((tmp_path / profiled.headers["x-profile-file"]).read_text())
+    frames = [frame["name"] for frame in document["shared"]["frames"]]
+    events = document["profiles"][0]["events"]
+
+    stack = []
+    for event in events:
+        if event["type"] == "O":
+            stack.append(event["frame"])
+        else:
+            assert stack.pop() == event["frame"]
+    assert stack == []
+    assert "OpenMeteoService.get_weather" in frames
+    assert "AgronomicLogic.analyze" in frames
+
+@pytest.mark.asyncio
+async def test_concurrent_profiled_request_is_served_unprofiled(tmp_path):
+    async def slow_app(scope, receive, send):
+        await asyncio.sleep(0.05)
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"{}"})
+
+    transport = httpx.ASGITransport(app=ProfilingMiddleware(slow_app, secret="s3cret", directory=str(tmp_path)))
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        responses = await asyncio.gather(*(client.get("/", headers={"X-Profile": "s3cret"}) for _ in range(2)))
+
+    assert [response.status_code for response in responses] == [200, 200]
+    assert sorted("x-profile-file" in response.headers for response in responses) == [False, True]
+    assert [response.headers.get("x-profile-status") for response in responses].count("busy") == 1
+    assert len(list(tmp_path.iterdir())) == 1
@@ -0,0 +1,121 @@
+import asyncio
+import httpx
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from config import settings
+from main import app
+from routers.weather import get_open_meteo_service
+from services.open_meteo import OpenMeteoService
+from services.resilience import CircuitBreaker, CircuitOpenError, UpstreamError, set_deadline
+
+def make_service(handler):
+    return OpenMeteoService(httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+
+@pytest.mark.asyncio
+async def test_breaker_opens_fails_fast_and_closes_after_a_successful_probe():
+    responses = iter([503, 503, 200])
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(next(responses), json={})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    breaker = CircuitBreaker("weather", failure_threshold=2, reset_timeout=30)
+
+    for _ in range(2):
+        with pytest.raises(httpx.HTTPStatusError):
+            await breaker.get(client, "https://api.open-meteo.com/v1/forecast", {})
+    with pytest.raises(CircuitOpenError):
+        await breaker.get(client, "https://api.open-meteo.com/v1/forecast", {})
+    assert breaker.stats()["state"] == "open"
+    assert len(calls) == 2
+
+    breaker.opened_at -= 30
+    await breaker.get(client, "https://api.open-meteo.com/v1/forecast", {})
+    assert breaker.stats()["state"] == "closed"
+    assert breaker.counters == {"calls": 3, "failures": 2, "rejected": 1, "opened": 1}
+
+@pytest.mark.asyncio
+async def test_retries_stop_when_the_request_budget_is_spent():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(503)
+
+    service = make_service(handler)
+    set_deadline(settings.UPSTREAM_MIN_ATTEMPT_TIME / 2)
+    try:
+        with pytest.raises(UpstreamError):
+            await service.get_weather(-22.72, -47.65)
+    finally:
+        set_deadline(None)
+
+    assert len(calls) == 1
+    assert service.upstream_stats()["forecast"]["consecutive_failures"] == 1
+
+def test_upstream_timeouts_are_cut_to_the_request_deadline():
+    timeouts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        timeouts.append(request.extensions["timeout"])
+        return httpx.Response(200, json={"current_weather": {"temperature": 24.0, "weathercode": 1}})
+
+    service = make_service(handler)
+    app.dependency_overrides[get_open_meteo_service] = lambda: service
+    client = TestClient(app)
+
+    try:
+        with patch.object(settings, "REQUEST_DEADLINE", 2.0):
+            response = client.get("/weather/Piracicaba/now")
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert 0 < timeouts[0]["read"] <= 2.0
+    assert timeouts[0]["connect"] <= 2.0
+
+@pytest.mark.asyncio
+async def test_client_errors_other_than_429_are_not_retried():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(400, json={"error": True, "reason": "Invalid parameter"})
+
+    with pytest.raises(UpstreamError):
+        await make_service(handler).get_weather(-22.72, -47.65)
+    assert len(calls) == 1
+
+@pytest.mark.asyncio
+async def test_cancelled_calls_are_not_retried():
+    calls = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        await asyncio.sleep(10)
+
+    fetch = asyncio.create_task(make_service(handler)._fetch_weather(-22.72, -47.65))
+    await asyncio.sleep(0.01)
+    fetch.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await fetch
+    assert len(calls) == 1
+
+@pytest.mark.parametrize("path", ["/weather/Piracicaba", "/weather/Piracicaba/now"])
+def test_upstream_error_status_is_answered_with_502(path):
+    service = make_service(lambda request: httpx.Response(503, json={"error": True}))
+    app.dependency_overrides[get_open_meteo_service] = lambda: service
+    client = TestClient(app)
+
+    try:
+        # Less budget than one more attempt needs, so the first error is the last.
+        with patch.object(settings, "REQUEST_DEADLINE", settings.UPSTREAM_MIN_ATTEMPT_TIME / 2):
+            response = client.get(path)
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 502
+    assert response.json()["detail"] == "The forecast service answered with an error (503)"
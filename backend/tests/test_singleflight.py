@@ -0,0 +1,32 @@
+import asyncio
+import pytest
+from services.singleflight import SingleFlight
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight("test")
+    executions = []
+
+    async def fetch():
+        executions.append(1)
+        await asyncio.sleep(0.01)
+        return {"temperature": 25}
+
+    results = await asyncio.gather(*(flight.do("key", fetch) for _ in range(10)))
+
+    assert len(executions) == 1
+    assert all(result == {"temperature": 25} for result in results)
+    assert flight.stats() == {"calls": 10, "executions": 1, "coalesced": 9, "in_flight": 0}
+
+@pytest.mark.asyncio
+async def test_exception_is_shared_and_key_released():
+    flight = SingleFlight("test")
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("upstream down")
+
+    results = await asyncio.gather(flight.do("key", fail), flight.do("key", fail), return_exceptions=True)
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert flight.stats()["in_flight"] == 0
@@ -7,6 +7,7 @@ from main import app
 from unittest.mock import AsyncMock, patch
 import pytest
 from schemas import Coordinates
+from services.forecast import Forecast
 
 try:
     client = TestClient(app)
@@ -54,7 +55,7 @@ def test_get_weather_success():
          patch("routers.weather.OpenMeteoService.get_weather", new_callable=AsyncMock) as mock_get_weather:
         
         mock_get_coords.return_value = mock_coordinates
-        mock_get_weather.return_value = mock_weather_data
+        mock_get_weather.return_value = Forecast.from_payload(mock_weather_data)
 
         response = client.get("/weather/London")
         
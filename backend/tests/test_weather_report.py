@@ -0,0 +1,136 @@
+import httpx
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from main import app
+from config import settings
+from routers.weather import get_open_meteo_service
+from services.agronomic import AgronomicLogic
+from services.open_meteo import OpenMeteoService
+from services.forecast import Forecast
+from services.weather_report import analyze_forecast, build_weather_report, encode_weather_report, response_etag
+from schemas import Coordinates, WeatherResponse
+
+FORECAST = {
+    "current_weather": {"temperature": 15, "windspeed": 12, "weathercode": 0},
+    "hourly": {
+        "time": ["2023-10-01T00:00"], "temperature_2m": [36], "relativehumidity_2m": [60],
+        "windspeed_10m": [5], "weathercode": [0], "soil_moisture_0_to_1cm": [0.3],
+        "soil_moisture_27_to_81cm": [0.3]
+    },
+    "daily": {
+        "time": ["2023-10-01"], "precipitation_sum": [0], "et0_fao_evapotranspiration": [4],
+        "shortwave_radiation_sum": [20], "weathercode": [0]
+    }
+}
+
+def make_service():
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, json=FORECAST))
+    return OpenMeteoService(httpx.AsyncClient(transport=transport))
+
+@pytest.mark.asyncio
+async def test_analysis_is_memoized_by_forecast_content():
+    service = make_service()
+    agronomic_service = AgronomicLogic()
+    forecast = await service.get_weather(-21.18, -47.81)
+
+    with patch.object(agronomic_service, "analyze", wraps=agronomic_service.analyze) as analyze:
+        first = await analyze_forecast(forecast, service, agronomic_service)
+        second = await analyze_forecast(forecast, service, agronomic_service)
+
+    assert first == second
+    assert analyze.call_count == 1
+    assert service.cache_stats()["analysis"]["hits"] == 1
+
+@pytest.mark.asyncio
+async def test_payload_without_content_hash_is_not_memoized():
+    service = make_service()
+    await analyze_forecast(Forecast.from_payload(FORECAST), service, AgronomicLogic())
+
+    assert service.cache_stats()["analysis"]["size"] == 0
+
+@pytest.mark.asyncio
+async def test_encoders_produce_the_same_document():
+    service = make_service()
+    coordinates = Coordinates(name="Piracicaba", latitude=-22.73, longitude=-47.65, country="Brasil")
+    forecast = await service.get_weather(coordinates.latitude, coordinates.longitude)
+    report = await build_weather_report(coordinates, forecast, service, AgronomicLogic())
+
+    with patch.object(settings, "JSON_ENCODER", "orjson"):
+        orjson_body = encode_weather_report(report)
+    with patch.object(settings, "JSON_ENCODER", "pydantic"):
+        pydantic_body = encode_weather_report(report)
+
+    assert WeatherResponse.model_validate_json(orjson_body) == WeatherResponse.model_validate_json(pydantic_body)
+
+@pytest.mark.asyncio
+async def test_stale_forecast_is_flagged_and_gets_its_own_etag():
+    service = make_service()
+    agronomic_service = AgronomicLogic()
+    coordinates = Coordinates(name="Piracicaba", latitude=-22.73, longitude=-47.65, country="Brasil")
+    forecast = await service.get_weather(coordinates.latitude, coordinates.longitude)
+
+    fresh = await build_weather_report(coordinates, forecast, service, agronomic_service)
+    stale = await build_weather_report(coordinates, forecast.as_stale(), service, agronomic_service)
+
+    assert WeatherResponse.model_validate_json(encode_weather_report(fresh)).stale is False
+    assert WeatherResponse.model_validate_json(encode_weather_report(stale)).stale is True
+    assert response_etag(coordinates, forecast, agronomic_service) != response_etag(
+        coordinates, forecast.as_stale(), agronomic_service
+    )
+
+def test_hot_city_is_served_from_encoded_cache_with_etag():
+    service = make_service()
+    app.dependency_overrides[get_open_meteo_service] = lambda: service
+    client = TestClient(app)
+
+    try:
+        first = client.get("/weather/Ribeirão Preto")
+        second = client.get("/weather/Ribeirão Preto")
+        not_modified = client.get("/weather/Ribeirão Preto", headers={"If-None-Match": first.headers["etag"]})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert first.status_code == 200
+    assert first.headers["cache-control"] == f"public, max-age={settings.RESPONSE_CACHE_MAX_AGE}"
+    assert second.content == first.content
+    assert second.headers["etag"] == first.headers["etag"]
+    assert not_modified.status_code == 304
+    assert service.cache_stats()["encoded_responses"]["hits"] == 1
+
+def test_days_phases_and_fields_trim_the_upstream_request_and_response():
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.url.params)
+        hours = int(request.url.params["forecast_days"]) * 24
+        hourly = {name: [0.3] * hours for name in request.url.params["hourly"].split(",")}
+        daily = {name: [20.0] for name in request.url.params["daily"].split(",")}
+        return httpx.Response(200, json={
+            "current_weather": {"temperature": 25, "windspeed": 12, "weathercode": 0},
+            "hourly": {"time": [f"2024-10-01T{hour:02d}:00" for hour in range(hours)], **hourly},
+            "daily": {"time": ["2024-10-01"], **daily}
+        })
+
+    service = OpenMeteoService(httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    app.dependency_overrides[get_open_meteo_service] = lambda: service
+    client = TestClient(app)
+
+    try:
+        response = client.get("/weather/Piracicaba?days=1&phases=growth&fields=windspeed_10m")
+        invalid = client.get("/weather/Piracicaba?phases=flowering")
+    finally:
+        app.dependency_overrides.clear()
+
+    params = requests[0]
+    assert params["forecast_days"] == "1"
+    # windspeed_10m was asked for; the rest is what the growth rules read.
+    assert params["hourly"] == "temperature_2m,windspeed_10m,soil_moisture_27_to_81cm"
+    assert params["daily"] == "shortwave_radiation_sum"
+
+    data = response.json()
+    assert set(data["hourly"]) == {"time", "windspeed_10m"}
+    assert data["daily"] is None
+    assert len(data["agronomic_tips"]) == 1
+    assert set(data["agronomic_tips"][0]) == {"growth"}
+    assert invalid.status_code == 422